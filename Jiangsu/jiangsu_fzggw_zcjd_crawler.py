@@ -1,7 +1,8 @@
 
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -9,6 +10,7 @@ headers = {
 }
 
 TARGET_URL = "https://fzggw.jiangsu.gov.cn/col/col314/index.html"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -20,10 +22,11 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # 从XML脚本中提取数据
         script_tags = soup.find_all('script', type='text/xml')
@@ -42,7 +45,7 @@ def scrape_data():
                 for record in records:
                     try:
                         # 解析每条记录的HTML
-                        record_soup = BeautifulSoup(record, 'html.parser')
+                        record_soup = make_soup(record)
                         li_tag = record_soup.find('li')
                         if not li_tag:
                             continue
@@ -78,14 +81,14 @@ def scrape_data():
                         # 保存到 all_items 用于显示最新5条
                         all_items.append({'title': title, 'pub_at': pub_at})
                         
-                        if pub_at != yesterday:
+                        if pub_at not in target_dates:
                             filtered_count += 1
                             continue
                         
                         content = ""
                         try:
-                            detail_resp = requests.get(article_url, headers=headers, timeout=15)
-                            detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                            detail_resp = http_get(article_url, headers=headers, timeout=15)
+                            detail_soup = make_soup(detail_resp.content, detail_resp.url)
                             content_elem = detail_soup.select_one('.bt-content') or detail_soup.select_one('.zoom') or detail_soup.select_one('.TRS_Editor')
                             if content_elem:
                                 content = content_elem.get_text(strip=True)
@@ -1,7 +1,8 @@
 
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get, http_post
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -23,6 +24,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
 
         
@@ -44,7 +46,7 @@ def scrape_data():
                 "pageNo": page_no
             }
             
-            response = requests.post(api_url, headers=headers, data=data, timeout=30)
+            response = http_post(api_url, headers=headers, data=data, timeout=30)
             response.raise_for_status()
             
             # 解析 JSON 响应
@@ -87,15 +89,15 @@ def scrape_data():
                     # 保存到 all_items 用于显示最新5条
                     all_items.append({'title': title, 'pub_at': pub_at})
                     
-                    if pub_at != yesterday:
+                    if pub_at not in target_dates:
                         filtered_count += 1
                         continue
                     
                     # 获取文章内容
                     content = ""
                     try:
-                        detail_resp = requests.get(article_url, headers=headers, timeout=15)
-                        detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                        detail_resp = http_get(article_url, headers=headers, timeout=15)
+                        detail_soup = make_soup(detail_resp.content, detail_resp.url)
                         content_elem = detail_soup.select_one('.bt-content') or detail_soup.select_one('.zoom') or detail_soup.select_one('.TRS_Editor')
                         if content_elem:
                             content = content_elem.get_text(strip=True)
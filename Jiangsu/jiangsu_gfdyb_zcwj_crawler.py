@@ -1,6 +1,8 @@
-import requests
+from http_utils import http_get
 from bs4 import BeautifulSoup
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -9,6 +11,7 @@ headers = {
 
 TARGET_URL = "https://mf.jiangsu.gov.cn/col/col49295/index.html"
 API_URL = "https://mf.jiangsu.gov.cn/module/web/jpage/dataproxy.jsp?page=1&appid=1&webid=5&path=/&columnid=49295&unitid=434779&permissiontype=0"
+LIST_PROBE_URL = API_URL
 
 
 def scrape_data():
@@ -19,22 +22,23 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
 
-        response = requests.get(API_URL, headers=headers, timeout=30)
+        response = http_get(API_URL, headers=headers, timeout=30)
         response.raise_for_status()
         
         try:
             soup = BeautifulSoup(response.content, 'xml')
             records = soup.find_all('record')
         except Exception:
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content, response.url)
             records = soup.find_all('record')
         policy_links = {}
 
         for record in records:
             cdata = record.string
             if cdata:
-                record_soup = BeautifulSoup(cdata, 'html.parser')
+                record_soup = make_soup(cdata)
                 li_tag = record_soup.find('li')
                 if li_tag:
                     a_tag = li_tag.find('a', href=True)
@@ -53,8 +57,8 @@ def scrape_data():
                             }
 
         if not policy_links:
-            response = requests.get(TARGET_URL, headers=headers, timeout=30)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = http_get(TARGET_URL, headers=headers, timeout=30)
+            soup = make_soup(response.content, response.url)
             all_links = soup.find_all('a', href=True)
             for a_tag in all_links:
                 href = a_tag.get('href', '').strip()
@@ -98,7 +102,7 @@ def scrape_data():
 
                 all_items.append({'title': title, 'pub_at': pub_at})
 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
 
@@ -107,8 +111,8 @@ def scrape_data():
                 related_links = []
                 
                 try:
-                    detail_resp = requests.get(article_url, headers=headers, timeout=15)
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_resp = http_get(article_url, headers=headers, timeout=15)
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
 
                     for selector in ['#barrierfree_container', '.TRS_Editor', '#zoom', '.content', '#content', '.article-content', '.main-content']:
                         elem = detail_soup.select_one(selector)
@@ -1,7 +1,8 @@
 
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -9,6 +10,7 @@ headers = {
 }
 
 TARGET_URL = "https://www.jiangsu.gov.cn/col/col81677/index.html"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -20,12 +22,13 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
 
         
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         items = soup.find_all('li')
         filtered_count = 0
@@ -63,14 +66,14 @@ def scrape_data():
                 # 保存到 all_items 用于显示最新5条
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
                 content = ""
                 try:
-                    detail_resp = requests.get(article_url, headers=headers, timeout=15)
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_resp = http_get(article_url, headers=headers, timeout=15)
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
                     content_elem = detail_soup.find(id='zoom')
                     if content_elem:
                         content = content_elem.get_text(strip=True)
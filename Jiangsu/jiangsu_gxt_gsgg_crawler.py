@@ -1,7 +1,8 @@
 
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -9,6 +10,7 @@ headers = {
 }
 
 TARGET_URL = "https://gxt.jiangsu.gov.cn/col/col6281/index.html"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -20,12 +22,13 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
 
         
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # 查找包含 datastore 的 script 标签
         script_tags = soup.find_all('script')
@@ -56,7 +59,7 @@ def scrape_data():
                     for record in records:
                         try:
                             # 解析 record 中的 HTML
-                            record_soup = BeautifulSoup(record, 'html.parser')
+                            record_soup = make_soup(record)
                             li = record_soup.find('li')
                             if not li:
                                 continue
@@ -90,14 +93,14 @@ def scrape_data():
                             # 保存到 all_items 用于显示最新5条
                             all_items.append({'title': title, 'pub_at': pub_at})
                             
-                            if pub_at != yesterday:
+                            if pub_at not in target_dates:
                                 filtered_count += 1
                                 continue
                             
                             content = ""
                             try:
-                                detail_resp = requests.get(article_url, headers=headers, timeout=15)
-                                detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                                detail_resp = http_get(article_url, headers=headers, timeout=15)
+                                detail_soup = make_soup(detail_resp.content, detail_resp.url)
                                 # 优先使用 #con1，然后尝试其他选择器
                                 content_elem = detail_soup.select_one('#con1') or detail_soup.select_one('.content') or detail_soup.select_one('#content')
                                 if content_elem:
@@ -1,11 +1,13 @@
 import os
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 # 目标网站URL - 江苏省国资委 政策文件
 TARGET_URL = "https://jsgzw.jiangsu.gov.cn/col/col85683/index.html"
+LIST_PROBE_URL = TARGET_URL
 SOURCE_NAME = "江苏省国资委_政策文件"
 
 # ==========================================
@@ -21,6 +23,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -28,11 +31,11 @@ def scrape_data():
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
             'Connection': 'keep-alive'
         }
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
         response.encoding = 'utf-8'
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text, response.url)
         datastore_script = next((s.string for s in soup.find_all('script') if s.string and '<datastore>' in s.string), None)
         
         if not datastore_script:
@@ -65,7 +68,7 @@ def scrape_data():
                 continue
             
             # 【严格匹配日期】
-            if pub_at == yesterday:
+            if pub_at in target_dates:
                 target_date_items += 1
                 if not url.startswith('http'):
                     url = f"https://jsgzw.jiangsu.gov.cn{url}" if url.startswith('/') else f"https://jsgzw.jiangsu.gov.cn/{url}"
@@ -73,9 +76,9 @@ def scrape_data():
                 # 抓取详情
                 content = ""
                 try:
-                    d_res = requests.get(url, headers=headers, timeout=15)
+                    d_res = http_get(url, headers=headers, timeout=15)
                     d_res.encoding = d_res.apparent_encoding
-                    d_soup = BeautifulSoup(d_res.text, 'html.parser')
+                    d_soup = make_soup(d_res.text, d_res.url)
                     # 匹配 .main-txt 或 #zoom
                     c_elem = d_soup.select_one('.main-txt') or d_soup.select_one('#zoom')
                     if c_elem:
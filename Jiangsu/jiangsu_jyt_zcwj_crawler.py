@@ -1,11 +1,13 @@
 import os
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 # 目标网站URL
 TARGET_URL = "https://jyt.jiangsu.gov.cn/col/col77616/index.html"
+LIST_PROBE_URL = TARGET_URL
 SOURCE_NAME = "江苏省教育厅_政策文件"
 
 # ==========================================
@@ -21,6 +23,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         # 发送请求
         headers = {
@@ -29,11 +32,11 @@ def scrape_data():
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
             'Connection': 'keep-alive'
         }
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
         
         # 解析HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # 查找datastore脚本标签
         datastore_script = None
@@ -86,7 +89,7 @@ def scrape_data():
                 continue
             
             # 检查是否为目标日期
-            if pub_at == yesterday:
+            if pub_at in target_dates:
                 target_date_items += 1
                 # 处理URL
                 if not url.startswith('http'):
@@ -98,9 +101,9 @@ def scrape_data():
                 # 抓取详情页内容
                 content = ""
                 try:
-                    detail_response = requests.get(url, headers=headers, timeout=15)
+                    detail_response = http_get(url, headers=headers, timeout=15)
                     detail_response.raise_for_status()
-                    detail_soup = BeautifulSoup(detail_response.content, 'html.parser')
+                    detail_soup = make_soup(detail_response.content, detail_response.url)
                     # 查找内容容器
                     content_elem = detail_soup.select_one('#zoom')
                     if content_elem:
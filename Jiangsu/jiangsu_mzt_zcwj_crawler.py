@@ -1,7 +1,8 @@
 
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -9,6 +10,7 @@ headers = {
 }
 
 TARGET_URL = "https://mzt.jiangsu.gov.cn/col/col78599/index.html"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -20,10 +22,11 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
 
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
 
         # 查找目标容器
         target_div = soup.find('div', id='ztlist')
@@ -49,8 +52,8 @@ def scrape_data():
             iframe_url = iframe_src
 
         # 访问iframe页面
-        iframe_response = requests.get(iframe_url, headers=headers, timeout=15)
-        iframe_soup = BeautifulSoup(iframe_response.content, 'html.parser')
+        iframe_response = http_get(iframe_url, headers=headers, timeout=15)
+        iframe_soup = make_soup(iframe_response.content, iframe_response.url)
 
         # 提取数据
         # 方法1：使用h4标题和a链接的配对
@@ -125,7 +128,7 @@ def scrape_data():
                 all_items.append({'title': title, 'pub_at': pub_at})
 
                 # 过滤非目标日期
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
 
@@ -133,8 +136,8 @@ def scrape_data():
                 content = ""
                 if article_url:
                     try:
-                        detail_resp = requests.get(article_url, headers=headers, timeout=15)
-                        detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                        detail_resp = http_get(article_url, headers=headers, timeout=15)
+                        detail_soup = make_soup(detail_resp.content, detail_resp.url)
 
                         # 查找内容区域
                         content_div = detail_soup.select_one('.content')
@@ -1,7 +1,8 @@
 
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -9,6 +10,7 @@ headers = {
 }
 
 TARGET_URL = "https://mzw.jiangsu.gov.cn/col/col39791/index.html"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -20,10 +22,11 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
 
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
 
         # 查找目标区域
         target_area = soup.find('td', attrs={'aria-label': '视窗区'})
@@ -38,7 +41,7 @@ def scrape_data():
             return policies, all_items
 
         script_content = script_tag.string
-        record_soup = BeautifulSoup(script_content, 'html.parser')
+        record_soup = make_soup(script_content)
         records = record_soup.find_all('record')
 
         filtered_count = 0
@@ -49,7 +52,7 @@ def scrape_data():
                 if not cdata_content:
                     continue
 
-                li_soup = BeautifulSoup(cdata_content, 'html.parser')
+                li_soup = make_soup(cdata_content)
                 li_tag = li_soup.find('li')
                 if not li_tag:
                     continue
@@ -97,15 +100,15 @@ def scrape_data():
                 all_items.append({'title': title, 'pub_at': pub_at})
 
                 # 过滤非目标日期
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
 
                 # 抓取详情页内容
                 content = ""
                 try:
-                    detail_resp = requests.get(article_url, headers=headers, timeout=15)
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_resp = http_get(article_url, headers=headers, timeout=15)
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
 
                     # 查找内容区域
                     content_div = detail_soup.find('div', id='barrierfree_container')
@@ -1,7 +1,8 @@
 
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -10,6 +11,7 @@ headers = {
 
 TARGET_URL = "https://scjgj.jiangsu.gov.cn/col/col78964/index.html"
 DATAPROXY_URL = "https://scjgj.jiangsu.gov.cn/module/web/jpage/dataproxy.jsp?page=1&appid=1&appid=1&webid=79&path=/&columnid=78964&unitid=310641&permissiontype=0"
+LIST_PROBE_URL = DATAPROXY_URL
 
 
 def scrape_data():
@@ -20,11 +22,12 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
 
         # 访问 dataproxy 获取数据
-        response = requests.get(DATAPROXY_URL, headers=headers, timeout=30)
+        response = http_get(DATAPROXY_URL, headers=headers, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
 
         records = soup.find_all('record')
         filtered_count = 0
@@ -35,7 +38,7 @@ def scrape_data():
                 if not cdata_content:
                     continue
 
-                li_soup = BeautifulSoup(cdata_content, 'html.parser')
+                li_soup = make_soup(cdata_content)
                 li_tag = li_soup.find('li')
                 if not li_tag:
                     continue
@@ -83,15 +86,15 @@ def scrape_data():
 
                 all_items.append({'title': title, 'pub_at': pub_at})
 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
 
                 # 抓取详情页内容
                 content = ""
                 try:
-                    detail_resp = requests.get(article_url, headers=headers, timeout=15)
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_resp = http_get(article_url, headers=headers, timeout=15)
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
 
                     for selector in ['#barrierfree_container', 'div.main-content', '.TRS_Editor', '#zoom', '.content', '#content']:
                         elem = detail_soup.select_one(selector)
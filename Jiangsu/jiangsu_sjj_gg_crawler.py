@@ -1,7 +1,8 @@
 import os
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 # 导入数据库工具
@@ -9,6 +10,7 @@ from db_utils import save_to_policy
 
 # 爬虫配置
 TARGET_URL = "https://jszwb.jiangsu.gov.cn/col/col19390/index.html"
+LIST_PROBE_URL = TARGET_URL
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
@@ -35,14 +37,15 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         print(f"📅 运行日期（北京时间）：{today}")
         print(f"🎯 目标抓取日期：{yesterday}")
         
         # 发送请求
-        response = requests.get(TARGET_URL, headers=HEADERS, timeout=30)
+        response = http_get(TARGET_URL, headers=HEADERS, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # 查找文章列表
         article_list = soup.find_all('li', class_='cf')
@@ -84,16 +87,16 @@ def scrape_data():
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
                 # 过滤：只保留目标日期的文章
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
                 # 抓取详情页内容
                 content = ""
                 try:
-                    detail_resp = requests.get(article_url, headers=HEADERS, timeout=15)
+                    detail_resp = http_get(article_url, headers=HEADERS, timeout=15)
                     detail_resp.raise_for_status()
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
                     
                     # 查找内容区域
                     content_div = None
@@ -1,6 +1,7 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -8,6 +9,7 @@ headers = {
 }
 
 TARGET_URL = "https://jsstyj.jiangsu.gov.cn/col/col79483/index.html"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -18,10 +20,11 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
 
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
 
         items = []
         
@@ -29,12 +32,12 @@ def scrape_data():
         if target_div:
             script_tag = target_div.find('script', type='text/xml')
             if script_tag and script_tag.string:
-                datastore_soup = BeautifulSoup(script_tag.string, 'html.parser')
+                datastore_soup = make_soup(script_tag.string)
                 records = datastore_soup.find_all('record')
                 for record in records:
                     cdata = record.string
                     if cdata:
-                        record_soup = BeautifulSoup(cdata, 'html.parser')
+                        record_soup = make_soup(cdata)
                         li_elems = record_soup.find_all('li')
                         items.extend(li_elems)
         
@@ -84,14 +87,14 @@ def scrape_data():
 
                 all_items.append({'title': title, 'pub_at': pub_at})
 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
 
                 content = ""
                 try:
-                    detail_resp = requests.get(article_url, headers=headers, timeout=15)
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_resp = http_get(article_url, headers=headers, timeout=15)
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
 
                     for selector in ['#barrierfree_container', '.TRS_Editor', '#zoom', '.content', '#content', '.article-content', '.main-content']:
                         elem = detail_soup.select_one(selector)
@@ -1,6 +1,7 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -10,6 +11,7 @@ headers = {
 }
 
 TARGET_URL = "https://doc.jiangsu.gov.cn/col/col80617/index.html?uid=310478&pageNum=1"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -20,13 +22,14 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         # 发送请求获取页面内容
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
         
         # 解析页面
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # 查找文章列表
         article_list = soup.select('.listcon .list')
@@ -129,15 +132,15 @@ def scrape_data():
                 # 保存到 all_items 用于显示最新5条
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
                 # 获取文章内容
                 content = ""
                 try:
-                    detail_resp = requests.get(article_url, headers=headers, timeout=15)
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_resp = http_get(article_url, headers=headers, timeout=15)
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
                     
                     # 尝试多种选择器获取内容
                     content_elem = detail_soup.select_one('div[aria-label="正文区"]')
@@ -1,8 +1,9 @@
 
 import os
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get, http_post
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 
 from db_utils import save_to_policy
 
@@ -32,6 +33,8 @@ def scrape_data(target_date=None):
             yesterday = today - timedelta(days=1)
             print(f"📅 运行日期（北京时间）：{today}")
             print(f"🎯 目标抓取日期：{yesterday}")
+        # 手动指定日期时只抓取该日期
+        target_dates = (yesterday,) if target_date else get_target_dates(today)
         
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -60,7 +63,7 @@ def scrape_data(target_date=None):
         }
         
         print("🔍 调用AJAX接口获取数据...")
-        ajax_response = requests.post(ajax_url, headers=headers, data=data, timeout=30)
+        ajax_response = http_post(ajax_url, headers=headers, data=data, timeout=30)
         ajax_response.raise_for_status()
         
         import xml.etree.ElementTree as ET
@@ -77,7 +80,7 @@ def scrape_data(target_date=None):
             if not cdata:
                 continue
             
-            item_soup = BeautifulSoup(cdata, 'html.parser')
+            item_soup = make_soup(cdata)
             
             title_elem = item_soup.find('a')
             if not title_elem:
@@ -106,16 +109,16 @@ def scrape_data(target_date=None):
             
             all_items.append({'title': title, 'pub_at': pub_at})
             
-            if pub_at != yesterday:
+            if pub_at not in target_dates:
                 filtered_count += 1
                 continue
             
             content = ""
             try:
-                detail_response = requests.get(policy_url, headers=headers, timeout=15)
+                detail_response = http_get(policy_url, headers=headers, timeout=15)
                 detail_response.raise_for_status()
                 
-                detail_soup = BeautifulSoup(detail_response.content, 'html.parser')
+                detail_soup = make_soup(detail_response.content, detail_response.url)
                 
                 # 优先使用 .box_wzy_ys 类查找内容区域
                 content_elem = detail_soup.select_one('.box_wzy_ys')
@@ -1,11 +1,13 @@
 import os
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 # 目标网站URL - 江苏省知识产权局通知公告
 TARGET_URL = "https://jsip.jiangsu.gov.cn/col/col85036/index.html"
+LIST_PROBE_URL = TARGET_URL
 SOURCE_NAME = "江苏省知识产权局_通知公告"
 
 # ==========================================
@@ -21,6 +23,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         # 发送请求
         headers = {
@@ -29,12 +32,12 @@ def scrape_data():
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
             'Connection': 'keep-alive'
         }
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
         response.encoding = 'utf-8'
         
         # 解析HTML寻找datastore
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text, response.url)
         datastore_script = next((s.string for s in soup.find_all('script') if s.string and '<datastore>' in s.string), "")
         
         if not datastore_script:
@@ -71,7 +74,7 @@ def scrape_data():
                 continue
             
             # 【核心过滤逻辑】必须等于昨天
-            if pub_at == yesterday:
+            if pub_at in target_dates:
                 target_date_items += 1
                 
                 # 修复URL路径
@@ -81,10 +84,10 @@ def scrape_data():
                 # 抓取详情页内容
                 content = ""
                 try:
-                    detail_response = requests.get(url, headers=headers, timeout=15)
+                    detail_response = http_get(url, headers=headers, timeout=15)
                     detail_response.raise_for_status()
                     detail_response.encoding = detail_response.apparent_encoding
-                    detail_soup = BeautifulSoup(detail_response.text, 'html.parser')
+                    detail_soup = make_soup(detail_response.text, detail_response.url)
                     
                     # 适配知产局正文容器
                     content_elem = detail_soup.select_one('.main-txt') or detail_soup.select_one('#zoom')
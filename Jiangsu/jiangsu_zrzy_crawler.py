@@ -1,11 +1,13 @@
 import os
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 # 目标网站URL
 TARGET_URL = "https://zrzy.jiangsu.gov.cn/gtxxgk/nrglIndex.action?classID=2c9082548ad381c5018ad4bbd9a100ae"
+LIST_PROBE_URL = TARGET_URL
 SOURCE_NAME = "江苏省自然资源厅_政策文件"
 
 # ==========================================
@@ -21,6 +23,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         print(f"运行日期（北京时间）：{today}")
         print(f"目标抓取日期：{yesterday}")
         
@@ -33,10 +36,10 @@ def scrape_data():
         }
         
         # 请求页面
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
         response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text, response.url)
         
         # 查找政策文件列表
         # 分析页面结构，找到包含政策文件的容器
@@ -100,7 +103,7 @@ def scrape_data():
                 continue
             
             # 只保留昨天的
-            if pub_at != yesterday:
+            if pub_at not in target_dates:
                 non_target_date_items += 1
                 continue
             
@@ -111,10 +114,10 @@ def scrape_data():
             # 抓取正文
             content = ""
             try:
-                resp = requests.get(href, headers=headers, timeout=15)
+                resp = http_get(href, headers=headers, timeout=15)
                 resp.raise_for_status()
                 resp.encoding = resp.apparent_encoding
-                ds = BeautifulSoup(resp.text, 'html.parser')
+                ds = make_soup(resp.text, resp.url)
                 
                 # 兼容常见内容容器
                 content_elem = ds.select_one('.content') or ds.select_one('.main-content') or ds.select_one('.article-content')
@@ -1,6 +1,8 @@
 import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -24,6 +26,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         print(f"[DATE] 运行日期（北京时间）：{today}")
         print(f"[TARGET] 目标抓取日期：{yesterday}")
 
@@ -31,14 +34,14 @@ def scrape_data():
         session.headers.update(headers)
         
         try:
-            response = session.get("https://www.cac.gov.cn/", timeout=10)
+            response = http_get("https://www.cac.gov.cn/", session=session, timeout=10)
         except:
             pass
         
-        response = session.get(TARGET_URL, timeout=30)
+        response = http_get(TARGET_URL, session=session, timeout=30)
         response.raise_for_status()
         response.encoding = response.apparent_encoding
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
 
         side_column = soup.find('div', class_='side-right-column')
         if not side_column:
@@ -107,15 +110,15 @@ def scrape_data():
 
                 all_items.append({'title': title, 'pub_at': pub_at})
 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
 
                 content = ""
                 try:
-                    detail_resp = session.get(article_url, timeout=15)
+                    detail_resp = http_get(article_url, session=session, timeout=15)
                     detail_resp.encoding = detail_resp.apparent_encoding
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
 
                     content_elem = detail_soup.find('div', class_='main-content')
                     if not content_elem:
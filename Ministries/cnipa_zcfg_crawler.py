@@ -1,6 +1,7 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 import xml.etree.ElementTree as ET
 
@@ -9,6 +10,7 @@ headers = {
 }
 
 TARGET_URL = "https://www.cnipa.gov.cn/col/col75/index.html"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -19,13 +21,14 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         print(f"[DATE] 运行日期（北京时间）：{today}")
         print(f"[TARGET] 目标抓取日期：{yesterday}")
 
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
         response.encoding = response.apparent_encoding
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
 
         container = soup.find('div', id='17035')
         if not container:
@@ -61,7 +64,7 @@ def scrape_data():
                 if not cdata_content:
                     continue
 
-                record_soup = BeautifulSoup(cdata_content, 'html.parser')
+                record_soup = make_soup(cdata_content)
                 li_element = record_soup.find('li')
                 if not li_element:
                     continue
@@ -106,15 +109,15 @@ def scrape_data():
 
                 all_items.append({'title': title, 'pub_at': pub_at})
 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
 
                 content = ""
                 try:
-                    detail_resp = requests.get(article_url, headers=headers, timeout=15)
+                    detail_resp = http_get(article_url, headers=headers, timeout=15)
                     detail_resp.encoding = detail_resp.apparent_encoding
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
 
                     content_elem = detail_soup.find('div', class_='article-content')
                     if not content_elem:
@@ -1,8 +1,9 @@
 
 import os
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 
 from db_utils import save_to_policy
 
@@ -18,12 +19,13 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
 
         
-        response = requests.get(url, timeout=30)
+        response = http_get(url, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         ajax_url = None
         scripts = soup.find_all('script')
@@ -57,7 +59,7 @@ def scrape_data():
         
         policy_items = []
         try:
-            ajax_response = requests.get(ajax_url, timeout=15)
+            ajax_response = http_get(ajax_url, timeout=15)
             if ajax_response.status_code == 200:
                 import json
                 data = ajax_response.json()
@@ -91,15 +93,15 @@ def scrape_data():
             
             all_items.append({'title': title, 'pub_at': pub_at})
             
-            if pub_at != yesterday:
+            if pub_at not in target_dates:
                 filtered_count += 1
                 continue
             
             content = ""
             try:
-                detail_response = requests.get(policy_url, timeout=15)
+                detail_response = http_get(policy_url, timeout=15)
                 detail_response.raise_for_status()
-                detail_soup = BeautifulSoup(detail_response.content, 'html.parser')
+                detail_soup = make_soup(detail_response.content, detail_response.url)
                 content_elem = detail_soup.select_one('#UCAP-CONTENT')
                 if content_elem:
                     content = content_elem.get_text(strip=True)
@@ -1,8 +1,9 @@
 import os
 import re
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta
+from run_context import get_target_dates
 
 # 导入数据库工具
 from db_utils import save_to_policy
@@ -34,15 +35,16 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
 
         
         # 发送请求
-        response = requests.get(url, timeout=30)
+        response = http_get(url, timeout=30)
         response.raise_for_status()
         
         # 解析HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # 查找JSON数据URL
         json_url = None
@@ -65,7 +67,7 @@ def scrape_data():
             if not json_url:
                 json_url = "https://www.gov.cn/zhengce/jiedu/ZCJD_QZ.json"
             
-            response = requests.get(json_url, timeout=15)
+            response = http_get(json_url, timeout=15)
             if response.status_code == 200:
                 import json
                 data = response.json()
@@ -83,16 +85,16 @@ def scrape_data():
                                 # 保存到 all_items 用于显示最新5条
                                 all_items.append({'title': article['TITLE'], 'pub_at': pub_at})
                                 
-                                if pub_at == yesterday:
+                                if pub_at in target_dates:
                                     # 获取文章URL
                                     article_url = article['URL'] if article['URL'].startswith('http') else f"https://www.gov.cn{article['URL']}"
                                     
                                     # 抓取详情页内容
                                     content = ""
                                     try:
-                                        detail_response = requests.get(article_url, timeout=15)
+                                        detail_response = http_get(article_url, timeout=15)
                                         detail_response.raise_for_status()
-                                        detail_soup = BeautifulSoup(detail_response.content, 'html.parser')
+                                        detail_soup = make_soup(detail_response.content, detail_response.url)
                                         # 使用用户提供的XPath对应的CSS选择器
                                         content_elem = detail_soup.select_one('#UCAP-CONTENT')
                                         if content_elem:
@@ -1,7 +1,9 @@
 import os
 import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -34,7 +36,7 @@ def get_api_session():
         'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
     }
     
-    session.get(TARGET_URL, headers=main_headers, timeout=30)
+    http_get(TARGET_URL, session=session, headers=main_headers, timeout=30)
     
     for cookie in API_COOKIES.split('; '):
         if '=' in cookie:
@@ -54,7 +56,7 @@ def scrape_with_api():
             'n': '200',
             'type': 'gwyzcwjk'
         }
-        response = session.get(API_URL, headers=headers, params=params, timeout=30)
+        response = http_get(API_URL, session=session, headers=headers, params=params, timeout=30)
         data = response.json()
         searchVO = data.get('searchVO', {})
         catMap = searchVO.get('catMap', {})
@@ -108,6 +110,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         print(f"📅 运行日期（北京时间）：{today}")
         print(f"🎯 目标抓取日期：{yesterday}")
@@ -132,15 +135,15 @@ def scrape_data():
                 if not href.startswith('http'):
                     href = f"https://sousuo.www.gov.cn{href}"
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
                 content = ""
                 try:
-                    detail_resp = requests.get(href, headers=headers, timeout=15)
+                    detail_resp = http_get(href, headers=headers, timeout=15)
                     detail_resp.raise_for_status()
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
                     
                     content_table = detail_soup.find('table', class_='border-table noneBorder pages_content')
                     if content_table:
@@ -1,6 +1,7 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 import json
 
@@ -12,6 +13,7 @@ headers = {
 }
 
 TARGET_URL = "https://www.mca.gov.cn/gdnps/searchIndex.jsp?params=%257B%2522goPage%2522%253A1%252C%2522orderBy%2522%253A%255B%257B%2522orderBy%2522%253A%2522scrq%2522%252C%2522reverse%2522%253Atrue%257D%252C%257B%2522orderBy%2522%253A%2522orderTime%2522%252C%2522reverse%2522%253Atrue%257D%255D%252C%2522pageSize%2522%253A15%252C%2522queryParam%2522%253A%255B%257B%2522shortName%2522%253A%2522ownSubjectDn%2522%252C%2522value%2522%253A%2522%252F1%252F139%252F2445%252F2575%2522%257D%252C%257B%2522shortName%2522%253A%2522fbjg%2522%252C%2522value%2522%253A%2522%252F1%252F139%252F2445%252F2575%2522%257D%252C%257B%257D%252C%257B%257D%255D%252C%2522doRepeated%2522%253A0%257D"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -22,12 +24,13 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         print(f"📅 运行日期（北京时间）：{today}")
         print(f"🎯 目标抓取日期：{yesterday}")
         
         print("正在从API获取数据...")
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
         
         # Parse JSON response
@@ -76,14 +79,14 @@ def scrape_data():
                 
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
                 # Extract text from HTML content
                 content = ""
                 if html_content:
-                    content_soup = BeautifulSoup(html_content, 'html.parser')
+                    content_soup = make_soup(html_content)
                     content = content_soup.get_text(separator='\n', strip=True)
                 
                 # Build URL from record
@@ -1,7 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
+from date_utils import extract_date as parse_date
 from datetime import datetime, timedelta, timezone
-import re
+from run_context import get_target_dates
 
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -20,30 +21,13 @@ TARGET_URLS = {
 BASE_URL = 'https://www.mee.gov.cn'
 
 
-def parse_date(date_str):
-    patterns = [
-        r'(\d{4})-(\d{2})-(\d{2})',
-        r'(\d{4})/(\d{2})/(\d{2})',
-        r'(\d{4})年(\d{2})月(\d{2})日',
-        r'(\d{4})年(\d{1,2})月(\d{1,2})日',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, date_str)
-        if match:
-            try:
-                return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3))).date()
-            except ValueError:
-                continue
-    return None
-
-
 def get_article_content(url):
     content = ""
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         response.raise_for_status()
         response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text, response.url)
         
         content_box = soup.find(class_='content_box')
         if content_box:
@@ -66,14 +50,15 @@ def scrape_data(source_name, url):
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         print(f"[INFO] 运行日期（北京时间）：{today}")
         print(f"[INFO] 目标抓取日期：{yesterday}")
         
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         response.raise_for_status()
         response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text, response.url)
         
         div_container = soup.find(id='div')
         if not div_container:
@@ -112,7 +97,7 @@ def scrape_data(source_name, url):
                 
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
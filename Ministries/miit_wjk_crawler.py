@@ -1,23 +1,13 @@
 
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
+from content_extractor import extract_content
+from date_utils import extract_date, parse_epoch_millis
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 import time
 
-# Selenium 为可选依赖
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from webdriver_manager.chrome import ChromeDriverManager
-    from selenium.webdriver.chrome.service import Service
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
-
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
@@ -40,6 +30,7 @@ def scrape_data():
         today = datetime.now(tz_utc8).date()
         # 使用前一天的日期
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         # yesterday = datetime(2026, 2, 24).date()  # 测试有数据的日期
         
         filtered_count = 0
@@ -51,7 +42,7 @@ def scrape_data():
             "searchid": "183"  # 从URL参数获取的category值
         }
         
-        category_response = requests.get(category_api_url, params=category_params, headers=headers, timeout=30)
+        category_response = http_get(category_api_url, params=category_params, headers=headers, timeout=30)
         
         cateid = "183"  # 默认值
         if category_response.status_code == 200:
@@ -93,7 +84,7 @@ def scrape_data():
         # 移除Content-Type头，使用默认的GET请求
         if 'Content-Type' in headers:
             del headers['Content-Type']
-        response = requests.get(api_url, params=params, headers=headers, timeout=30)
+        response = http_get(api_url, params=params, headers=headers, timeout=30)
         
         if response.status_code == 200:
             try:
@@ -127,56 +118,32 @@ def scrape_data():
                                 else:
                                     article_url = url
                                 
-                                # 解析日期
-                                pub_at = None
-                                
-                                # 优先使用jsearch_date字段（已经是字符串格式）
-                                if 'jsearch_date' in group_data:
-                                    jsearch_date = group_data.get('jsearch_date', '')
-                                    if jsearch_date:
-                                        try:
-                                            pub_at = datetime.strptime(jsearch_date, '%Y-%m-%d').date()
-                                        except ValueError:
-                                            pass
-                                
-                                # 如果没有jsearch_date，尝试解析时间戳格式的日期
-                                if not pub_at and deploytime:
-                                    try:
-                                        # 处理时间戳格式
-                                        if isinstance(deploytime, str):
-                                            # 尝试将时间戳转换为日期
-                                            timestamp = int(deploytime) / 1000  # 毫秒转秒
-                                            pub_at = datetime.fromtimestamp(timestamp, tz=timezone(timedelta(hours=8))).date()
-                                    except (ValueError, TypeError):
-                                        pass
-                                
-                                # 尝试其他日期字段
-                                if not pub_at:
-                                    # 尝试cdate字段
-                                    cdate = group_data.get('cdate', '')
-                                    if cdate:
-                                        try:
-                                            timestamp = int(cdate) / 1000
-                                            pub_at = datetime.fromtimestamp(timestamp, tz=timezone(timedelta(hours=8))).date()
-                                        except (ValueError, TypeError):
-                                            pass
+                                # 解析日期：优先使用jsearch_date字段（已经是字符串格式），
+                                # 其次是毫秒时间戳格式的deploytime和cdate字段
+                                pub_at = (
+                                    extract_date(group_data.get('jsearch_date'))
+                                    or parse_epoch_millis(deploytime)
+                                    or parse_epoch_millis(group_data.get('cdate'))
+                                )
                                 
                                 # 保存到 all_items 用于显示最新5条
                                 all_items.append({'title': title, 'pub_at': pub_at})
                                 
-                                if pub_at != yesterday:
+                                if pub_at not in target_dates:
                                     filtered_count += 1
                                     continue
                                 
                                 # 抓取内容
                                 content = ""
                                 try:
-                                    detail_resp = requests.get(article_url, headers=headers, timeout=15)
-                                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
-                                    # 优先使用 #con_con，然后尝试其他选择器
-                                    content_elem = detail_soup.select_one('#con_con') or detail_soup.select_one('.content') or detail_soup.select_one('#content') or detail_soup.select_one('.article-content') or detail_soup.select_one('.TRS_Editor')
-                                    if content_elem:
-                                        content = content_elem.get_text(strip=True)
+                                    detail_resp = http_get(article_url, headers=headers, timeout=15)
+                                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
+                                    # 优先使用 #con_con，然后尝试其他选择器，都未命中时由正文提取器按文本密度回退
+                                    content = extract_content(
+                                        detail_soup,
+                                        ('#con_con', '.content', '#content', '.article-content', '.TRS_Editor'),
+                                        separator=''
+                                    ).content
                                 except Exception:
                                     pass
                                 
@@ -261,7 +228,7 @@ def run_test():
         search_url = f"https://www.miit.gov.cn/search/zcwjk.html?websiteid=110000000000000&pg=10&p=1&tpl=14&category=183&q=&begin={yesterday}&end={yesterday}"
         print(f"Testing search URL: {search_url}")
         
-        response = requests.get(search_url, headers=headers, timeout=30)
+        response = http_get(search_url, headers=headers, timeout=30)
         print(f"Response status: {response.status_code}")
         
         if response.status_code == 200:
@@ -270,7 +237,7 @@ def run_test():
                 f.write(response.text)
             print("Saved full page to miit_full_page.html")
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content, response.url)
             print(f"Page title: {soup.title.string}")
             
             # 查找搜索结果
@@ -1,6 +1,7 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -10,6 +11,7 @@ headers = {
 }
 
 TARGET_URL = "https://gi.mnr.gov.cn/1285/1317/index_6200.html"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -20,14 +22,15 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         print(f"[INFO] 运行日期（北京时间）：{today}")
         print(f"[INFO] 目标抓取日期：{yesterday}")
         
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
         response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text, response.url)
         
         listfr = soup.find('div', class_='listfr')
         if not listfr:
@@ -82,7 +85,7 @@ def scrape_data():
                 all_items.append({'title': title, 'pub_at': pub_at})
                 article_count += 1
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
@@ -1,7 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta, timezone
 import re
+from http_utils import http_get
+from html_utils import make_soup
+from date_utils import make_date
+from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -10,6 +12,10 @@ headers = {
 }
 
 TARGET_URL = "http://www.moe.gov.cn/was5/web/search?channelid=239993"
+LIST_PROBE_URL = TARGET_URL
+
+# 列表日期固定为 YYYY-MM-DD；标题中可能出现「X年X月X日」，不能使用通用日期正则
+DATE_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
 
 
 def scrape_data():
@@ -20,13 +26,14 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         print(f"📅 运行日期（北京时间）：{today}")
         print(f"🎯 目标抓取日期：{yesterday}")
         
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         uls = soup.find_all('ul')
         if len(uls) < 7:
@@ -55,29 +62,20 @@ def scrape_data():
                 if not href.startswith('http'):
                     href = f"http://www.moe.gov.cn{href}"
                 
-                text = li.get_text(strip=True)
-                date_pattern = re.compile(r'(\d{4}-\d{2}-\d{2})')
-                match = date_pattern.search(text)
-                date_str = match.group(1) if match else ''
-                
-                pub_at = None
-                if date_str:
-                    try:
-                        pub_at = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    except ValueError:
-                        pass
+                match = DATE_PATTERN.search(li.get_text(strip=True))
+                pub_at = make_date(*match.groups()) if match else None
                 
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
                 content = ""
                 try:
-                    detail_resp = requests.get(href, headers=headers, timeout=15)
+                    detail_resp = http_get(href, headers=headers, timeout=15)
                     detail_resp.raise_for_status()
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
                     
                     content_div = detail_soup.find(id='downloadContent')
                     if content_div:
@@ -1,6 +1,7 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 
 headers = {
@@ -10,6 +11,7 @@ headers = {
 }
 
 TARGET_URL = "https://www.mof.gov.cn/gkml/bulinggonggao/tongzhitonggao/"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -20,16 +22,17 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
 
         print(f"[INFO] 运行日期（北京时间）：{today}")
         print(f"[INFO] 目标抓取日期：{yesterday}")
 
         print("正在获取页面列表...")
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
         response.encoding = 'utf-8'
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text, response.url)
 
         ul_list = soup.find_all('ul', class_='xwbd_lianbolistfrcon')
         if not ul_list:
@@ -78,16 +81,16 @@ def scrape_data():
 
                     all_items.append({'title': title, 'pub_at': pub_at})
 
-                    if pub_at != yesterday:
+                    if pub_at not in target_dates:
                         filtered_count += 1
                         continue
 
                     content = ""
                     try:
-                        detail_resp = requests.get(href, headers=headers, timeout=15)
+                        detail_resp = http_get(href, headers=headers, timeout=15)
                         if detail_resp.status_code == 200:
                             detail_resp.encoding = 'utf-8'
-                            detail_soup = BeautifulSoup(detail_resp.text, 'html.parser')
+                            detail_soup = make_soup(detail_resp.text, detail_resp.url)
 
                             content_div = detail_soup.find('div', class_='mainboxerji')
                             if content_div:
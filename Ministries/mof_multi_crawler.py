@@ -1,7 +1,8 @@
-import requests
+from http_utils import http_get
 import time
-from bs4 import BeautifulSoup
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 from urllib.parse import urljoin
 import re
 
@@ -58,17 +59,18 @@ def scrape_single_config(config):
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
 
         for retry in range(3):
             try:
-                response = requests.get(url, headers=headers, timeout=45)
+                response = http_get(url, headers=headers, timeout=45)
                 response.raise_for_status()
                 break
             except Exception:
                 if retry == 2:
                     raise
                 time.sleep(1)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
 
         ul_element = soup.find('ul', class_='liBox')
         if not ul_element:
@@ -123,7 +125,7 @@ def scrape_single_config(config):
 
                 all_items.append({'title': title, 'pub_at': pub_at})
 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
 
@@ -131,14 +133,14 @@ def scrape_single_config(config):
                 try:
                     for retry in range(3):
                         try:
-                            detail_resp = requests.get(article_url, headers=headers, timeout=30)
+                            detail_resp = http_get(article_url, headers=headers, timeout=30)
                             detail_resp.raise_for_status()
                             break
                         except Exception:
                             if retry == 2:
                                 raise
                             time.sleep(0.5)
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
 
                     content_elem = detail_soup.find('div', class_='TRS_Editor')
                     if not content_elem:
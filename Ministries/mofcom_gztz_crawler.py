@@ -1,6 +1,7 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 import json
 
@@ -18,8 +19,8 @@ def get_article_list():
     try:
         # 从页面中提取必要的参数
         page_url = TARGET_URL
-        response = requests.get(page_url, headers=headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = http_get(page_url, headers=headers)
+        soup = make_soup(response.content, response.url)
         
         # 查找script标签获取参数
         script_tag = soup.select_one('script[parsetype="bulidstatic"]')
@@ -69,7 +70,7 @@ def get_article_list():
         
         # 发送API请求（使用GET方法）
         try:
-            api_response = requests.get(api_url, params=querydata, headers=api_headers, timeout=30)
+            api_response = http_get(api_url, params=querydata, headers=api_headers, timeout=30)
             api_response.raise_for_status()
             
             # 解析API响应
@@ -85,7 +86,7 @@ def get_article_list():
                 return []
             
             # 解析HTML获取文章列表
-            article_soup = BeautifulSoup(html_content, 'html.parser')
+            article_soup = make_soup(html_content)
             article_list = article_soup.find_all('li')
             
             articles = []
@@ -155,10 +156,10 @@ def get_article_list():
 def get_article_content(url):
     """获取文章内容"""
     try:
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_get(url, headers=headers, timeout=15)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # 优先从指定的div容器中提取内容
         content_elem = soup.select_one('div[ergodic="article"].art-con.art-con-bottonmLine[aria-region="true"][aria-autolabel="true"][aria-label="正文区"]')
@@ -211,6 +212,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         # 获取文章列表
         articles = get_article_list()
@@ -231,7 +233,7 @@ def scrape_data():
                 # 保存到 all_items 用于显示最新5条
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
@@ -1,7 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
+from date_utils import extract_date as parse_date
 from datetime import datetime, timedelta, timezone
-import re
+from run_context import get_target_dates
 
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -10,36 +11,21 @@ headers = {
 }
 
 TARGET_URL = "https://www.mohrss.gov.cn/was5/web/search?channelid=203464&orderby=date&default=isall"
+LIST_PROBE_URL = TARGET_URL
 BASE_URL = "http://www.mohrss.gov.cn"
 
 
-def parse_date(date_str):
-    patterns = [
-        r'(\d{4})-(\d{2})-(\d{2})',
-        r'(\d{4})/(\d{2})/(\d{2})',
-        r'(\d{4})年(\d{2})月(\d{2})日',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, date_str)
-        if match:
-            try:
-                return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3))).date()
-            except ValueError:
-                continue
-    return None
-
-
 def get_article_content(url):
     content = ""
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         if response.status_code == 200:
             if 'javascript' in response.text.lower() and len(response.text) < 2000:
                 print(f"[WARN] 详情页可能有反爬虫，跳过内容抓取")
                 return content
                 
             response.encoding = 'utf-8'
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text, response.url)
             
             content_div = soup.find('div', class_='art_det')
             if content_div:
@@ -62,12 +48,13 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         print(f"[INFO] 运行日期（北京时间）：{today}")
         print(f"[INFO] 目标抓取日期：{yesterday}")
         
         print("[INFO] 获取搜索列表页面...")
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
         response.encoding = 'utf-8'
         
@@ -75,7 +62,7 @@ def scrape_data():
             print("[ERROR] 列表页遇到反爬虫机制")
             return policies, all_items
             
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text, response.url)
         
         iframe_list = soup.find('div', class_='iframe-list')
         if not iframe_list:
@@ -120,7 +107,7 @@ def scrape_data():
                 
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
@@ -1,9 +1,9 @@
 
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
-import dns.resolver
 from urllib.parse import urlparse
 
 headers = {
@@ -26,6 +26,9 @@ DNS_SERVERS = ["223.5.5.5", "114.114.114.114"]
 
 
 def resolve_domain(domain):
+    # dnspython 导入较慢，首次解析时再导入
+    import dns.resolver
+
     resolver = dns.resolver.Resolver()
     resolver.nameservers = DNS_SERVERS
     answer = resolver.resolve(domain, 'A')
@@ -43,7 +46,7 @@ def get_with_custom_dns(url, headers=None, params=None, timeout=30):
     req_headers = headers.copy() if headers else {}
     req_headers["Host"] = domain
 
-    return requests.get(
+    return http_get(
         new_url,
         headers=req_headers,
         params=params,
@@ -59,6 +62,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
 
         
@@ -69,7 +73,7 @@ def scrape_data():
             timeout=30
         )
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         items = soup.find_all('tr')
         filtered_count = 0
@@ -107,7 +111,7 @@ def scrape_data():
                 # 保存到 all_items 用于显示最新5条
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
@@ -118,7 +122,7 @@ def scrape_data():
                         headers=headers,
                         timeout=15
                     )
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
                     content_elem = detail_soup.find('div', class_='editor-content') or detail_soup.find('div', class_='ccontent') or detail_soup.find('div', class_='content') or detail_soup.find('div', id='content')
                     if content_elem:
                         content = content_elem.get_text(strip=True)
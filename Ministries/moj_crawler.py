@@ -1,10 +1,12 @@
 import re
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 from html import unescape
 from urllib.parse import urljoin
 
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get, http_post
+from html_utils import make_soup
+from date_utils import extract_date as parse_date
 
 
 BASE_URL = "https://www.moj.gov.cn"
@@ -27,26 +29,10 @@ headers = {
 }
 
 
-def parse_date(date_str):
-    if not date_str:
-        return None
-
-    match = re.search(r"(\d{4})-(\d{2})-(\d{2})", str(date_str))
-    if not match:
-        return None
-
-    try:
-        return datetime(
-            int(match.group(1)), int(match.group(2)), int(match.group(3))
-        ).date()
-    except ValueError:
-        return None
-
-
 def html_to_text(html):
     if not html:
         return ""
-    soup = BeautifulSoup(unescape(str(html)), "html.parser")
+    soup = make_soup(unescape(str(html)))
     return soup.get_text(separator="\n", strip=True)
 
 
@@ -66,7 +52,7 @@ def fetch_policy_list(page_num=1, page_size=10):
         "file_status": "1",
     }
 
-    response = requests.post(LIST_API, json=payload, headers=headers, timeout=30)
+    response = http_post(LIST_API, json=payload, headers=headers, timeout=30)
     response.raise_for_status()
     data = response.json()
 
@@ -89,7 +75,7 @@ def fetch_policy_detail(article_id):
         "pkid": article_id,
     }
 
-    response = requests.post(DETAIL_API, json=payload, headers=headers, timeout=30)
+    response = http_post(DETAIL_API, json=payload, headers=headers, timeout=30)
     response.raise_for_status()
     data = response.json()
 
@@ -109,10 +95,10 @@ def get_article_content(url, article_id=None):
         print(f"[WARN] 详情接口抓取失败，改用页面解析: {e}")
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         response.raise_for_status()
         response.encoding = "utf-8"
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = make_soup(response.text, response.url)
 
         content_div = (
             soup.find("div", class_="newDeta w1200")
@@ -148,10 +134,10 @@ def normalize_api_item(item):
 
 
 def fetch_list_from_page():
-    response = requests.get(TARGET_URL, headers=headers, timeout=30)
+    response = http_get(TARGET_URL, headers=headers, timeout=30)
     response.raise_for_status()
     response.encoding = "utf-8"
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = make_soup(response.text, response.url)
 
     div = soup.find(id="gfxwj_news_list")
     if not div:
@@ -209,6 +195,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
 
         print(f"[INFO] 运行日期（北京时间）: {today}")
         print(f"[INFO] 目标抓取日期: {yesterday}")
@@ -222,7 +209,7 @@ def scrape_data():
                 article_url = item["url"]
                 pub_at = item["pub_at"]
 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
 
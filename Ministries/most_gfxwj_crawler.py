@@ -1,6 +1,7 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 from urllib.parse import urljoin
 
@@ -11,6 +12,7 @@ headers = {
 }
 
 TARGET_URL = "https://www.most.gov.cn/xxgk/xinxifenlei/fdzdgknr/fgzc/gfxwj/"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data():
@@ -21,13 +23,14 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         print(f"运行日期（北京时间）：{today}")
         print(f"目标抓取日期：{yesterday}")
         
-        response = requests.get(TARGET_URL, headers=headers, timeout=30)
+        response = http_get(TARGET_URL, headers=headers, timeout=30)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # Find data_list div
         data_list = soup.find(id='data_list')
@@ -70,16 +73,16 @@ def scrape_data():
                 
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
                 # Fetch detail page content
                 content = ""
                 try:
-                    detail_resp = requests.get(full_url, headers=headers, timeout=15)
+                    detail_resp = http_get(full_url, headers=headers, timeout=15)
                     if detail_resp.status_code == 200:
-                        detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                        detail_soup = make_soup(detail_resp.content, detail_resp.url)
                         
                         # Try the specific XPath: //div[@class="xxgk_detail_content style1"]
                         content_div = detail_soup.find('div', class_='xxgk_detail_content style1')
@@ -1,8 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
+from date_utils import extract_date as parse_date
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 import asyncio
+import importlib.util
 
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -13,43 +16,29 @@ headers = {
 TARGET_URL = "https://www.mps.gov.cn/n6557558/index.html"
 BASE_URL = "https://www.mps.gov.cn"
 
-CRAWL4AI_AVAILABLE = False
-try:
-    from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
-    CRAWL4AI_AVAILABLE = True
-except ImportError:
-    print("[WARN] crawl4ai not installed")
 
-SELENIUM_AVAILABLE = False
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.chrome.service import Service
-    from webdriver_manager.chrome import ChromeDriverManager
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    print("[WARN] Selenium not installed")
+def _module_available(name):
+    """只检查模块是否安装，不导入（crawl4ai / Selenium 导入耗时较长，首次使用时再导入）"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
 
 
-def parse_date(date_str):
-    patterns = [
-        r'(\d{4})-(\d{2})-(\d{2})',
-        r'(\d{4})/(\d{2})/(\d{2})',
-        r'(\d{4})年(\d{2})月(\d{2})日',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, date_str)
-        if match:
-            try:
-                return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3))).date()
-            except ValueError:
-                continue
-    return None
+CRAWL4AI_AVAILABLE = _module_available("crawl4ai")
+if not CRAWL4AI_AVAILABLE:
+    print("[WARN] crawl4ai not installed")
+
+SELENIUM_AVAILABLE = _module_available("selenium") and _module_available("webdriver_manager")
+if not SELENIUM_AVAILABLE:
+    print("[WARN] Selenium not installed")
 
 
 async def scrape_with_crawl4ai():
     if not CRAWL4AI_AVAILABLE:
         return None
+
+    from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
     
     config = CrawlerRunConfig(
         page_timeout=60000,
@@ -77,6 +66,11 @@ def scrape_with_selenium():
         return None
     
     import time
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
     options = Options()
     options.add_argument('--headless=new')
     options.add_argument('--no-sandbox')
@@ -107,10 +101,10 @@ def scrape_with_selenium():
 def get_article_content(url):
     content = ""
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         response.raise_for_status()
         response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text, response.url)
         
         content_div = soup.find('div', class_='wordContent w915')
         if content_div:
@@ -133,6 +127,7 @@ async def scrape_data_async():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         print(f"[INFO] 运行日期（北京时间）：{today}")
         print(f"[INFO] 目标抓取日期：{yesterday}")
@@ -159,7 +154,7 @@ async def scrape_data_async():
         if not markdown_content and not page_source:
             print("[INFO] 使用requests获取页面...")
             try:
-                response = requests.get(TARGET_URL, headers=headers, timeout=30)
+                response = http_get(TARGET_URL, headers=headers, timeout=30)
                 response.raise_for_status()
                 page_source = response.text
             except Exception as e:
@@ -181,7 +176,7 @@ async def scrape_data_async():
                     print(f"[WARN] 解析失败: {e}")
                     continue
         elif page_source:
-            soup = BeautifulSoup(page_source, 'html.parser')
+            soup = make_soup(page_source)
             
             ul_list = soup.find('ul', class_='list')
             if ul_list:
@@ -226,7 +221,7 @@ async def scrape_data_async():
             try:
                 pub_at = item['pub_at']
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
@@ -1,13 +1,15 @@
 import os
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta
+from run_context import get_target_dates
 
 # 导入数据库工具
 from db_utils import save_to_policy
 
 # 爬虫配置
 TARGET_URL = "https://www.nda.gov.cn/sjj/zwgk/list/index_pc_1.html"
+LIST_PROBE_URL = TARGET_URL
 
 
 def scrape_data_test():
@@ -28,11 +30,11 @@ def scrape_data_test():
         }
         
         # 发送请求
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         response.raise_for_status()
         
         # 解析HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # 查找所有文章列表项
         items = soup.find_all('li')
@@ -79,9 +81,9 @@ def scrape_data_test():
                 # 提取内容 - 抓取详情页内容
                 content = ""
                 try:
-                    detail_response = requests.get(article_url, headers=headers, timeout=15)
+                    detail_response = http_get(article_url, headers=headers, timeout=15)
                     detail_response.raise_for_status()
-                    detail_soup = BeautifulSoup(detail_response.content, 'html.parser')
+                    detail_soup = make_soup(detail_response.content, detail_response.url)
                     # 尝试查找内容区域
                     content_elem = detail_soup.select_one('.content') or detail_soup.select_one('#content') or detail_soup.select_one('.zwgk-content')
                     if content_elem:
@@ -136,6 +138,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
 
         
@@ -144,11 +147,11 @@ def scrape_data():
         }
         
         # 发送请求
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_get(url, headers=headers, timeout=30)
         response.raise_for_status()
         
         # 解析HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # 查找所有文章列表项
         items = soup.find_all('li')
@@ -188,16 +191,16 @@ def scrape_data():
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
                 # 过滤：只保留前一天的文章
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
                 # 提取内容
                 content = ""
                 try:
-                    detail_response = requests.get(article_url, headers=headers, timeout=15)
+                    detail_response = http_get(article_url, headers=headers, timeout=15)
                     detail_response.raise_for_status()
-                    detail_soup = BeautifulSoup(detail_response.content, 'html.parser')
+                    detail_soup = make_soup(detail_response.content, detail_response.url)
                     content_elem = detail_soup.select_one('.content') or detail_soup.select_one('#content') or detail_soup.select_one('.zwgk-content')
                     if content_elem:
                         content = content_elem.get_text(strip=True)
@@ -1,23 +1,10 @@
 import os
-import requests
+from http_utils import http_get
 import re
 import time
-from bs4 import BeautifulSoup
+from html_utils import make_soup
 from datetime import datetime, timedelta
-
-# 尝试导入 Selenium
-SELENIUM_AVAILABLE = False
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from webdriver_manager.chrome import ChromeDriverManager
-    from selenium.webdriver.chrome.service import Service
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    print("Selenium 未安装，将尝试其他方法")
+from run_context import get_target_dates
 
 # 导入数据库工具
 from db_utils import save_to_policy
@@ -50,6 +37,7 @@ def scrape_data():
         # 获取北京时间
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
         # 直接调用 API 接口（从页面代码中提取的正确 API）
         headers = {
@@ -72,7 +60,7 @@ def scrape_data():
             'sort': 'dateDesc'  # 按日期降序排序
         }
         
-        response = requests.get(api_url, headers=headers, params=params, timeout=30)
+        response = http_get(api_url, headers=headers, params=params, timeout=30)
         response.raise_for_status()
         
         # 解析 JSON
@@ -117,13 +105,13 @@ def scrape_data():
             all_items.append({'title': title, 'pub_at': pub_at})
             
             # 过滤：只保留目标日期的文章
-            if pub_at == yesterday:
+            if pub_at in target_dates:
                 # 抓取详情页内容
                 content = ""
                 try:
-                    detail_resp = requests.get(policy_url, headers=headers, timeout=15)
+                    detail_resp = http_get(policy_url, headers=headers, timeout=15)
                     detail_resp.raise_for_status()
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
                     
                     # 使用XPath查找内容区域
                     # 注意：BeautifulSoup不直接支持XPath，我们使用CSS选择器来模拟
@@ -1,6 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
+from date_utils import extract_date
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 from urllib.parse import urljoin
 
@@ -10,10 +12,11 @@ headers = {
 
 TARGET_URL = "https://www.nea.gov.cn/policy/zxwj.htm"
 LIST_JSON_URL = "https://www.nea.gov.cn/policy/ds_40d365c13659452aa06cdb7268d6192e.json"
+LIST_PROBE_URL = LIST_JSON_URL
 
 
 def clean_title(value):
-    text = BeautifulSoup(value or "", "html.parser").get_text("", strip=True)
+    text = make_soup(value or "").get_text("", strip=True)
     return re.sub(r"\s+", " ", text).strip()
 
 
@@ -21,17 +24,11 @@ def parse_publish_date(value):
     if not value:
         return None
     pub_str = str(value).strip()
-    for fmt, size in (("%Y-%m-%d", 10), ("%Y%m%d", 8)):
-        if len(pub_str) >= size:
-            try:
-                return datetime.strptime(pub_str[:size], fmt).date()
-            except ValueError:
-                pass
-    return None
+    return extract_date(pub_str[:10]) or extract_date(pub_str[:8])
 
 
 def fetch_article_list():
-    response = requests.get(
+    response = http_get(
         LIST_JSON_URL,
         headers={**headers, "Referer": TARGET_URL},
         timeout=30,
@@ -54,10 +51,10 @@ def extract_detail_url(item):
 
 
 def fetch_detail_content(detail_url):
-    detail_resp = requests.get(detail_url, headers=headers, timeout=15)
+    detail_resp = http_get(detail_url, headers=headers, timeout=15)
     detail_resp.raise_for_status()
     detail_resp.encoding = detail_resp.apparent_encoding
-    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+    detail_soup = make_soup(detail_resp.content, detail_resp.url)
 
     content_elem = detail_soup.find('td', class_='detail')
     if not content_elem:
@@ -86,6 +83,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         print(f"[DATE] 运行日期（北京时间）：{today}")
         print(f"[TARGET] 目标抓取日期：{yesterday}")
 
@@ -108,7 +106,7 @@ def scrape_data():
 
             all_items.append({'title': title, 'pub_at': pub_at})
 
-            if pub_at != yesterday:
+            if pub_at not in target_dates:
                 filtered_count += 1
                 continue
 
@@ -138,9 +136,9 @@ def scrape_data():
             print('[INFO] 测试详情页抓取功能...')
             test_url = "http://www.nea.gov.cn/20260514/ded62aeb85294f51ab9597405dcd3449/c.html"
             try:
-                test_resp = requests.get(test_url, headers=headers, timeout=15)
+                test_resp = http_get(test_url, headers=headers, timeout=15)
                 test_resp.encoding = test_resp.apparent_encoding
-                test_soup = BeautifulSoup(test_resp.content, 'html.parser')
+                test_soup = make_soup(test_resp.content, test_resp.url)
                 content_elem = test_soup.find('td', class_='detail')
                 if content_elem:
                     content = content_elem.get_text(separator='\n', strip=True)
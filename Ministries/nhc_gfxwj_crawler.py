@@ -1,9 +1,14 @@
 import re
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 from urllib.parse import quote, unquote, urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from content_extractor import MIN_CONFIDENCE, extract_content, text_confidence
+from fetch_strategy import resolve_cached, run_tiers, wait_for_probes
+from http_utils import http_get
+from html_utils import make_soup
+from date_utils import extract_date as parse_date
 from urllib3.exceptions import InsecureRequestWarning
 
 
@@ -14,6 +19,7 @@ BASE_URL = "https://www.nhc.gov.cn"
 TARGET_URL = f"{BASE_URL}/wjw/gfxwjj/list.shtml"
 READER_PREFIX = "https://r.jina.ai/http://r.jina.ai/http://"
 SOURCE_NAME = "国家卫生健康委员会规范性文件"
+STRATEGY_KEY = "www.nhc.gov.cn"
 
 headers = {
     "User-Agent": (
@@ -29,22 +35,6 @@ headers = {
 }
 
 
-def parse_date(text):
-    if not text:
-        return None
-
-    match = re.search(r"(\d{4})[-/年.](\d{1,2})[-/月.](\d{1,2})", str(text))
-    if not match:
-        return None
-
-    try:
-        return datetime(
-            int(match.group(1)), int(match.group(2)), int(match.group(3))
-        ).date()
-    except ValueError:
-        return None
-
-
 def clean_lines(text):
     return "\n".join(line.strip() for line in text.splitlines() if line.strip())
 
@@ -54,9 +44,9 @@ def reader_url(url):
 
 
 def fetch_text(url, session=None, use_reader=False, timeout=30):
-    client = session or requests.Session()
+    # 经过 http_utils：官网和 Reader 按域名熔断，宕机时后续请求立即失败
     target = reader_url(url) if use_reader else url
-    response = client.get(target, headers=headers, timeout=timeout, verify=False)
+    response = http_get(target, session=session, headers=headers, timeout=timeout, verify=False)
     print(f"[INFO] 响应状态码: {response.status_code} - {target}")
 
     if response.status_code == 412 and not use_reader:
@@ -70,7 +60,7 @@ def fetch_text(url, session=None, use_reader=False, timeout=30):
 
 
 def parse_html_list(html):
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     ul_element = soup.find("ul", class_="zxxx_list") or soup.find("ul")
     if not ul_element:
         return []
@@ -94,16 +84,18 @@ def parse_html_list(html):
     return items
 
 
+READER_LINK_PATTERN = re.compile(
+    r"^\s*[-*]\s*\[(?P<title>.+?)\]\((?P<url>https?://www\.nhc\.gov\.cn/.+?)\)\s*(?P<date>\d{4}[-/]\d{2}[-/]\d{2})?\s*$"
+)
+READER_PLAIN_PATTERN = re.compile(r"^\s*[-*]\s*(?P<title>.+?)(?P<date>\d{4}-\d{2}-\d{2})\s*$")
+
+
 def parse_reader_list(markdown):
     items = []
-    pattern = re.compile(
-        r"^\s*[-*]\s*\[(?P<title>.+?)\]\((?P<url>https?://www\.nhc\.gov\.cn/.+?)\)\s*(?P<date>\d{4}[-/]\d{2}[-/]\d{2})?\s*$"
-    )
-    plain_pattern = re.compile(r"^\s*[-*]\s*(?P<title>.+?)(?P<date>\d{4}-\d{2}-\d{2})\s*$")
 
     for line in markdown.splitlines():
         line = line.strip()
-        match = pattern.search(line)
+        match = READER_LINK_PATTERN.search(line)
         if match:
             title = match.group("title").strip()
             url = match.group("url").strip()
@@ -111,7 +103,7 @@ def parse_reader_list(markdown):
             items.append({"title": title, "url": url, "pub_at": pub_at})
             continue
 
-        match = plain_pattern.search(line)
+        match = READER_PLAIN_PATTERN.search(line)
         if match:
             title = match.group("title").strip()
             pub_at = parse_date(match.group("date"))
@@ -187,7 +179,11 @@ def fetch_google_indexed_list(session):
 def resolve_indexed_article_url(title, session):
     if not title:
         return ""
+    # 标题反查结果按标题缓存，同一篇文章只搜索一次
+    return resolve_cached("nhc_gfxwj", title, lambda: search_article_url(title, session))
 
+
+def search_article_url(title, session):
     query = quote(f'site:nhc.gov.cn "{title}"')
     google_url = f"https://www.google.com/search?q={query}"
     try:
@@ -206,44 +202,49 @@ def resolve_indexed_article_url(title, session):
     return ""
 
 
-def get_article_list(session):
-    try:
-        html = fetch_text(TARGET_URL, session=session)
-        items = parse_html_list(html)
-        if items:
-            print(f"[INFO] 官网页面解析得到 {len(items)} 条文章")
-            return items, "nhc"
-        print("[WARN] 官网页面未解析到列表，尝试 Reader 兜底")
-    except Exception as e:
-        print(f"[WARN] 官网列表抓取失败，尝试 Reader 兜底: {e}")
+def fetch_official_list(session=None):
+    items = parse_html_list(fetch_text(TARGET_URL, session=session))
+    if items:
+        print(f"[INFO] 官网页面解析得到 {len(items)} 条文章")
+    return items
 
-    try:
-        markdown = fetch_text(TARGET_URL, session=session, use_reader=True, timeout=90)
-        if "Target URL returned error 412" not in markdown:
-            items = parse_reader_list(markdown)
-            print(f"[INFO] Reader 解析得到 {len(items)} 条文章")
-            if items:
-                return items, "reader"
-        print("[WARN] Reader 只拿到 412 页面，尝试 Google 索引兜底")
-    except Exception as e:
-        print(f"[WARN] Reader 列表抓取失败，尝试 Google 索引兜底: {e}")
 
-    items = fetch_google_indexed_list(session)
-    return items, "indexed"
+def fetch_reader_list(session):
+    markdown = fetch_text(TARGET_URL, session=session, use_reader=True, timeout=90)
+    if "Target URL returned error 412" in markdown:
+        print("[WARN] Reader 只拿到 412 页面")
+        return []
+    items = parse_reader_list(markdown)
+    print(f"[INFO] Reader 解析得到 {len(items)} 条文章")
+    return items
 
 
-def parse_html_content(html):
-    soup = BeautifulSoup(html, "html.parser")
-    content_elem = (
-        soup.find("div", class_="content")
-        or soup.find("div", class_="article")
-        or soup.find("div", id="content")
-        or soup.find("div", class_=lambda x: x and any(k in x for k in ("main", "body", "text", "con")))
+def get_article_list(session):
+    # 官网 → Reader → Google 索引，按上次成功的层级优先尝试；
+    # 官网被 WAF 拦截期间在后台用独立会话探测官网是否恢复
+    source, items = run_tiers(
+        STRATEGY_KEY,
+        [
+            ("nhc", lambda: fetch_official_list(session)),
+            ("reader", lambda: fetch_reader_list(session)),
+            ("indexed", lambda: fetch_google_indexed_list(session)),
+        ],
+        probe=fetch_official_list,
     )
+    return items or [], source or "indexed"
 
-    if not content_elem:
-        return ""
-    return clean_lines(content_elem.get_text(separator="\n", strip=True))
+
+# 详情页正文容器，按顺序第一个命中的生效；最后一项为类名包含 main/body/text/con 的 div
+CONTENT_SELECTORS = (
+    "div.content",
+    "div.article",
+    "div#content",
+    'div[class*="main"], div[class*="body"], div[class*="text"], div[class*="con"]',
+)
+
+
+def parse_html_content(html, url=None):
+    return extract_content(make_soup(html, url), CONTENT_SELECTORS).content
 
 
 def parse_reader_content(markdown):
@@ -257,18 +258,28 @@ def get_article_content(url, session, source):
     if not url:
         return ""
 
-    try:
-        if source == "reader":
-            return parse_reader_content(fetch_text(url, session=session, use_reader=True, timeout=60))
-        return parse_html_content(fetch_text(url, session=session, timeout=30))
-    except Exception as e:
-        print(f"[WARN] 详情抓取失败，尝试 Reader 兜底: {url} - {e}")
+    def from_reader():
+        return parse_reader_content(fetch_text(url, session=session, use_reader=True, timeout=60))
+
+    def from_official():
+        return parse_html_content(fetch_text(url, session=session, timeout=30), url)
+
+    if source == "reader":
         try:
-            return parse_reader_content(fetch_text(url, session=session, use_reader=True, timeout=60))
-        except Exception as reader_error:
-            print(f"[WARN] Reader 详情兜底失败: {url} - {reader_error}")
+            return from_reader()
+        except Exception as e:
+            print(f"[WARN] Reader 详情抓取失败: {url} - {e}")
             return ""
 
+    def probe_official():
+        # 后台探测使用独立连接，不与 Reader 层级共享会话
+        return parse_html_content(fetch_text(url, timeout=30), url)
+
+    # 详情页同样记忆官网/Reader 哪一层可用，官网持续拦截时直接走 Reader，并在后台探测官网是否恢复
+    _, content = run_tiers(STRATEGY_KEY + "#detail", [("nhc", from_official), ("reader", from_reader)],
+                           probe=probe_official)
+    return content or ""
+
 
 def scrape_data():
     policies = []
@@ -278,6 +289,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         print(f"[DATE] 运行日期（北京时间）: {today}")
         print(f"[TARGET] 目标抓取日期: {yesterday}")
 
@@ -297,7 +309,7 @@ def scrape_data():
                 pub_at = item["pub_at"]
 
                 # 严格验证数据，过滤无效数据
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
 
@@ -318,8 +330,9 @@ def scrape_data():
                         continue
 
                 content = get_article_content(article_url, session, source)
-                if not content or len(content) < 50:
-                    print(f"[WARN] 文章内容可能未完整抓取: {title[:50]} ({len(content)} 字)")
+                confidence = text_confidence(content)
+                if confidence < MIN_CONFIDENCE:
+                    print(f"[WARN] 文章内容可能未完整抓取: {title[:50]} ({len(content)} 字，置信度 {confidence:.2f})")
                     # 内容太短时也跳过，避免保存无效数据
                     filtered_count += 1
                     continue
@@ -339,6 +352,9 @@ def scrape_data():
                 print(f"[WARN] 单条数据处理失败: {e}")
                 continue
 
+        # 等待官网后台探测写回结果，供下次运行选择层级
+        wait_for_probes(timeout=30)
+
         print(f"[OK] 国家卫生健康委员会规范性文件爬虫: 成功抓取 {len(policies)} 条前一天数据")
         print(f"[SKIP] 过滤掉 {filtered_count} 条非目标日期的数据")
 
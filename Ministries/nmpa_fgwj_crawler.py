@@ -3,8 +3,9 @@ import sys
 import re
 import subprocess
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 
-from bs4 import BeautifulSoup
+from html_utils import make_soup
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from db_utils import save_to_policy
@@ -21,6 +22,7 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         print("[" + "日期" + "] 运行日期（北京时间）：" + str(today))
         print("[" + "目标" + "] 目标抓取日期：" + str(yesterday))
         
@@ -51,7 +53,7 @@ def scrape_data():
             print("[" + "警告" + "] 页面内容异常，可能被反爬拦截")
             return policies, all_items
         
-        soup = BeautifulSoup(page_content, 'html.parser')
+        soup = make_soup(page_content)
         
         news_list = []
         
@@ -131,7 +133,7 @@ def scrape_data():
                 
                 all_items.append({'title': title, 'pub_at': pub_at})
                 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
                 
@@ -151,7 +153,7 @@ def scrape_data():
                     detail_result = subprocess.run(detail_cmd, capture_output=True, timeout=30)
                     if detail_result.returncode == 0:
                         detail_content = detail_result.stdout.decode('utf-8', errors='ignore')
-                        detail_soup = BeautifulSoup(detail_content, 'html.parser')
+                        detail_soup = make_soup(detail_content)
                         
                         content_selectors = [
                             'div.content',
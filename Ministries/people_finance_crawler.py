@@ -1,13 +1,15 @@
 import os
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta
+from run_context import get_target_dates
 
 # 导入数据库工具
 from db_utils import save_to_policy
 
 # 爬虫配置
 TARGET_URL = "http://finance.people.com.cn/GB/70846/index.html"
+LIST_PROBE_URL = TARGET_URL
 
 # ==========================================
 # 辅助函数
@@ -27,11 +29,11 @@ def get_article_content(url):
     
     try:
         # 发送请求
-        response = requests.get(url, timeout=20)
+        response = http_get(url, timeout=20)
         response.raise_for_status()
         
         # 解析HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # 查找文章内容（根据人民网详情页结构调整选择器）
         # 常见的内容容器选择器
@@ -118,15 +120,16 @@ def scrape_data():
         # 获取北京时间
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         
 
         
         # 发送请求
-        response = requests.get(url, timeout=30)
+        response = http_get(url, timeout=30)
         response.raise_for_status()
         
         # 解析HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content, response.url)
         
         # 查找文章列表（直接查找所有li元素）
         policy_items = soup.find_all('li')
@@ -176,7 +179,7 @@ def scrape_data():
             all_items.append({'title': title, 'pub_at': pub_at})
             
             # 过滤：只保留前一天的文章
-            if pub_at != yesterday:
+            if pub_at not in target_dates:
                 filtered_count += 1
                 continue
             
@@ -1,6 +1,7 @@
-import requests
-from bs4 import BeautifulSoup
+from http_utils import http_get
+from html_utils import make_soup
 from datetime import datetime, timedelta, timezone
+from run_context import get_target_dates
 import re
 import json
 
@@ -10,6 +11,7 @@ headers = {
 
 TARGET_URL = "https://www.samr.gov.cn/zw/zfxxgk/fdzdgknr/index.html"
 API_URL = "https://www.samr.gov.cn/api-gateway/jpaas-publish-server/front/page/build/unit?webId=29e9522dc89d4e088a953d8cede72f4c&pageId=20178939d3ff4e2cb6a2301da388b6c9&parseType=bulidstatic&pageType=column&tagId=%E5%BD%93%E5%89%8D%E5%86%85%E5%AE%B9&tplSetId=5c30fb89ae5e48b9aefe3cdf49853830&paramJson=%7B%22pageNo%22%3A1%2C%22pageSize%22%3A%2225%22%2C%22search%22%3A%22%7B%5C%22createdate%5C%22%3A%5C%22%5C%22%2C%5C%22depolytime%5C%22%3A%5C%22%5C%22%2C%5C%22xxgkId%5C%22%3A%5C%221205%5C%22%2C%5C%22xxgkType%5C%22%3A%5C%22xxgk_theme%5C%22%2C%5C%22nodeId%5C%22%3A%5C%2211100000MB0143028R%5C%22%2C%5C%22isFindChild%5C%22%3Atrue%7D%22%7D"
+LIST_PROBE_URL = API_URL
 
 
 def scrape_data():
@@ -20,10 +22,11 @@ def scrape_data():
         tz_utc8 = timezone(timedelta(hours=8))
         today = datetime.now(tz_utc8).date()
         yesterday = today - timedelta(days=1)
+        target_dates = get_target_dates(today)
         print(f"[DATE] 运行日期（北京时间）：{today}")
         print(f"[TARGET] 目标抓取日期：{yesterday}")
 
-        response = requests.get(API_URL, headers=headers, timeout=30)
+        response = http_get(API_URL, headers=headers, timeout=30)
         response.raise_for_status()
         
         try:
@@ -37,7 +40,7 @@ def scrape_data():
             print('[ERROR] 市场监管总局政府信息公开爬虫：API返回的HTML内容为空')
             return policies, all_items
 
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = make_soup(html_content)
 
         table = soup.find('table')
         if not table:
@@ -104,15 +107,15 @@ def scrape_data():
 
                 all_items.append({'title': title, 'pub_at': pub_at})
 
-                if pub_at != yesterday:
+                if pub_at not in target_dates:
                     filtered_count += 1
                     continue
 
                 content = ""
                 try:
-                    detail_resp = requests.get(article_url, headers=headers, timeout=15)
+                    detail_resp = http_get(article_url, headers=headers, timeout=15)
                     detail_resp.encoding = detail_resp.apparent_encoding
-                    detail_soup = BeautifulSoup(detail_resp.content, 'html.parser')
+                    detail_soup = make_soup(detail_resp.content, detail_resp.url)
 
                     content_elem = detail_soup.find('div', class_='Three_xilan_07')
                     if not content_elem:
@@ -0,0 +1,147 @@
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import date_utils  # noqa: E402
+
+# ==========================================
+# 日期解析基准测试
+# 功能：在语料上校验 date_utils 的解析结果，
+#       并与各爬虫原有的「多正则依次尝试 + strptime」实现对比耗时
+# ==========================================
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "dates.tsv")
+
+
+def legacy_parse_date(date_str):
+    """原 mps/mohrss 爬虫的 parse_date 实现（每次调用重新查找正则）"""
+    patterns = [
+        r'(\d{4})-(\d{2})-(\d{2})',
+        r'(\d{4})/(\d{2})/(\d{2})',
+        r'(\d{4})年(\d{2})月(\d{2})日',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, date_str)
+        if match:
+            try:
+                return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3))).date()
+            except ValueError:
+                continue
+    return None
+
+
+def legacy_inline(text):
+    """原 Jiangsu 爬虫的内联写法：re.search 后拼接字符串再 strptime"""
+    date_match = re.search(r'(\d{4})[-/\.](\d{1,2})[-/\.](\d{1,2})', text)
+    if date_match:
+        try:
+            return datetime.strptime(f"{date_match.group(1)}-{date_match.group(2)}-{date_match.group(3)}", '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    return None
+
+
+def legacy_epoch_millis(value):
+    """原 miit_wjk 爬虫的毫秒时间戳解析"""
+    try:
+        timestamp = int(value) / 1000
+        return datetime.fromtimestamp(timestamp, tz=timezone(timedelta(hours=8))).date()
+    except (ValueError, TypeError):
+        return None
+
+
+def load_corpus(path):
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split("\t")
+            while len(parts) < 3:
+                parts.append("")
+            kind, text, expected = parts[0], parts[1], parts[2]
+            expected_date = datetime.strptime(expected, "%Y-%m-%d").date() if expected else None
+            rows.append((kind, text, expected_date))
+    return rows
+
+
+def check_corpus(rows):
+    """校验语料中每条输入的解析结果，返回失败条目列表"""
+    failures = []
+    for kind, text, expected in rows:
+        if kind == "millis":
+            actual = date_utils.parse_epoch_millis(text)
+        else:
+            actual = date_utils.extract_date(text)
+        if actual != expected:
+            failures.append((kind, text, expected, actual))
+    return failures
+
+
+def time_func(func, inputs, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in inputs:
+            func(value)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日期解析基准测试")
+    parser.add_argument("--corpus", default=CORPUS_FILE, help="语料文件路径")
+    parser.add_argument("--repeat", type=int, default=2000, help="语料重复次数")
+    args = parser.parse_args()
+
+    rows = load_corpus(args.corpus)
+    failures = check_corpus(rows)
+    print(f"📋 语料条数: {len(rows)}")
+    if failures:
+        print(f"❌ {len(failures)} 条解析结果与期望不一致：")
+        for kind, text, expected, actual in failures:
+            print(f"   [{kind}] {text!r}: 期望 {expected}，实际 {actual}")
+    else:
+        print("✅ 语料解析结果全部正确")
+
+    texts = [text for kind, text, _ in rows if kind == "text" and text]
+    millis = [text for kind, text, _ in rows if kind == "millis" and text]
+    n_text = len(texts) * args.repeat
+    n_millis = len(millis) * args.repeat
+
+    results = []
+    results.append(("原 parse_date（三正则依次尝试）", time_func(legacy_parse_date, texts, args.repeat), n_text))
+    results.append(("原内联 re.search + strptime", time_func(legacy_inline, texts, args.repeat), n_text))
+
+    date_utils.clear_cache()
+    # 冷缓存：每轮清空缓存，衡量组合正则与整数构造本身的开销
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        date_utils.clear_cache()
+        for value in texts:
+            date_utils.extract_date(value)
+    results.append(("date_utils.extract_date（冷缓存）", time.perf_counter() - start, n_text))
+
+    date_utils.clear_cache()
+    results.append(("date_utils.extract_date（热缓存）", time_func(date_utils.extract_date, texts, args.repeat), n_text))
+
+    results.append(("原 fromtimestamp 毫秒时间戳", time_func(legacy_epoch_millis, millis, args.repeat), n_millis))
+    results.append(("date_utils.parse_epoch_millis", time_func(date_utils.parse_epoch_millis, millis, args.repeat), n_millis))
+
+    print("-" * 40)
+    print(f"{'实现':<36}{'总耗时(ms)':>12}{'单次(µs)':>10}")
+    for name, elapsed, count in results:
+        per_call = elapsed / count * 1e6 if count else 0
+        print(f"{name:<36}{elapsed * 1000:>12.1f}{per_call:>10.2f}")
+    print(f"🗄️  缓存统计: {date_utils.cache_info()}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+import argparse
+import atexit
+import contextlib
+import io
+import json
+import os
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# 正文提取器会把学习到的选择器写入状态目录，基准测试使用临时目录，不影响真实状态
+_STATE_DIR = tempfile.mkdtemp(prefix="bench-extractors-")
+atexit.register(shutil.rmtree, _STATE_DIR, ignore_errors=True)
+os.environ["CRAWLER_STATE_DIR"] = _STATE_DIR
+
+from bs4 import BeautifulSoup, FeatureNotFound  # noqa: E402
+
+import html_utils  # noqa: E402
+from content_extractor import content_extractor, extract_content  # noqa: E402
+from html_utils import FAST_PARSER, SAFE_PARSER, make_soup  # noqa: E402
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from Ministries import nhc_gfxwj_crawler as nhc  # noqa: E402
+
+# ==========================================
+# 列表/详情解析微基准测试
+# 功能：在 corpus/pages 下按站点族保存的 HTML/JSON/Markdown 页面上，
+#       逐个解析函数、逐个解析器后端计时（预热一次后取中位数），
+#       并与保存的期望输出（或 html.parser 的输出）比较，标出结果不一致的组合；
+#       正文提取的期望输出由爬虫原先的 select_one 回退链生成，而不是提取器自身的输出
+# 用法：
+#       python benchmarks/bench_extractors.py run [--extractor nhc] [--update-expected]
+#       python benchmarks/bench_extractors.py add 页面文件或地址 --name jiangsu/xxx.html --extractor jiangsu.datastore_nested
+# ==========================================
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "pages")
+INDEX_FILE = "index.json"
+EXPECTED_FILE = "expected.json"
+
+CANDIDATE_BACKENDS = (SAFE_PARSER, FAST_PARSER, "html5lib")
+# 与解析器无关的解析函数（Markdown/JSON）只运行一次，后端记为 "-"
+NO_BACKEND = "-"
+
+# 与各爬虫详情页回退链一致的常见正文容器，语料站点不在 SITE_SELECTORS 中时使用
+CONTENT_SELECTORS = ("#zoom", ".main-txt", "#UCAP-CONTENT", ".TRS_Editor", "div.content", "#content")
+
+# 语料站点对应爬虫原先的 select_one 回退链（按顺序第一个命中的生效）
+SITE_SELECTORS = {
+    "www.nhc.gov.cn": nhc.CONTENT_SELECTORS,
+    "jsgzw.jiangsu.gov.cn": (".main-txt", "#zoom"),
+    "wjw.jiangsu.gov.cn": (".TRS_Editor", "#zoom", ".content", "#content", ".article-content"),
+}
+
+RECORD_PATTERN = re.compile(r'<record><!\[CDATA\[(.*?)\]\]></record>', re.DOTALL)
+TITLE_ATTR_PATTERN = re.compile(r'title=(["\'])(.*?)\1')
+HREF_ATTR_PATTERN = re.compile(r'href=(["\'])(.*?)\1')
+ISO_DATE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})')
+
+
+# ==========================================
+# 解析函数：直接调用爬虫模块中的函数；解析逻辑写在 scrape_data 内部的，
+# 按原爬虫代码抽出同样的步骤
+# ==========================================
+
+def datastore_regex(markup, url):
+    """jiangsu_gzw_crawler：外层 soup 查找 datastore 脚本，正则拆分 record"""
+    soup = make_soup(markup, url)
+    script = next((s.string for s in soup.find_all('script') if s.string and '<datastore>' in s.string), None)
+    if not script:
+        return []
+    items = []
+    for record in RECORD_PATTERN.findall(script):
+        title_match = TITLE_ATTR_PATTERN.search(record)
+        url_match = HREF_ATTR_PATTERN.search(record)
+        date_match = ISO_DATE_PATTERN.search(record)
+        if title_match and url_match and date_match:
+            items.append({"title": title_match.group(2), "url": url_match.group(2), "date": date_match.group(1)})
+    return items
+
+
+def datastore_nested(markup, url):
+    """jiangsu_styj_zcwj_crawler：datastore 和每条 record 的 CDATA 各自再建一层 soup"""
+    soup = make_soup(markup, url)
+    li_elems = []
+    target_div = soup.find('div', attrs={'aria-label': '正文区,综合政务'})
+    if target_div:
+        script_tag = target_div.find('script', type='text/xml')
+        if script_tag and script_tag.string:
+            for record in make_soup(script_tag.string).find_all('record'):
+                if record.string:
+                    li_elems.extend(make_soup(record.string).find_all('li'))
+    items = []
+    for li in li_elems:
+        a_tag = li.find('a')
+        if a_tag:
+            title = a_tag.get('title', '').strip() or a_tag.get_text(strip=True)
+            items.append({"title": title, "url": a_tag.get('href', '').strip(), "text": li.get_text(" ", strip=True)})
+    return items
+
+
+def select_one_chain(markup, url):
+    """jiangsu_gzw_crawler 详情页：select_one 回退链 + 去除干扰元素"""
+    soup = make_soup(markup, url)
+    elem = soup.select_one('.main-txt') or soup.select_one('#zoom')
+    if not elem:
+        return ""
+    for extra in elem.select('.main-word, .printer, script, style'):
+        extra.decompose()
+    return re.sub(r'浏览次数：.*$|来源：.*$', '', elem.get_text(strip=True), flags=re.MULTILINE)
+
+
+def site_selectors(url):
+    return SITE_SELECTORS.get(urlsplit(url or "").hostname, CONTENT_SELECTORS)
+
+
+def baseline_content(markup, url):
+    """爬虫原先的做法：按回退链 select_one，第一个命中的容器逐行清理空白"""
+    soup = make_soup(markup, url)
+    for selector in site_selectors(url):
+        elem = soup.select_one(selector)
+        if elem:
+            text = elem.get_text(separator='\n', strip=True)
+            return {"content": "\n".join(line.strip() for line in text.split('\n') if line.strip()),
+                    "selector": selector}
+    return {"content": "", "selector": ""}
+
+
+def generic_content(markup, url):
+    """content_extractor：站点选择器按顺序优先，回退到通用候选 + 文本密度扫描"""
+    result = extract_content(make_soup(markup, url), site_selectors(url), key=urlsplit(url or "").hostname)
+    return {"content": result.content, "selector": result.selector}
+
+
+def fallback_content(markup, url):
+    """content_extractor：不提供站点选择器，只靠通用候选 + 文本密度扫描"""
+    result = extract_content(make_soup(markup, url), (), key=urlsplit(url or "").hostname)
+    return {"content": result.content, "selector": result.selector}
+
+
+def gov_json_list(markup, url):
+    """gov_crawler：AJAX 接口返回的 JSON 列表"""
+    items = []
+    for item in json.loads(markup):
+        if not isinstance(item, dict) or not item.get('TITLE') or not item.get('URL'):
+            continue
+        policy_url = item['URL'] if item['URL'].startswith('http') else f"https://www.gov.cn{item['URL']}"
+        items.append({"title": item['TITLE'], "url": policy_url, "date": item.get('DOCRELPUBTIME', '')})
+    return items
+
+
+# 名称: (解析函数, 是否依赖 HTML 解析器)
+EXTRACTORS = {
+    "nhc.html_list": (lambda markup, url: nhc.parse_html_list(markup), True),
+    "nhc.reader_list": (lambda markup, url: nhc.parse_reader_list(markup), False),
+    "nhc.google_indexed_list": (lambda markup, url: nhc.parse_google_indexed_list(markup), False),
+    "nhc.html_content": (nhc.parse_html_content, True),
+    "jiangsu.datastore_regex": (datastore_regex, True),
+    "jiangsu.datastore_nested": (datastore_nested, True),
+    "jiangsu.select_one_chain": (select_one_chain, True),
+    "detail.extract_content": (generic_content, True),
+    "detail.extract_fallback": (fallback_content, True),
+    "gov.json_list": (gov_json_list, False),
+}
+
+# 更新期望输出时不以自身输出为准、而由原爬虫做法生成期望的解析函数
+REFERENCE_EXTRACTORS = {
+    "detail.extract_content": baseline_content,
+    "detail.extract_fallback": baseline_content,
+}
+
+
+def available_backends():
+    """返回已安装的解析器后端"""
+    backends = []
+    for name in CANDIDATE_BACKENDS:
+        try:
+            BeautifulSoup("", name)
+        except FeatureNotFound:
+            continue
+        backends.append(name)
+    return backends
+
+
+@contextlib.contextmanager
+def forced_parser(parser):
+    """临时把 html_utils 的默认解析器切换为指定后端
+
+    与运行时一致：非完整文档的 CDATA 片段仍按 html_utils 的规则使用 html.parser
+    """
+    utils = html_utils.html_utils
+    saved = utils.default_parser, utils.site_parsers
+    utils.default_parser, utils.site_parsers = parser, {}
+    try:
+        yield
+    finally:
+        utils.default_parser, utils.site_parsers = saved
+
+
+def normalize(value):
+    """把解析结果转换为可比较、可保存的 JSON 值（日期转为字符串）"""
+    return json.loads(json.dumps(value, ensure_ascii=False, default=str))
+
+
+def describe_diff(expected, actual):
+    """简要说明两个解析结果的第一处差异"""
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return f"条数 {len(expected)} → {len(actual)}"
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            if a != b:
+                return f"第 {i + 1} 条不同: {json.dumps(a, ensure_ascii=False)[:60]} → {json.dumps(b, ensure_ascii=False)[:60]}"
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        keys = [key for key in expected.keys() | actual.keys() if expected.get(key) != actual.get(key)]
+        return "字段不同: " + ", ".join(sorted(keys))
+    if isinstance(expected, str) and isinstance(actual, str):
+        offset = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b), min(len(expected), len(actual)))
+        return f"长度 {len(expected)} → {len(actual)}，第 {offset} 个字符起不同"
+    return "结果不同"
+
+
+def time_extractor(func, markup, url, repeat):
+    """预热一次后重复执行，返回 (耗时毫秒列表, 输出)"""
+    # 每个组合从相同的正文提取器状态开始：预热时学习选择器，计时的是学习后的稳定路径
+    content_extractor.learned = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        output = func(markup, url)
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(markup, url)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples, normalize(output)
+
+
+def load_json_file(path, default):
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return default
+
+
+def save_json_file(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def run_benchmark(pages_dir, repeat, only=None, update_expected=False, output=None):
+    entries = load_json_file(os.path.join(pages_dir, INDEX_FILE), [])
+    if not entries:
+        print(f"⚠️  {pages_dir} 下没有语料，请先执行 add 子命令")
+        return 1
+    expected_path = os.path.join(pages_dir, EXPECTED_FILE)
+    expected = load_json_file(expected_path, {})
+    backends = available_backends()
+    print(f"🧪 解析器后端: {', '.join(backends)}，每个组合重复 {repeat} 次")
+
+    rows = []
+    mismatches = []
+    for entry in entries:
+        with open(os.path.join(pages_dir, entry["file"]), encoding="utf-8") as f:
+            markup = f.read()
+        for name in entry["extractors"]:
+            if only and only not in name:
+                continue
+            if name not in EXTRACTORS:
+                print(f"⚠️  未知的解析函数 {name}（{entry['file']}）")
+                continue
+            func, uses_parser = EXTRACTORS[name]
+            key = f"{name}:{entry['file']}"
+            # 更新期望输出时忽略已保存的结果，以原爬虫做法或第一个后端（html.parser）的输出为准
+            reference = None if update_expected else expected.get(key)
+            if update_expected and name in REFERENCE_EXTRACTORS:
+                with forced_parser(SAFE_PARSER):
+                    reference = expected[key] = normalize(REFERENCE_EXTRACTORS[name](markup, entry.get("url")))
+
+            for backend in (backends if uses_parser else [NO_BACKEND]):
+                with forced_parser(backend) if uses_parser else contextlib.nullcontext():
+                    samples, result = time_extractor(func, markup, entry.get("url"), repeat)
+                if reference is None:
+                    reference = result
+                    if update_expected:
+                        expected[key] = result
+                diff = None if result == reference else describe_diff(reference, result)
+                if diff:
+                    mismatches.append((key, backend, diff))
+                rows.append({
+                    "extractor": name,
+                    "page": entry["file"],
+                    "backend": backend,
+                    "bytes": len(markup.encode("utf-8")),
+                    "items": len(result) if isinstance(result, list) else None,
+                    "median_ms": round(statistics.median(samples), 3),
+                    "min_ms": round(min(samples), 3),
+                    "diff": diff,
+                })
+
+    print(f"{'解析函数':<28}{'页面':<26}{'后端':<13}{'条数':>6}{'中位数(ms)':>12}{'最快(ms)':>10}  一致性")
+    for row in rows:
+        items = "-" if row["items"] is None else row["items"]
+        status = "✅" if not row["diff"] else f"❌ {row['diff']}"
+        print(f"{row['extractor']:<28}{row['page']:<26}{row['backend']:<13}{items:>6}"
+              f"{row['median_ms']:>12.3f}{row['min_ms']:>10.3f}  {status}")
+
+    print("-" * 40)
+    for backend in backends:
+        total = sum(row["median_ms"] for row in rows if row["backend"] == backend)
+        print(f"📊 {backend}: 依赖解析器的函数合计 {total:.2f} ms")
+    if mismatches:
+        print(f"⚠️  {len(mismatches)} 个组合的输出与期望不一致")
+    else:
+        print("✅ 所有组合的输出与期望一致")
+
+    if update_expected:
+        save_json_file(expected_path, expected)
+        print(f"💾 期望输出已更新: {expected_path}")
+    if output:
+        save_json_file(output, {"backends": backends, "repeat": repeat, "rows": rows})
+    return 1 if mismatches else 0
+
+
+def add_page(pages_dir, source, name, extractors, url=None):
+    """把本地文件或网址内容加入语料并登记到 index.json"""
+    unknown = [e for e in extractors if e not in EXTRACTORS]
+    if unknown:
+        print(f"❌ 未知的解析函数: {', '.join(unknown)}，可选 {', '.join(EXTRACTORS)}")
+        return 1
+
+    if re.match(r"https?://", source):
+        import requests
+
+        response = requests.get(source, timeout=30, headers={
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        })
+        response.raise_for_status()
+        response.encoding = response.apparent_encoding or "utf-8"
+        text, url = response.text, url or source
+    else:
+        with open(source, "rb") as f:
+            raw = f.read()
+        try:
+            text = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            text = raw.decode("gb18030")
+
+    path = os.path.join(pages_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+    index_path = os.path.join(pages_dir, INDEX_FILE)
+    entries = [e for e in load_json_file(index_path, []) if e["file"] != name]
+    entries.append({"file": name, "url": url, "extractors": extractors})
+    save_json_file(index_path, entries)
+    print(f"✅ 已加入语料 {name}（{len(text)} 字符），执行 run --update-expected 保存期望输出")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列表/详情解析微基准测试")
+    parser.add_argument("--pages-dir", default=PAGES_DIR, help="语料目录")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="执行基准测试")
+    run_parser.add_argument("--repeat", type=int, default=20, help="每个组合的重复次数")
+    run_parser.add_argument("--extractor", help="只运行名称包含该字符串的解析函数")
+    run_parser.add_argument("--update-expected", action="store_true", help="以第一个后端的输出覆盖保存的期望输出")
+    run_parser.add_argument("--output", help="结果 JSON 输出路径")
+
+    add_parser = subparsers.add_parser("add", help="把页面加入语料")
+    add_parser.add_argument("source", help="本地文件路径或网址")
+    add_parser.add_argument("--name", required=True, help="语料中的相对路径，如 jiangsu/xxx_list.html")
+    add_parser.add_argument("--extractor", action="append", required=True, help="适用的解析函数，可重复指定")
+    add_parser.add_argument("--url", help="页面原始地址（按站点选择解析器和正文选择器时使用）")
+
+    args = parser.parse_args()
+    if args.command == "add":
+        return add_page(args.pages_dir, args.source, args.name, args.extractor, args.url)
+    return run_benchmark(args.pages_dir, args.repeat, args.extractor, args.update_expected, args.output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from html_utils import FAST_PARSER, SAFE_PARSER, LXML_AVAILABLE, make_soup  # noqa: E402
+
+# ==========================================
+# HTML 解析器基准测试
+# 功能：在录制的页面上对比 html.parser 与 lxml 的解析耗时，
+#       并校验两种解析器提取出的标题/日期/正文是否一致
+# ==========================================
+
+# 与 bench_extractors 共用的页面语料，index.json 为 [{'file', 'url', 'extractors'}] 列表
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "pages")
+INDEX_FILE = "index.json"
+
+DATE_PATTERN = re.compile(r"(\d{4})[-/年.](\d{1,2})[-/月.](\d{1,2})")
+# 普通爬虫模块使用 TARGET_URL 常量，SiteSpec 规格模块使用 list_url 字段
+TARGET_URL_PATTERN = re.compile(r'^(?:TARGET_URL\s*=\s*|\s+list_url=)[\'"](https?://[^\'"]+)[\'"]', re.M)
+
+# 与各爬虫详情页回退链一致的常见正文容器
+CONTENT_SELECTORS = [
+    "#zoom", "#UCAP-CONTENT", "#con_con", "#downloadContent", ".TRS_Editor",
+    ".article-content", ".content", "#content", ".nscont", ".main-txt",
+]
+
+
+def collect_target_urls():
+    """从爬虫模块源码中收集 TARGET_URL（不导入模块，避免加载可选依赖）"""
+    urls = []
+    for package in ("Ministries", "Jiangsu"):
+        for path in sorted(glob.glob(os.path.join(ROOT_DIR, package, "*_crawler.py"))):
+            with open(path, encoding="utf-8") as f:
+                match = TARGET_URL_PATTERN.search(f.read())
+            if match:
+                name = os.path.splitext(os.path.basename(path))[0]
+                urls.append((name, match.group(1)))
+    return urls
+
+
+def record_pages(urls, pages_dir):
+    """抓取页面并保存到本地，供离线基准测试使用"""
+    import requests
+
+    os.makedirs(pages_dir, exist_ok=True)
+    index_path = os.path.join(pages_dir, INDEX_FILE)
+    entries = load_entries(pages_dir)
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    }
+
+    for name, url in urls:
+        try:
+            response = requests.get(url, headers=headers, timeout=30)
+            response.raise_for_status()
+            filename = f"{name}.html"
+            with open(os.path.join(pages_dir, filename), "wb") as f:
+                f.write(response.content)
+            entries = [e for e in entries if e["file"] != filename]
+            entries.append({"file": filename, "url": url, "extractors": []})
+            print(f"✅ 已录制 {name}: {url} ({len(response.content)} 字节)")
+        except Exception as e:
+            print(f"⚠️  录制失败 {name}: {url} - {e}")
+
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def load_entries(pages_dir):
+    index_path = os.path.join(pages_dir, INDEX_FILE)
+    if os.path.exists(index_path):
+        with open(index_path, encoding="utf-8") as f:
+            entries = json.load(f)
+        # 兼容旧的 {文件名: 地址} 格式
+        if isinstance(entries, dict):
+            return [{"file": name, "url": url, "extractors": []} for name, url in entries.items()]
+        return entries
+    return []
+
+
+def load_index(pages_dir):
+    """返回 {页面相对路径: 地址}"""
+    return {entry["file"]: entry.get("url") for entry in load_entries(pages_dir)}
+
+
+def extract_fields(soup):
+    """提取用于一致性校验的字段：页面标题、列表标题、日期、正文"""
+    page_title = soup.title.get_text(strip=True) if soup.title else ""
+
+    item_titles = []
+    for li in soup.find_all("li"):
+        a_tag = li.find("a")
+        if a_tag:
+            item_titles.append((a_tag.get("title") or a_tag.get_text(strip=True)).strip())
+
+    text = soup.get_text(" ", strip=True)
+    dates = ["-".join(m) for m in DATE_PATTERN.findall(text)]
+
+    content = ""
+    for selector in CONTENT_SELECTORS:
+        elem = soup.select_one(selector)
+        if elem:
+            content = elem.get_text("\n", strip=True)
+            break
+
+    return {
+        "title": page_title,
+        "items": item_titles,
+        "dates": dates,
+        "content": content,
+    }
+
+
+def time_parser(markup, url, parser, repeat):
+    """返回 (最佳单次耗时, 提取结果)"""
+    best = None
+    soup = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        soup = make_soup(markup, url, parser)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, extract_fields(soup)
+
+
+def run_benchmark(pages_dir, repeat, output=None):
+    if not LXML_AVAILABLE:
+        print("❌ 未安装 lxml，无法对比解析器")
+        return 1
+
+    index = load_index(pages_dir)
+    files = sorted(glob.glob(os.path.join(pages_dir, "**", "*.html"), recursive=True))
+    if not files:
+        print(f"⚠️  {pages_dir} 下没有录制页面，请先执行 record 子命令")
+        return 1
+
+    rows = []
+    mismatches = []
+    total_safe = 0.0
+    total_fast = 0.0
+
+    for path in files:
+        filename = os.path.relpath(path, pages_dir).replace(os.sep, "/")
+        url = index.get(filename)
+        with open(path, "rb") as f:
+            markup = f.read()
+
+        safe_time, safe_fields = time_parser(markup, url, SAFE_PARSER, repeat)
+        # 不显式指定解析器，使用 html_utils 的实际选择（包括 CDATA 片段回退）
+        fast_time, fast_fields = time_parser(markup, url, None, repeat)
+        total_safe += safe_time
+        total_fast += fast_time
+
+        diff_fields = [k for k in safe_fields if safe_fields[k] != fast_fields[k]]
+        if diff_fields:
+            mismatches.append((filename, diff_fields))
+
+        rows.append({
+            "page": filename,
+            "bytes": len(markup),
+            "html_parser_ms": round(safe_time * 1000, 3),
+            "fast_ms": round(fast_time * 1000, 3),
+            "speedup": round(safe_time / fast_time, 2) if fast_time else None,
+            "diff_fields": diff_fields,
+        })
+
+    print(f"{'页面':<45}{'大小':>10}{'html.parser':>14}{FAST_PARSER:>10}{'加速比':>8}  一致性")
+    for row in rows:
+        status = "✅" if not row["diff_fields"] else "❌ " + ",".join(row["diff_fields"])
+        print(f"{row['page'][:44]:<45}{row['bytes']:>10}{row['html_parser_ms']:>14.2f}{row['fast_ms']:>10.2f}{row['speedup'] or 0:>8.2f}  {status}")
+
+    speedup = total_safe / total_fast if total_fast else 0
+    print("-" * 40)
+    print(f"📊 页面数: {len(rows)}，总耗时 html.parser {total_safe * 1000:.1f} ms / {FAST_PARSER} {total_fast * 1000:.1f} ms，加速 {speedup:.2f}x")
+    if mismatches:
+        print(f"⚠️  {len(mismatches)} 个页面提取结果不一致，可将对应域名加入 HTML_PARSER_FALLBACK_SITES：")
+        for filename, fields in mismatches:
+            print(f"   {filename} ({index.get(filename, '')}): {', '.join(fields)}")
+    else:
+        print("✅ 所有页面提取的标题/日期/正文一致")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"pages": rows, "speedup": round(speedup, 2)}, f, ensure_ascii=False, indent=2)
+
+    return 1 if mismatches else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 解析器基准测试")
+    parser.add_argument("--pages-dir", default=PAGES_DIR, help="录制页面所在目录")
+    subparsers = parser.add_subparsers(dest="command")
+
+    record_parser = subparsers.add_parser("record", help="录制页面")
+    record_parser.add_argument("urls", nargs="*", help="要录制的地址，默认录制所有爬虫的 TARGET_URL")
+
+    run_parser = subparsers.add_parser("run", help="执行基准测试")
+    run_parser.add_argument("--repeat", type=int, default=5, help="每个页面的重复解析次数")
+    run_parser.add_argument("--output", help="结果 JSON 输出路径")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        if args.urls:
+            urls = [(f"page_{i:03d}", url) for i, url in enumerate(args.urls, 1)]
+        else:
+            urls = collect_target_urls()
+        record_pages(urls, args.pages_dir)
+        return 0
+
+    return run_benchmark(args.pages_dir, getattr(args, "repeat", 5), getattr(args, "output", None))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
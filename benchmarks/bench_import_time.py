@@ -0,0 +1,132 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ==========================================
+# 启动耗时基准测试
+# 功能：用 python -X importtime 测量「导入 crawler_manager 并注册全部爬虫」的耗时，
+#       列出累计耗时最高的顶层包；可指定 git 版本作为基线对比前后差异
+# ==========================================
+
+# 在子进程中执行：注册全部爬虫，注册时的输出丢弃，只输出墙钟耗时
+REGISTRY_SCRIPT = r"""
+import contextlib, glob, importlib, io, os, time
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import crawler_manager
+    if hasattr(crawler_manager, "register_all_crawlers"):
+        crawler_manager.register_all_crawlers(crawler_manager.CrawlerManager())
+    else:
+        # 早期版本的注册逻辑写在 __main__ 中，直接导入全部爬虫模块
+        for path in sorted(glob.glob("Ministries/*_crawler.py") + glob.glob("Jiangsu/*_crawler.py")):
+            try:
+                importlib.import_module(path[:-3].replace(os.sep, "."))
+            except ImportError:
+                pass
+print(time.perf_counter() - start)
+"""
+
+IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure(root):
+    """在子进程中执行一次注册，返回 (墙钟秒数, {模块: (自身微秒, 累计微秒, 层级)})"""
+    env = dict(os.environ, PYTHONPATH=root)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", REGISTRY_SCRIPT],
+        cwd=root, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "子进程执行失败")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return float(proc.stdout.strip().splitlines()[-1]), modules
+
+
+def summarize(root, repeat):
+    """预热一次（生成 .pyc）后重复测量，取墙钟耗时中位数"""
+    measure(root)
+    runs = [measure(root) for _ in range(repeat)]
+    wall_times = [wall for wall, _ in runs]
+    # 顶层包的累计耗时取各次测量的中位数
+    packages = {}
+    for _, modules in runs:
+        for name, (_, cumulative_us, _) in modules.items():
+            if "." not in name:
+                packages.setdefault(name, []).append(cumulative_us)
+    return {
+        "wall_ms": round(statistics.median(wall_times) * 1000, 1),
+        "module_count": len(runs[-1][1]),
+        "packages": {name: statistics.median(values) / 1000 for name, values in packages.items()},
+    }
+
+
+def print_report(label, result, top):
+    print(f"📦 {label}: 注册全部爬虫耗时 {result['wall_ms']:.1f} ms，导入模块 {result['module_count']} 个")
+    ranked = sorted(result["packages"].items(), key=lambda item: item[1], reverse=True)[:top]
+    for name, cumulative_ms in ranked:
+        print(f"   {name:<40}{cumulative_ms:>10.1f} ms")
+
+
+def checkout_baseline(ref):
+    """把基线版本检出到临时工作树"""
+    directory = tempfile.mkdtemp(prefix="bench-import-")
+    subprocess.run(["git", "worktree", "add", "--detach", directory, ref],
+                   cwd=ROOT_DIR, check=True, capture_output=True)
+    return directory
+
+
+def remove_baseline(directory):
+    subprocess.run(["git", "worktree", "remove", "--force", directory], cwd=ROOT_DIR, capture_output=True)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="爬虫注册启动耗时基准测试")
+    parser.add_argument("--root", default=ROOT_DIR, help="要测量的代码目录")
+    parser.add_argument("--baseline", help="作为基线对比的 git 版本（如 HEAD~1）")
+    parser.add_argument("--repeat", type=int, default=5, help="重复测量次数")
+    parser.add_argument("--top", type=int, default=10, help="列出累计耗时最高的顶层包数量")
+    parser.add_argument("--output", help="结果 JSON 输出路径")
+    args = parser.parse_args()
+
+    results = {}
+    if args.baseline:
+        baseline_dir = checkout_baseline(args.baseline)
+        try:
+            results["baseline"] = summarize(baseline_dir, args.repeat)
+        finally:
+            remove_baseline(baseline_dir)
+        print_report(f"基线 {args.baseline}", results["baseline"], args.top)
+        print("-" * 40)
+
+    results["current"] = summarize(args.root, args.repeat)
+    print_report("当前版本", results["current"], args.top)
+
+    if "baseline" in results:
+        before = results["baseline"]["wall_ms"]
+        after = results["current"]["wall_ms"]
+        print("-" * 40)
+        print(f"📊 启动耗时 {before:.1f} ms → {after:.1f} ms，加速 {before / after if after else 0:.2f}x")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
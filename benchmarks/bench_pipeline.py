@@ -0,0 +1,309 @@
+import argparse
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import mock_gov_server  # noqa: E402
+
+# ==========================================
+# 端到端基准测试
+# 功能：在录制的 HTTP 归档上回放全部已注册爬虫（内存存储 + 本地模拟接口），
+#       分别用 serial / threaded / async 三种执行方式运行，
+#       统计墙钟时间、CPU 时间、峰值内存、请求速率、每页解析耗时和写库/推送耗时，结果保存为 JSON
+# 用法：
+#       python benchmarks/bench_pipeline.py record      # 联网录制一次（HTTP_FIXTURES=record）
+#       python benchmarks/bench_pipeline.py run         # 离线回放并对比三种执行方式
+#       python benchmarks/bench_pipeline.py --scale 10 run --mock --latency lognormal:80:0.6 --error-rate 0.05
+#                                                       # 使用本地模拟站点，按 10 倍数据源压测
+# 说明：爬虫按运行当天计算目标日期，录制后隔天回放时目标日数据为 0，写库/推送耗时会偏小
+# ==========================================
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+ENGINES = ("serial", "threaded", "async")
+
+
+class _ApiReceiver(BaseHTTPRequestHandler):
+    """模拟数据推送接口：接收所有 POST 请求并计数"""
+
+    requests_count = 0
+    bytes_count = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with _ApiReceiver.lock:
+            _ApiReceiver.requests_count += 1
+            _ApiReceiver.bytes_count += len(body)
+        payload = json.dumps({"code": 0, "message": "ok"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _child_env(args, engine, mode, state_dir, target=None):
+    """子进程环境：回放/录制归档（或转发到模拟站点）、内存存储、独立的状态目录，关闭通知和可选导出"""
+    env = dict(os.environ)
+    for key in ("FEISHU_BOT_WEBHOOK", "SEARCH_INDEX", "PARQUET_EXPORT", "HTTP_TARGET_OVERRIDE"):
+        env.pop(key, None)
+    if target:
+        env["HTTP_TARGET_OVERRIDE"] = target
+        # 复制出的数据源请求相同的地址，关闭页面缓存才能真正压到模拟站点
+        if args.scale > 1:
+            env["HTTP_CACHE"] = "0"
+    env.update({
+        "HTTP_FIXTURES": "" if target else mode,
+        "HTTP_FIXTURES_PATH": os.path.abspath(args.fixtures),
+        "HTTP_FIXTURES_LATENCY": str(args.latency_scale),
+        "CRAWLER_STORAGE": "memory",
+        "CRAWLER_STATE_DIR": state_dir,
+        "RUN_LOG_DIR": os.path.join(state_dir, "logs"),
+        "CRAWLER_ENGINE": engine,
+        "CRAWLER_WORKERS": str(args.workers),
+        "PYTHONPATH": ROOT_DIR,
+    })
+    return env
+
+
+def run_child(args, engine, mode="replay", target=None):
+    """在独立子进程中运行一次（峰值内存按进程统计）"""
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as state_dir:
+        result_file = os.path.join(state_dir, "result.json")
+        command = [sys.executable, os.path.abspath(__file__), "--scale", str(args.scale)]
+        if args.only:
+            command += ["--only", args.only]
+        command += ["child", "--result-file", result_file, "--push-api" if mode == "replay" else "--no-push-api"]
+        proc = subprocess.run(
+            command, cwd=ROOT_DIR, env=_child_env(args, engine, mode, state_dir, target),
+            stdout=None if args.verbose else subprocess.DEVNULL,
+            stderr=None if args.verbose else subprocess.PIPE, text=True,
+        )
+        if proc.returncode != 0 or not os.path.exists(result_file):
+            raise RuntimeError(f"{engine} 执行失败: {(proc.stderr or '').strip()[-500:]}")
+        with open(result_file, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def child_main(args):
+    """子进程：注册并执行全部爬虫，输出测量结果"""
+    server = None
+    if args.push_api:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _ApiReceiver)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        os.environ["POLICY_API_BASE"] = f"http://127.0.0.1:{server.server_port}"
+        os.environ["POLICY_API_PUSH"] = "1"
+    else:
+        os.environ["POLICY_API_PUSH"] = "0"
+
+    import crawler_manager
+    from db_utils import db_utils
+    from html_utils import get_parse_stats, reset_parse_stats
+    from http_fixtures import http_fixtures
+
+    manager = crawler_manager.CrawlerManager()
+    with contextlib.redirect_stdout(sys.stderr if args.verbose else open(os.devnull, "w")):
+        crawler_manager.register_all_crawlers(manager)
+    if args.only:
+        names = set(args.only.split(","))
+        manager.crawlers = [entry for entry in manager.crawlers if entry[0] in names]
+    if args.scale > 1:
+        # 每个数据源复制 scale 份，模拟数据源数量增长后的负载
+        manager.crawlers = [
+            (name if i == 0 else f"{name}#{i + 1}", *rest)
+            for name, *rest in manager.crawlers for i in range(args.scale)
+        ]
+
+    reset_parse_stats()
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    manager.run_all_crawlers()
+    wall = time.perf_counter() - start
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    http_stats = manager.http_stats
+    parse_stats = get_parse_stats()
+    timings = db_utils.get_timings()
+    results = manager.results
+    result = {
+        "engine": manager.engine,
+        "workers": manager.workers,
+        "crawlers": len(manager.crawlers),
+        "succeeded": sum(1 for r in results.values() if r["status"] == "success"),
+        "failed": sum(1 for r in results.values() if r["status"] == "error"),
+        "records": sum(r.get("crawl_count", 0) for r in results.values()),
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round((usage_after.ru_utime + usage_after.ru_stime)
+                             - (usage_before.ru_utime + usage_before.ru_stime), 3),
+        # Linux 下 ru_maxrss 单位为 KB
+        "peak_rss_mb": round(usage_after.ru_maxrss / 1024, 1),
+        "requests": http_stats.get("requests", 0) + http_stats.get("bypass", 0),
+        "fetches": http_stats.get("fetches", 0),
+        "requests_per_second": round(http_stats.get("fetches", 0) / wall, 2) if wall else None,
+        "fetch_p95_ms": http_stats.get("p95_ms"),
+        "pages_parsed": parse_stats["pages"],
+        "parse_ms_per_page": parse_stats["ms_per_page"],
+        "parse_seconds": round(parse_stats["seconds"], 3),
+        "db_calls": timings["db_calls"],
+        "db_seconds": round(timings["db_seconds"], 3),
+        "api_calls": timings["api_calls"],
+        "api_seconds": round(timings["api_seconds"], 3),
+        "api_received": _ApiReceiver.requests_count,
+        "api_received_bytes": _ApiReceiver.bytes_count,
+        "fixtures": dict(http_fixtures.stats),
+        "per_crawler": {name: r.get("execution_time", 0) for name, r in results.items()},
+    }
+    if server:
+        server.shutdown()
+    with open(args.result_file, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+def _git_commit():
+    proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True)
+    return proc.stdout.strip() or None
+
+
+def print_table(engines):
+    columns = (
+        ("执行方式", "engine", "{}"), ("墙钟(s)", "wall_seconds", "{:.2f}"), ("CPU(s)", "cpu_seconds", "{:.2f}"),
+        ("峰值内存(MB)", "peak_rss_mb", "{:.1f}"), ("请求/s", "requests_per_second", "{:.1f}"),
+        ("解析(ms/页)", "parse_ms_per_page", "{:.2f}"), ("写库(s)", "db_seconds", "{:.3f}"),
+        ("推送(s)", "api_seconds", "{:.3f}"), ("成功/失败", None, None),
+    )
+    print("".join(f"{title:>14}" for title, _, _ in columns))
+    for result in engines.values():
+        cells = []
+        for _, key, fmt in columns:
+            if key is None:
+                cells.append(f"{result['succeeded']}/{result['failed']}")
+            else:
+                value = result.get(key)
+                cells.append("-" if value is None else fmt.format(value))
+        print("".join(f"{cell:>14}" for cell in cells))
+
+
+def compare(previous_path, engines):
+    """与之前保存的结果对比墙钟时间和 CPU 时间"""
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"\n📊 与 {os.path.basename(previous_path)}（{previous.get('commit')}）对比:")
+    for engine, result in engines.items():
+        before = previous.get("engines", {}).get(engine)
+        if not before:
+            continue
+        for key, label in (("wall_seconds", "墙钟"), ("cpu_seconds", "CPU")):
+            if before.get(key):
+                change = (result[key] - before[key]) / before[key] * 100
+                print(f"   {engine:<10}{label} {before[key]:.2f}s → {result[key]:.2f}s（{change:+.1f}%）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="爬虫端到端基准测试")
+    parser.add_argument("--fixtures", default=os.path.join(ROOT_DIR, ".crawler_state", "http_fixtures.db"),
+                        help="HTTP 录制归档路径")
+    parser.add_argument("--only", help="只运行指定爬虫（逗号分隔的注册名称）")
+    parser.add_argument("--workers", type=int, default=4, help="threaded / async 方式的并发数")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="回放时录制耗时的缩放比例")
+    parser.add_argument("--scale", type=int, default=1, help="每个数据源复制的份数，用于压测")
+    parser.add_argument("--verbose", action="store_true", help="显示爬虫输出")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("record", help="联网运行一次并录制 HTTP 归档")
+
+    run_parser = subparsers.add_parser("run", help="回放归档并对比执行方式")
+    run_parser.add_argument("--engines", default=",".join(ENGINES), help="逗号分隔的执行方式")
+    run_parser.add_argument("--output", help="结果 JSON 路径，默认保存到 benchmarks/results/")
+    run_parser.add_argument("--compare", help="与之前保存的结果 JSON 对比")
+    run_parser.add_argument("--mock", action="store_true", help="使用本地模拟站点代替录制归档")
+    mock_gov_server.add_arguments(run_parser)
+
+    child_parser = subparsers.add_parser("child")
+    child_parser.add_argument("--result-file", required=True)
+    child_parser.add_argument("--push-api", dest="push_api", action="store_true")
+    child_parser.add_argument("--no-push-api", dest="push_api", action="store_false")
+
+    args = parser.parse_args()
+
+    if args.command == "child":
+        return child_main(args)
+
+    if args.command == "record":
+        result = run_child(args, "serial", mode="record")
+        print(f"📼 已录制 {result['fixtures']['recorded']} 条请求到 {args.fixtures}，"
+              f"耗时 {result['wall_seconds']:.1f} 秒")
+        return 0
+
+    server = None
+    if args.mock:
+        server = mock_gov_server.start_mock_server(**mock_gov_server.options_from_args(args))
+        print(f"🧪 模拟站点: {server.base_url}，延迟 {args.latency}，数据源 ×{args.scale}")
+    elif not os.path.exists(args.fixtures):
+        print(f"❌ 没有找到录制归档 {args.fixtures}，请先执行 record 子命令")
+        return 1
+
+    engines = {}
+    try:
+        for engine in args.engines.split(","):
+            engine = engine.strip()
+            print(f"⚙️  运行 {engine} ...")
+            if server:
+                server.reset_stats()
+                engines[engine] = run_child(args, engine, target=server.base_url)
+                stats = server.stats()
+                engines[engine]["mock"] = {key: stats[key] for key in ("requests", "statuses", "max_in_flight")}
+                print(f"   模拟站点收到 {stats['requests']} 次请求，状态码 {stats['statuses']}，"
+                      f"单域名最大并发 {stats['max_in_flight']}")
+                continue
+            engines[engine] = run_child(args, engine)
+            missing = engines[engine]["fixtures"]["missing"]
+            if missing:
+                print(f"⚠️  {engine}：{missing} 个请求没有录制，回放时按连接失败处理")
+    finally:
+        if server:
+            server.stop()
+
+    print()
+    print_table(engines)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "config": {
+            "workers": args.workers,
+            "only": args.only,
+            "scale": args.scale,
+            "source": "mock" if args.mock else "fixtures",
+            "latency_scale": None if args.mock else args.latency_scale,
+            "mock": mock_gov_server.options_from_args(args) if args.mock else None,
+        },
+        "engines": engines,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 结果已保存到 {output}")
+
+    if args.compare:
+        compare(args.compare, engines)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
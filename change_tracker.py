@@ -0,0 +1,145 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+
+from state_utils import load_json, save_json
+
+# ==========================================
+# 变更检测模块
+# 功能：为每条数据计算稳定的内容哈希并缓存在本地，
+#       写库前区分新增 / 有变化 / 未变化：未变化的数据跳过更新和推送，
+#       有变化的数据只更新改动过的字段
+# ==========================================
+
+STATE_FILE = "content_hashes.json"
+
+# 参与内容哈希的字段
+HASH_FIELDS = ("title", "url", "content", "pub_at", "category", "source")
+
+# 数据上保存内容哈希的字段名
+HASH_KEY = "content_hash"
+
+# 本地缓存最多保存的标题数，超出后淘汰最早写入的条目
+MAX_ENTRIES = 50000
+
+STATUS_NEW = "new"
+STATUS_CHANGED = "changed"
+STATUS_UNCHANGED = "unchanged"
+
+
+def _field_value(item, field):
+    value = item.get(field)
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    return "" if value is None else str(value)
+
+
+def field_hashes(item):
+    """计算每个字段的短哈希，用于找出改动过的字段
+
+    Returns:
+        dict: {字段名: 哈希}
+    """
+    return {
+        field: hashlib.blake2b(_field_value(item, field).encode("utf-8"), digest_size=8).hexdigest()
+        for field in HASH_FIELDS
+    }
+
+
+def content_hash(item):
+    """计算数据的内容哈希（与字段顺序、日期类型无关）
+
+    Args:
+        item: 数据字典
+
+    Returns:
+        str: 十六进制哈希
+    """
+    payload = json.dumps([_field_value(item, field) for field in HASH_FIELDS], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def attach_hash(item):
+    """在抓取时为数据附加内容哈希
+
+    Returns:
+        dict: 原数据（已附加 content_hash）
+    """
+    item[HASH_KEY] = content_hash(item)
+    return item
+
+
+class ChangeTracker:
+    def __init__(self):
+        """初始化变更检测
+
+        环境变量：
+            CHANGE_TRACKING: 设为 0 时关闭变更检测，所有数据按原逻辑全量写入
+        """
+        self.enabled = os.environ.get("CHANGE_TRACKING", "1") != "0"
+        self.entries = None
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def _load(self):
+        if self.entries is None:
+            self.entries = load_json(STATE_FILE, {}) or {}
+
+    def classify(self, item):
+        """判断数据相对上次写入是否有变化
+
+        Args:
+            item: 数据字典（需包含 title）
+
+        Returns:
+            tuple: (状态, 改动过的字段列表)；新增时字段列表为全部字段
+        """
+        if not self.enabled:
+            return STATUS_NEW, list(HASH_FIELDS)
+
+        item_hash = item.get(HASH_KEY) or content_hash(item)
+        with self._lock:
+            self._load()
+            cached = self.entries.get(item.get("title"))
+        if not cached:
+            return STATUS_NEW, list(HASH_FIELDS)
+        if cached.get("hash") == item_hash:
+            return STATUS_UNCHANGED, []
+
+        old_fields = cached.get("fields", {})
+        changed = [field for field, value in field_hashes(item).items() if old_fields.get(field) != value]
+        return STATUS_CHANGED, changed
+
+    def remember(self, items):
+        """记录已成功写入的数据的哈希"""
+        if not self.enabled or not items:
+            return
+        with self._lock:
+            self._load()
+            for item in items:
+                title = item.get("title")
+                # 重新插入到末尾，淘汰时优先淘汰久未出现的标题
+                self.entries.pop(title, None)
+                self.entries[title] = {
+                    "hash": item.get(HASH_KEY) or content_hash(item),
+                    "fields": field_hashes(item),
+                }
+            while len(self.entries) > MAX_ENTRIES:
+                self.entries.pop(next(iter(self.entries)))
+            self._dirty = True
+
+    def save(self):
+        """把有变化的哈希缓存写回状态目录"""
+        with self._lock:
+            if not self._dirty:
+                return
+            save_json(STATE_FILE, self.entries)
+            self._dirty = False
+
+
+# 创建全局实例
+change_tracker = ChangeTracker()
+# 单独运行爬虫时也在退出前保存缓存
+atexit.register(change_tracker.save)
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+
+import requests
+
+from state_utils import load_json, save_json
+
+# ==========================================
+# 熔断模块
+# 功能：按域名统计连续失败（连接失败、超时、5xx），达到阈值后熔断打开，
+#       打开期间对该域名的请求立即失败，不再等待超时；冷却时间过后半开，
+#       只放行一个探测请求：成功则恢复，失败则再次打开并加倍冷却时间。
+#       熔断状态保存在状态目录，跨运行生效；每次运行开始时打开的熔断转为半开，
+#       已宕机的站点每次运行只花一次探测，恢复后不必等冷却时间结束
+# ==========================================
+
+STATE_FILE = "circuit_breakers.json"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN = 300
+DEFAULT_MAX_COOLDOWN = 6 * 3600
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpen(requests.ConnectionError):
+    """域名熔断打开，请求未发出"""
+
+
+def is_failure(response=None, error=None):
+    """判断一次请求是否计为站点故障：连接失败、超时和 5xx；4xx（含限流、WAF 拦截）说明站点可达"""
+    if error is not None:
+        return isinstance(error, (requests.ConnectionError, requests.Timeout)) and not isinstance(error, CircuitOpen)
+    return response is not None and response.status_code >= 500
+
+
+class CircuitBreaker:
+    def __init__(self):
+        """初始化熔断器
+
+        环境变量：
+            HTTP_BREAKER: 设为 0 时关闭熔断
+            HTTP_BREAKER_FAILURES: 连续失败多少次后打开，默认 5
+            HTTP_BREAKER_COOLDOWN: 打开后多少秒进入半开，默认 300；探测失败后加倍
+            HTTP_BREAKER_MAX_COOLDOWN: 冷却时间上限秒数，默认 6 小时
+        """
+        self.enabled = os.environ.get("HTTP_BREAKER", "1") != "0"
+        self.threshold = max(1, int(os.environ.get("HTTP_BREAKER_FAILURES", DEFAULT_FAILURE_THRESHOLD)))
+        self.cooldown = float(os.environ.get("HTTP_BREAKER_COOLDOWN", DEFAULT_COOLDOWN))
+        self.max_cooldown = float(os.environ.get("HTTP_BREAKER_MAX_COOLDOWN", DEFAULT_MAX_COOLDOWN))
+        self.hosts = None
+        # 正在探测的域名（只在本进程内有效，不保存）
+        self._probing = set()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """重置本次运行的统计"""
+        self.stats = {"short_circuited": 0, "opened": 0, "probes": 0}
+
+    def start_run(self):
+        """新一次运行开始：打开的熔断转为半开，每个域名每次运行至少探测一次"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._load()
+            for entry in self.hosts.values():
+                if entry["state"] == STATE_OPEN:
+                    entry["state"] = STATE_HALF_OPEN
+
+    def _load(self):
+        if self.hosts is None:
+            self.hosts = load_json(STATE_FILE, {}) or {}
+
+    def _entry(self, host):
+        self._load()
+        entry = self.hosts.get(host)
+        if entry is None:
+            entry = self.hosts[host] = {"state": STATE_CLOSED, "failures": 0}
+        return entry
+
+    def before_request(self, host):
+        """请求发出前检查熔断状态
+
+        Returns:
+            bool: 本次请求是否为半开状态下的探测请求
+
+        Raises:
+            CircuitOpen: 熔断打开（或半开且已有探测请求在进行）
+        """
+        if not self.enabled or not host:
+            return False
+        with self._lock:
+            entry = self._entry(host)
+            if entry["state"] == STATE_CLOSED:
+                return False
+            if entry["state"] == STATE_OPEN and time.time() >= entry["open_until"]:
+                entry["state"] = STATE_HALF_OPEN
+            if entry["state"] == STATE_HALF_OPEN and host not in self._probing:
+                self._probing.add(host)
+                self.stats["probes"] += 1
+                return True
+            self.stats["short_circuited"] += 1
+            if entry["state"] == STATE_HALF_OPEN:
+                retry = "正在探测"
+            else:
+                retry = f"{max(0, int(entry.get('open_until', 0) - time.time()))} 秒后重新探测"
+        raise CircuitOpen(f"{host} 熔断中（连续失败 {entry['failures']} 次），{retry}")
+
+    def after_request(self, host, probe, response=None, error=None):
+        """记录请求结果，按需打开或关闭熔断"""
+        if not self.enabled or not host:
+            return
+        failed = is_failure(response, error)
+        with self._lock:
+            if probe:
+                self._probing.discard(host)
+            if error is not None and not failed:
+                # 与站点可用性无关的异常（如地址格式错误）不改变熔断状态
+                return
+            entry = self._entry(host)
+            if not failed:
+                if entry["state"] != STATE_CLOSED or entry["failures"]:
+                    changed = entry["state"] != STATE_CLOSED
+                    self.hosts[host] = {"state": STATE_CLOSED, "failures": 0}
+                    if changed:
+                        print(f"🔌 {host}：探测成功，熔断恢复")
+                        self._save()
+                return
+
+            entry["failures"] += 1
+            entry["last_error"] = str(error)[:200] if error is not None else f"HTTP {response.status_code}"
+            if probe or entry["state"] == STATE_HALF_OPEN:
+                # 探测失败：再次打开，冷却时间加倍
+                cooldown = min(self.max_cooldown, entry.get("cooldown", self.cooldown) * 2)
+            elif entry["state"] == STATE_CLOSED and entry["failures"] >= self.threshold:
+                cooldown = self.cooldown
+            else:
+                return
+            entry.update(state=STATE_OPEN, cooldown=cooldown, open_until=time.time() + cooldown)
+            self.stats["opened"] += 1
+            print(f"🔌 {host}：连续失败 {entry['failures']} 次，熔断 {int(cooldown)} 秒 - {entry['last_error']}")
+            self._save()
+
+    def open_hosts(self):
+        """返回当前熔断打开或半开的域名"""
+        with self._lock:
+            self._load()
+            return sorted(host for host, entry in self.hosts.items() if entry["state"] != STATE_CLOSED)
+
+    def reset(self, host=None):
+        """手动恢复某个域名（默认全部）的熔断"""
+        with self._lock:
+            self._load()
+            if host is None:
+                self.hosts = {}
+            else:
+                self.hosts.pop(host, None)
+            self._save()
+
+    def _save(self):
+        # 只保存有失败记录的域名
+        save_json(STATE_FILE, {host: entry for host, entry in self.hosts.items()
+                               if entry["state"] != STATE_CLOSED or entry["failures"]})
+
+
+# 创建全局实例
+circuit_breaker = CircuitBreaker()
@@ -0,0 +1,302 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from urllib.parse import quote
+
+from state_utils import get_state_path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# ==========================================
+# 列式导出模块
+# 功能：把每次运行新增/变化的数据（增量变更日志）和运行元数据按「日期 / 来源」分区写成
+#       zstd 压缩的 Parquet 文件（每次运行追加一个分片，不改写已有文件），
+#       提供合并分片的压缩命令，分析任务直接读本地列式文件。
+#       changes 数据集只记录变更：某天分区内是当天运行中新增或内容有变化的数据，
+#       未变化的数据不会重复导出，不是当天的全量快照；全量数据以存储后端为准
+# 依赖：pyarrow（可选，pip install pyarrow；未安装时跳过导出）
+# ==========================================
+
+DEFAULT_DIRNAME = "parquet"
+CHANGES_DATASET = "changes"
+RUNS_DATASET = "runs"
+
+COMPRESSION = "zstd"
+PART_PREFIX = "part-"
+COMPACTED_PART = "part-compacted.parquet"
+
+CHANGE_FIELDS = (
+    ("title", "string"),
+    ("url", "string"),
+    ("content", "string"),
+    ("pub_at", "string"),
+    ("category", "string"),
+    ("source", "string"),
+    ("content_hash", "string"),
+    ("selected", "bool_"),
+    ("run_id", "string"),
+    ("crawled_at", "string"),
+)
+
+RUN_FIELDS = (
+    ("run_id", "string"),
+    ("crawler", "string"),
+    ("status", "string"),
+    ("crawl_count", "int64"),
+    ("write_count", "int64"),
+    ("filter_count", "int64"),
+    ("new", "int64"),
+    ("changed", "int64"),
+    ("unchanged", "int64"),
+    ("execution_time", "float64"),
+    ("timestamp", "string"),
+    ("target_url", "string"),
+    ("error_message", "string"),
+    ("api_push_status", "string"),
+)
+
+
+def _schema(fields):
+    return pa.schema([(name, getattr(pa, type_name)()) for name, type_name in fields])
+
+
+def _partition_value(value):
+    """分区目录名按 URI 编码（与 pyarrow hive 分区的默认解码方式一致）"""
+    return quote(str(value or "unknown"), safe="")
+
+
+def _text(value):
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class ColumnarExporter:
+    def __init__(self, root=None):
+        """初始化列式导出
+
+        Args:
+            root: 数据集根目录，默认读取环境变量 PARQUET_DIR，
+                  未设置时使用状态目录下的 parquet 目录
+        """
+        self.root = root or os.environ.get("PARQUET_DIR") or get_state_path(DEFAULT_DIRNAME)
+
+    @property
+    def available(self):
+        """是否安装了 pyarrow"""
+        return pa is not None
+
+    def _write(self, table, directory, filename):
+        """先写临时文件再改名，避免读取方看到写了一半的文件"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, filename)
+        temp_path = path + ".tmp"
+        pq.write_table(table, temp_path, compression=COMPRESSION)
+        os.replace(temp_path, path)
+        return path
+
+    def export_changes(self, records, run_id, run_date):
+        """按来源分区追加写入本次运行新增/变化的数据（变更日志）
+
+        Args:
+            records: 本次运行新增/变化的已处理数据列表
+            run_id: 运行标识
+            run_date: 运行日期 YYYY-MM-DD
+
+        Returns:
+            list: 写入的文件路径
+        """
+        crawled_at = datetime.now().isoformat(timespec="seconds")
+        by_source = {}
+        for record in records:
+            by_source.setdefault(record.get("source"), []).append(record)
+
+        paths = []
+        schema = _schema(CHANGE_FIELDS)
+        for source, items in by_source.items():
+            columns = {name: [] for name, _ in CHANGE_FIELDS}
+            for item in items:
+                for name, type_name in CHANGE_FIELDS:
+                    if name == "run_id":
+                        value = run_id
+                    elif name == "crawled_at":
+                        value = crawled_at
+                    elif type_name == "bool_":
+                        value = bool(item.get(name))
+                    else:
+                        value = _text(item.get(name))
+                    columns[name].append(value)
+            table = pa.table(columns, schema=schema)
+            directory = os.path.join(
+                self.root, CHANGES_DATASET, f"date={run_date}", f"source={_partition_value(source)}"
+            )
+            paths.append(self._write(table, directory, f"{PART_PREFIX}{run_id}.parquet"))
+        return paths
+
+    def export_runs(self, results, run_id, run_date):
+        """追加写入本次运行各爬虫的执行结果
+
+        Args:
+            results: CrawlerManager.results
+            run_id: 运行标识
+            run_date: 运行日期 YYYY-MM-DD
+
+        Returns:
+            str: 写入的文件路径，没有结果时返回 None
+        """
+        if not results:
+            return None
+
+        columns = {name: [] for name, _ in RUN_FIELDS}
+        for crawler, result in results.items():
+            changes = result.get("change_counts") or {}
+            api_push_result = result.get("api_push_result") or {}
+            row = {
+                "run_id": run_id,
+                "crawler": crawler,
+                "status": result.get("status"),
+                "crawl_count": int(result.get("crawl_count") or 0),
+                "write_count": int(result.get("write_count") or 0),
+                "filter_count": int(result.get("filter_count") or 0),
+                "new": int(changes.get("new") or 0),
+                "changed": int(changes.get("changed") or 0),
+                "unchanged": int(changes.get("unchanged") or 0),
+                "execution_time": float(result.get("execution_time") or 0.0),
+                "timestamp": result.get("timestamp"),
+                "target_url": result.get("target_url"),
+                "error_message": result.get("error_message"),
+                "api_push_status": api_push_result.get("status"),
+            }
+            for name, _ in RUN_FIELDS:
+                columns[name].append(row[name])
+
+        table = pa.table(columns, schema=_schema(RUN_FIELDS))
+        directory = os.path.join(self.root, RUNS_DATASET, f"date={run_date}")
+        return self._write(table, directory, f"{PART_PREFIX}{run_id}.parquet")
+
+    def export_run(self, records, results, started_at=None):
+        """导出一次运行的变更日志和元数据
+
+        Args:
+            records: 本次运行新增/变化的数据（未变化的数据不导出）
+            results: CrawlerManager.results
+            started_at: 运行开始时间，决定日期分区，默认当前时间
+
+        Returns:
+            dict: {'records': 数据条数, 'files': 写入文件数}，未安装 pyarrow 时返回 None
+        """
+        if not self.available:
+            print("⚠️  未安装 pyarrow，跳过列式导出")
+            return None
+
+        started_at = started_at or datetime.now()
+        run_id = started_at.strftime("%Y%m%dT%H%M%S")
+        run_date = started_at.strftime("%Y-%m-%d")
+        paths = self.export_changes(records or [], run_id, run_date)
+        runs_path = self.export_runs(results, run_id, run_date)
+        if runs_path:
+            paths.append(runs_path)
+        return {"records": len(records or []), "files": len(paths)}
+
+    def _partitions(self, date=None):
+        """遍历包含分片文件的分区目录"""
+        for dataset in (CHANGES_DATASET, RUNS_DATASET):
+            dataset_root = os.path.join(self.root, dataset)
+            if date:
+                dataset_root = os.path.join(dataset_root, f"date={date}")
+            if not os.path.isdir(dataset_root):
+                continue
+            for directory, _, filenames in os.walk(dataset_root):
+                parts = sorted(f for f in filenames if f.startswith(PART_PREFIX) and f.endswith(".parquet"))
+                if parts:
+                    yield directory, parts
+
+    def compact(self, date=None):
+        """把每个分区内的分片合并为一个文件
+
+        同一标题在分区内出现多次时保留最后一次变更。
+
+        Args:
+            date: 只压缩指定日期 YYYY-MM-DD 的分区，默认全部
+
+        Returns:
+            dict: {'partitions': 合并的分区数, 'files': 合并前的文件数}
+        """
+        if not self.available:
+            print("⚠️  未安装 pyarrow，无法压缩")
+            return None
+
+        partitions = 0
+        files = 0
+        for directory, parts in self._partitions(date):
+            if len(parts) < 2:
+                continue
+            # 已合并的文件排在最前，后续运行的分片按运行标识顺序追加
+            parts.sort(key=lambda name: (name != COMPACTED_PART, name))
+            table = pa.concat_tables([pq.read_table(os.path.join(directory, name)) for name in parts])
+            if "title" in table.column_names:
+                titles = table.column("title").to_pylist()
+                last_index = {title: i for i, title in enumerate(titles)}
+                table = table.take(sorted(last_index.values()))
+            self._write(table, directory, COMPACTED_PART)
+            for name in parts:
+                if name != COMPACTED_PART:
+                    os.remove(os.path.join(directory, name))
+            partitions += 1
+            files += len(parts)
+        return {"partitions": partitions, "files": files}
+
+
+# 创建全局实例
+columnar_exporter = ColumnarExporter()
+
+
+# 便捷函数
+def export_run(records, results, started_at=None):
+    """便捷函数：导出一次运行的变更日志和元数据"""
+    return columnar_exporter.export_run(records, results, started_at)
+
+
+def compact(date=None):
+    """便捷函数：合并分区内的分片"""
+    return columnar_exporter.compact(date)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="爬虫数据列式导出")
+    parser.add_argument("--dir", help="数据集根目录")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compact_parser = subparsers.add_parser("compact", help="合并分区内的分片")
+    compact_parser.add_argument("--date", help="只压缩指定日期 YYYY-MM-DD")
+    subparsers.add_parser("stats", help="显示各数据集的分区和文件数")
+
+    args = parser.parse_args()
+    exporter = ColumnarExporter(args.dir) if args.dir else columnar_exporter
+
+    if args.command == "compact":
+        start = time.perf_counter()
+        result = exporter.compact(args.date)
+        if result is None:
+            return 1
+        print(f"✅ 已合并 {result['partitions']} 个分区（原 {result['files']} 个文件），"
+              f"耗时 {time.perf_counter() - start:.2f} 秒")
+    else:
+        partitions = list(exporter._partitions())
+        file_count = sum(len(parts) for _, parts in partitions)
+        print(f"📊 数据集目录: {exporter.root}")
+        print(f"📊 分区数: {len(partitions)}，文件数: {file_count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+import soupsieve
+
+from run_context import get_current_crawler
+from state_utils import load_json, save_json
+
+# ==========================================
+# 正文提取模块
+# 功能：提取详情页正文，站点自带选择器按顺序优先；都不可信时按文本密度
+#       为通用候选容器打分，选出正文所在容器，
+#       并按爬虫记住回退时命中的选择器，后续页面直接使用；同时给出提取置信度
+# ==========================================
+
+# 各爬虫详情页回退链中出现过的常见正文容器
+CANDIDATE_SELECTORS = (
+    "#zoom", "#UCAP-CONTENT", "#con_con", "#downloadContent", ".TRS_Editor",
+    ".article-content", ".pages_content", ".main-txt", ".nscont", ".bt-content",
+    "#barrierfree_container", ".content", "#content", "div.article", "article",
+)
+
+# 没有任何选择器命中时参与密度扫描的块级标签
+BLOCK_TAGS = ("article", "section", "div", "td")
+
+# 置信度低于该值视为正文可能未抓取成功
+MIN_CONFIDENCE = 0.5
+
+# 正文长度达到该值时长度分满分（与 MIN_CONFIDENCE 配合，对应原先 50 字的阈值）
+FULL_LENGTH = 100
+
+# 密度扫描时，得分不低于最高分该比例的容器中取文本最短（最贴近正文）的一个
+TIGHTEST_RATIO = 0.8
+
+STATE_FILE = "content_selectors.json"
+
+
+@dataclass
+class ExtractionResult:
+    """正文提取结果
+
+    Attributes:
+        content: 正文文本
+        selector: 命中的选择器，未命中时为空字符串
+        confidence: 提取置信度，取值 0~1
+    """
+    content: str = ""
+    selector: str = ""
+    confidence: float = 0.0
+
+    @property
+    def ok(self):
+        return self.confidence >= MIN_CONFIDENCE
+
+
+@lru_cache(maxsize=256)
+def _compile(selector):
+    return soupsieve.compile(selector)
+
+
+def _clean_text(elem, separator):
+    if separator == "\n":
+        text = elem.get_text(separator="\n", strip=True)
+        return "\n".join(line.strip() for line in text.split("\n") if line.strip())
+    return elem.get_text(separator, strip=True)
+
+
+def _link_density(elem, text_length):
+    if not text_length:
+        return 1.0
+    link_length = sum(len(a.get_text(strip=True)) for a in elem.find_all("a"))
+    return min(1.0, link_length / text_length)
+
+
+def _confidence(text_length, link_density):
+    return round(min(1.0, text_length / FULL_LENGTH) * (1.0 - link_density), 2)
+
+
+def text_confidence(text):
+    """仅根据文本长度估计置信度，用于 Reader 等非 HTML 来源的正文
+
+    Args:
+        text: 正文文本
+
+    Returns:
+        float: 置信度，取值 0~1
+    """
+    return _confidence(len(text or ""), 0.0)
+
+
+def _selector_for(elem):
+    """为密度扫描选中的容器生成可复用的选择器"""
+    elem_id = elem.get("id")
+    if elem_id:
+        return f'{elem.name}[id="{elem_id}"]'
+    classes = [c for c in elem.get("class") or [] if c.replace("-", "").replace("_", "").isalnum()]
+    if classes:
+        return f"{elem.name}." + ".".join(classes)
+    return ""
+
+
+class ContentExtractor:
+    def __init__(self):
+        """初始化正文提取器，加载各爬虫已学习的回退选择器"""
+        self.learned = load_json(STATE_FILE, {}) or {}
+        self._lock = threading.Lock()
+
+    def _score(self, elem, separator):
+        content = _clean_text(elem, separator)
+        length = len(content.replace("\n", ""))
+        density = _link_density(elem, length)
+        return content, length * (1.0 - density), _confidence(length, density)
+
+    def _try_selector(self, soup, selector, separator):
+        try:
+            elem = _compile(selector).select_one(soup)
+        except Exception:
+            return None
+        if elem is None:
+            return None
+        content, score, confidence = self._score(elem, separator)
+        if not content:
+            return None
+        return score, ExtractionResult(content, selector, confidence), elem
+
+    def _scan_blocks(self, soup, separator):
+        """所有选择器都未命中时，对块级标签按文本密度打分"""
+        scored = []
+        for elem in soup.find_all(BLOCK_TAGS):
+            content, score, confidence = self._score(elem, separator)
+            if score > 0:
+                scored.append((score, len(content), elem, content, confidence))
+        if not scored:
+            return None
+
+        best_score = max(item[0] for item in scored)
+        # 外层容器包含全部正文，得分总是最高，取得分接近最高分的容器中最短的一个；
+        # 文本相同的嵌套容器取最内层（文档顺序中靠后的）
+        close = [item for item in scored if item[0] >= best_score * TIGHTEST_RATIO]
+        score, _, elem, content, confidence = min(reversed(close), key=lambda item: item[1])
+        return score, ExtractionResult(content, _selector_for(elem), confidence)
+
+    def _learn(self, key, selector):
+        with self._lock:
+            if self.learned.get(key) == selector:
+                return
+            self.learned[key] = selector
+            save_json(STATE_FILE, self.learned)
+
+    def _fallback(self, soup, key, separator):
+        """站点选择器都不可信时的通用回退：已学习的选择器 → 通用候选按文本密度打分 → 块级密度扫描"""
+        learned = self.learned.get(key) if key else None
+        if learned:
+            hit = self._try_selector(soup, learned, separator)
+            if hit and hit[1].ok:
+                return hit[1]
+
+        hits = [hit for hit in (self._try_selector(soup, selector, separator) for selector in CANDIDATE_SELECTORS) if hit]
+        best = max(hits, key=lambda hit: hit[0], default=None)
+        if best is not None:
+            # 外层容器（如包含标题、发布信息和分享栏的 .content）得分总是最高，
+            # 其中得分接近的内层候选更贴近正文
+            inner = [hit for hit in hits if hit[0] >= best[0] * TIGHTEST_RATIO
+                     and (hit is best or best[2] in hit[2].parents)]
+            best = min(inner, key=lambda hit: len(hit[1].content))
+        if best is None or not best[1].ok:
+            scanned = self._scan_blocks(soup, separator)
+            if scanned and (best is None or scanned[1].confidence > best[1].confidence):
+                best = scanned
+        if best is None:
+            return None
+
+        result = best[1]
+        if key and result.ok and result.selector:
+            self._learn(key, result.selector)
+        return result
+
+    def extract(self, soup, selectors=(), separator="\n", key=None):
+        """提取详情页正文
+
+        Args:
+            soup: 详情页 BeautifulSoup 对象
+            selectors: 站点自带的选择器，按顺序第一个命中的优先（与原先 select_one 回退链一致）
+            separator: get_text 分隔符，'\\n' 时会逐行清理空白行
+            key: 记忆通用回退选择器的键，默认为当前爬虫名称
+
+        Returns:
+            ExtractionResult: 提取结果
+        """
+        first = None
+        for selector in selectors:
+            hit = self._try_selector(soup, selector, separator)
+            if hit:
+                first = hit[1]
+                break
+        if first is not None and first.ok:
+            return first
+
+        # 站点选择器未命中或正文过短时才使用通用回退，回退结果也不可信时保留站点选择器的结果
+        fallback = self._fallback(soup, key or get_current_crawler(), separator)
+        if fallback is not None and (first is None or fallback.confidence > first.confidence):
+            return fallback
+        return first or ExtractionResult()
+
+
+# 创建全局实例
+content_extractor = ContentExtractor()
+
+
+# 便捷函数
+def extract_content(soup, selectors=(), separator="\n", key=None):
+    """便捷函数：提取详情页正文
+
+    Args:
+        soup: 详情页 BeautifulSoup 对象
+        selectors: 站点自带的选择器，按顺序第一个命中的优先
+        separator: get_text 分隔符
+        key: 记忆通用回退选择器的键，默认为当前爬虫名称
+
+    Returns:
+        ExtractionResult: 提取结果
+    """
+    return content_extractor.extract(soup, selectors, separator, key)
+
+
+def warn_low_confidence(title, url, content, confidence):
+    """置信度过低时输出警告
+
+    Returns:
+        bool: 是否输出了警告
+    """
+    if confidence >= MIN_CONFIDENCE:
+        return False
+    print(f"⚠️  警告：文章内容可能未爬取成功 - {title[:50]}")
+    print(f"   链接: {url}")
+    print(f"   内容长度: {len(content)} 字符，置信度: {confidence:.2f}")
+    return True
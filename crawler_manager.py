@@ -1,44 +1,81 @@
+import argparse
+import asyncio
+import os
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from io import StringIO
+
+from change_tracker import change_tracker
+from circuit_breaker import circuit_breaker
+from crawler_profiler import CrawlerProfiler
+from dedup_index import dedup_index
+from http_fixtures import http_fixtures
+from http_utils import get_cache_stats, http_utils, percentile, reset_cache
+from run_checkpoint import run_checkpoint
+from run_context import crawler_context
+from run_history import describe_anomaly, run_history
+from run_log import run_log
+from storage import get_storage
+from tracing import tracer
+from write_queue import write_queue
 
 # 导入飞书通知模块
 try:
-    from feishu_notifier import send_crawler_result
+    from feishu_notifier import flush_notifications, send_crawler_result
 except ImportError:
     send_crawler_result = None
 
 
-class DualOutput:
-    """双输出流，同时输出到控制台和缓冲区"""
-    
-    def __init__(self, original_stdout):
-        self.original_stdout = original_stdout
-        self.buffer = StringIO()
-    
-    def write(self, text):
-        self.original_stdout.write(text)
-        self.buffer.write(text)
-    
-    def flush(self):
-        self.original_stdout.flush()
-        self.buffer.flush()
-    
-    def getvalue(self):
-        return self.buffer.getvalue()
-
-
 # ==========================================
 # 爬虫管理系统
 # 功能：执行多个爬虫，一个爬虫出错不影响其他爬虫
 # ==========================================
 
+ENGINE_SERIAL = "serial"
+ENGINE_THREADED = "threaded"
+ENGINE_ASYNC = "async"
+ENGINES = (ENGINE_SERIAL, ENGINE_THREADED, ENGINE_ASYNC)
+DEFAULT_WORKERS = 4
+
 class CrawlerManager:
-    def __init__(self):
-        """初始化爬虫管理器"""
+    def __init__(self, write_behind=None, engine=None, workers=None, profile=None, profile_memory=None, trace=None,
+                 resume=False):
+        """初始化爬虫管理器
+
+        Args:
+            write_behind: 是否启用后台写入队列，默认读取环境变量 WRITE_BEHIND（默认启用）
+            engine: 执行方式 serial / threaded / async，默认读取环境变量 CRAWLER_ENGINE（默认 serial）
+            workers: threaded / async 方式的并发数，默认读取环境变量 CRAWLER_WORKERS
+            profile: 需要性能剖析的爬虫，all 表示全部，默认读取环境变量 CRAWLER_PROFILE
+            profile_memory: 性能剖析时是否统计内存，默认读取环境变量 CRAWLER_PROFILE_MEMORY
+            trace: 是否记录追踪 span 并导出，默认读取环境变量 TRACE
+            resume: 是否从上次未完成的运行继续（跳过已完成的爬虫，回放已抓取的页面，补推未推送的数据）
+        """
+        if write_behind is None:
+            write_behind = os.environ.get("WRITE_BEHIND", "1") != "0"
+        self.write_behind = write_behind
+        self.engine = (engine or os.environ.get("CRAWLER_ENGINE") or ENGINE_SERIAL).strip().lower()
+        if self.engine not in ENGINES:
+            raise ValueError(f"不支持的执行方式: {self.engine}，可选 {', '.join(ENGINES)}")
+        self.workers = max(1, int(workers or os.environ.get("CRAWLER_WORKERS", DEFAULT_WORKERS)))
+        self.profiler = CrawlerProfiler(profile, profile_memory)
+        if trace is not None:
+            tracer.enabled = trace
         self.crawlers = []
         self.results = {}
+        self.http_stats = {}
+        # 常驻轮询（poll_daemon）设置：运行之间保留的页面缓存 (判断函数, 最长秒数)，
+        # 以及是否在每次运行结束时推送每日状态和无条件发送飞书通知
+        self.keep_cached = None
+        self.daily_report = True
+        self.resume = resume
+        # 是否记录运行断点，常驻轮询每轮只执行部分爬虫，不记录
+        self.checkpoint = True
+        # 最近一次运行新增/变化的数据
+        self.run_records = []
+        # 各爬虫的列表探测地址（模块的 LIST_PROBE_URL），常驻轮询据此判断列表是否变化
+        self.list_probes = {}
     
     def register_crawler(self, name, crawler_func, crawler_module):
         """注册爬虫
@@ -46,139 +83,93 @@ class CrawlerManager:
         Args:
             name: 爬虫名称
             crawler_func: 爬虫执行函数
-            crawler_module: 爬虫模块对象，用于获取 TARGET_URL
+            crawler_module: 爬虫模块对象，用于获取 TARGET_URL 和 LIST_PROBE_URL
         """
         target_url = getattr(crawler_module, 'TARGET_URL', '')
+        # 同名或同一执行函数重复注册时跳过，避免一次运行内重复抓取
+        for registered_name, registered_func, _ in self.crawlers:
+            if registered_name == name or registered_func is crawler_func:
+                print(f"⚠️  爬虫已注册，跳过重复注册: {name}")
+                return
         self.crawlers.append((name, crawler_func, target_url))
+        self.list_probes[name] = getattr(crawler_module, 'LIST_PROBE_URL', None)
         if target_url:
             print(f"✅ 已注册爬虫: {name} ({target_url})")
         else:
             print(f"✅ 已注册爬虫: {name}")
     
-    def run_all_crawlers(self):
+    def run_all_crawlers(self, names=None):
         """执行所有爬虫
         
+        Args:
+            names: 只执行这些爬虫，默认全部（常驻轮询每轮只执行列表有变化的爬虫）
+
         Returns:
             dict: 各爬虫执行结果
         """
-        # 开始捕获输出
+        crawlers = self.crawlers if names is None else [entry for entry in self.crawlers if entry[0] in names]
+        # 输出逐行写入轮转日志文件，内存中只保留尾部
         original_stdout = sys.stdout
         original_stderr = sys.stderr
-        dual_out = DualOutput(original_stdout)
-        dual_err = DualOutput(original_stderr)
-        sys.stdout = dual_out
-        sys.stderr = dual_err
+        run_log.start()
+        sys.stdout = run_log.stream(original_stdout, "stdout")
+        sys.stderr = run_log.stream(original_stderr, "stderr")
         
+        # 页面缓存只在本次运行内有效（常驻轮询时保留详情页）
+        reset_cache(*(self.keep_cached or ()))
+        # 上次运行留下的熔断本次运行先探测一次
+        circuit_breaker.start_run()
+        tracer.start()
+        resumed = {}
+        if self.checkpoint:
+            resumed = run_checkpoint.begin([name for name, _, _ in crawlers], self.resume)
+
+        # 启动后台写入队列，爬虫的 save_to_policy 只入队，由写入线程批量写库和推送
+        if self.write_behind:
+            write_queue.start()
+        if self.checkpoint:
+            self._push_checkpoint_pending()
+
         start_datetime = datetime.now()
         print(f"\n🚀 开始执行爬虫任务 - {start_datetime.strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 60)
         
         total_start_time = time.time()
         
-        for name, crawler_func, target_url in self.crawlers:
-            if target_url:
-                print(f"\n📦 开始执行爬虫: {name}")
-                print(f"🔗 目标网址: {target_url}")
-
-            else:
-                print(f"\n📦 开始执行爬虫: {name}")
-            print("-" * 40)
-            
-            start_time = time.time()
-            
-            try:
-                # 创建临时输出缓冲区，用于捕获当前爬虫的输出
-                from io import StringIO
-                temp_stdout = StringIO()
-                temp_stderr = StringIO()
-                original_stdout = sys.stdout
-                original_stderr = sys.stderr
-                sys.stdout = temp_stdout
-                sys.stderr = temp_stderr
-                
-                # 执行爬虫
-                result = crawler_func()
-                
-                # 捕获当前爬虫的输出
-                crawler_output = temp_stdout.getvalue() + temp_stderr.getvalue()
-                
-                # 恢复标准输出
-                sys.stdout = original_stdout
-                sys.stderr = original_stderr
-                
-                # 将捕获的输出写回原始输出流，保持原有输出显示
-                print(crawler_output, end='')
-                
-                # 记录结果
-                execution_time = time.time() - start_time
-                
-                # 区分抓取数量和写入数量
-                # 处理可能的元组返回值（包含API推送结果）
-                crawl_count = 0
-                write_count = 0
-                filter_count = 0
-                api_push_result = None
-                
-                if isinstance(result, tuple) and len(result) == 2:
-                    data_list, api_push_result = result
-                    crawl_count = len(data_list)
-                    write_count = len(data_list)
-                else:
-                    data_list = result
-                    crawl_count = len(data_list)
-                    write_count = len(data_list)
-                
-                # 尝试从当前爬虫的输出中提取过滤数量
-                import re
-                # 匹配多种过滤信息格式
-                filter_match = re.search(r'(?:过滤掉|过滤非昨日数据|过滤掉非目标日期数据)\s*[:：]?\s*(\d+)\s*条', crawler_output)
-                if filter_match:
-                    filter_count = int(filter_match.group(1))
-                
-                self.results[name] = {
-                    'status': 'success',
-                    'crawl_count': crawl_count,
-                    'write_count': write_count,
-                    'filter_count': filter_count,
-                    'execution_time': round(execution_time, 2),
-                    'timestamp': datetime.now().isoformat(),
-                    'target_url': target_url,
-                    'api_push_result': api_push_result
-                }
-                
-                print(f"✅ 爬虫 {name} 执行成功")
-                print(f"📊 抓取数据: {crawl_count} 条")
-                print(f"💾 写入数据库: {crawl_count} 条")
-                print(f"⏱️  执行时间: {round(execution_time, 2)} 秒")
-                
-            except Exception as e:
-                # 捕获异常，确保其他爬虫继续执行
-                execution_time = time.time() - start_time
-                self.results[name] = {
-                    'status': 'error',
-                    'crawl_count': 0,
-                    'write_count': 0,
-                    'error_message': str(e),
-                    'execution_time': round(execution_time, 2),
-                    'timestamp': datetime.now().isoformat(),
-                    'target_url': target_url
-                }
-                
-                print(f"❌ 爬虫 {name} 执行失败")
-                print(f"💥 错误信息: {str(e)}")
-                print(f"📊 抓取数据: 0 条")
-                print(f"💾 写入数据库: 0 条")
-                print(f"⏱️  执行时间: {round(execution_time, 2)} 秒")
-            
-            print("-" * 40)
+        if self.engine != ENGINE_SERIAL:
+            print(f"⚙️  执行方式: {self.engine}，并发数 {self.workers}")
+        if resumed:
+            print(f"⏭️  跳过上次已完成的爬虫: {', '.join(resumed)}")
+        self._run_engine([entry for entry in crawlers if entry[0] not in resumed])
+        if resumed:
+            previous = {name: dict(result, resumed=True) for name, result in resumed.items()}
+            self.results = {name: self.results.get(name) or previous[name]
+                            for name, _, _ in crawlers if name in self.results or name in previous}
         
+        # 等待写入队列中的数据全部写入，按爬虫回填实际写入数量和 API 推送结果
+        if write_queue.active:
+            self._flush_write_queue()
+        dedup_index.save()
+        change_tracker.save()
+
+        run_records = self.run_records = self._take_run_records()
+        if os.environ.get("SEARCH_INDEX") == "1":
+            self._update_search_index(run_records)
+        if os.environ.get("PARQUET_EXPORT") == "1":
+            self._export_columnar(run_records, start_datetime)
+
+        trace_files = tracer.finish()
+        run_checkpoint.finish()
+
         total_execution_time = time.time() - total_start_time
         end_datetime = datetime.now()
         
         print("=" * 60)
         print(f"📋 爬虫执行完成 - {end_datetime.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"⏱️  总执行时间: {round(total_execution_time, 2)} 秒")
-        print(f"📦 执行爬虫数: {len(self.crawlers)}")
+        print(f"📦 执行爬虫数: {len(crawlers)}")
+        for path in trace_files:
+            print(f"🧵 追踪文件: {path}")
         
         # 统计结果
         success_count = sum(1 for r in self.results.values() if r['status'] == 'success')
@@ -192,43 +183,47 @@ class CrawlerManager:
         print(f"❌ 失败: {error_count} 个")
         print(f"📊 总抓取数据: {total_crawl} 条")
         print(f"💾 总写入数据库: {total_write} 条")
+
+        # 页面缓存统计
+        self.http_stats = get_cache_stats()
+        print(f"🗄️  页面缓存: 请求 {self.http_stats['requests']} 次，命中 {self.http_stats['hits']} 次，"
+              f"合并并发请求 {self.http_stats['coalesced']} 次，命中率 {self.http_stats['hit_rate'] * 100:.1f}%")
+        if self.http_stats['p95_ms'] is not None:
+            print(f"🌐 网络请求: {self.http_stats['fetches']} 次，p50 {self.http_stats['p50_ms']:.0f} ms，"
+                  f"p95 {self.http_stats['p95_ms']:.0f} ms")
+        open_hosts = circuit_breaker.open_hosts()
+        if open_hosts or self.http_stats['short_circuited']:
+            print(f"🔌 熔断: {len(open_hosts)} 个域名熔断中（{', '.join(open_hosts) or '无'}），"
+                  f"快速失败 {self.http_stats['short_circuited']} 次，探测 {self.http_stats['probes']} 次")
+        if http_fixtures.mode:
+            fixture_stats = http_fixtures.stats
+            print(f"📼 HTTP {http_fixtures.mode}: 录制 {fixture_stats['recorded']} 条，"
+                  f"回放 {fixture_stats['replayed']} 条，缺少录制 {fixture_stats['missing']} 条（{http_fixtures.path}）")
+
+        if self.profiler.enabled:
+            self.profiler.report()
+
+        # 与历史基线比较执行耗时，再用本次结果更新基线
+        performance = self._performance_summary()
+        try:
+            # 恢复时跳过的爬虫沿用上次的结果，已计入过基线，不再重复计入
+            run_history.update({name: result for name, result in self.results.items() if not result.get("resumed")})
+        except Exception as e:
+            print(f"⚠️  更新运行历史失败：{e}")
         
-        # 获取完整日志
-        full_log = dual_out.getvalue() + dual_err.getvalue()
-        
-        # 从日志中解析API推送结果
-        import re
+        # API推送结果来自写入队列汇总和同步推送记录的 api_push 事件
         api_results = {}
-        api_success_count = 0
-        api_error_count = 0
-        
-        # 匹配"✅ {crawler_name}：成功推送 X 条数据到API"格式
-        api_pattern = re.compile(r'✅\s*([^：\n]+)：成功推送\s*(\d+)\s*条数据到API')
-        for match in api_pattern.finditer(full_log):
-            crawler_name = match.group(1).strip()
-            count = match.group(2)
-            message = f"成功推送 {count} 条数据到API"
-            api_results[crawler_name] = {"status": "success", "message": message}
-            api_success_count += 1
-        
-        # 匹配"❌ {crawler_name}：API推送失败 - ..."格式
-        api_error_pattern = re.compile(r'❌\s*([^：\n]+)：API推送失败\s*-\s*(.*?)(?=\n|$)')
-        for match in api_error_pattern.finditer(full_log):
-            crawler_name = match.group(1).strip()
-            error_msg = match.group(2).strip()
-            message = f"API推送失败 - {error_msg}"
-            api_results[crawler_name] = {"status": "error", "message": message}
-            api_error_count += 1
+        for event in run_log.find_events("api_push"):
+            if event["status"] in ("success", "error"):
+                api_results[event["crawler"]] = {"status": event["status"], "message": event["message"]}
+        api_success_count = sum(1 for r in api_results.values() if r["status"] == "success")
+        api_error_count = len(api_results) - api_success_count
         
-        # 将解析到的API推送结果保存到self.results中
+        # 将API推送结果保存到self.results中
         for crawler_name, result in self.results.items():
             if crawler_name in api_results:
                 result['api_push_result'] = api_results[crawler_name]
         
-        # 恢复标准输出
-        sys.stdout = original_stdout
-        sys.stderr = original_stderr
-        
         # 输出API推送结果
         print("\n📡 API推送结果:")
         print("-" * 40)
@@ -244,31 +239,269 @@ class CrawlerManager:
             print("⚠️  没有API推送记录")
         print("-" * 40)
         
-        # 推送每日状态数据到API
-        try:
-            from db_utils import push_daily_status
-            date_str = start_datetime.date().isoformat()
-            daily_success_count = total_crawl  # 使用总抓取数量作为成功数
-            daily_fail_count = error_count  # 使用失败的爬虫数作为失败数
-            print("\n📅 推送每日状态数据...")
-            daily_status_result = push_daily_status(date_str, daily_success_count, daily_fail_count)
-            if isinstance(daily_status_result, dict):
-                status = daily_status_result.get('status', 'unknown')
-                message = daily_status_result.get('message', '')
-                if status == 'success':
-                    print(f"✅ 每日状态数据推送成功：{message}")
-                else:
-                    print(f"❌ 每日状态数据推送失败：{message}")
-        except Exception as e:
-            print(f"⚠️  推送每日状态数据时发生错误：{e}")
+        # 推送每日状态数据到API（常驻轮询时每轮只执行部分爬虫，不推送）
+        if self.daily_report:
+            try:
+                from db_utils import push_daily_status
+                date_str = start_datetime.date().isoformat()
+                daily_success_count = total_crawl  # 使用总抓取数量作为成功数
+                daily_fail_count = error_count  # 使用失败的爬虫数作为失败数
+                print("\n📅 推送每日状态数据...")
+                daily_status_result = push_daily_status(date_str, daily_success_count, daily_fail_count)
+                if isinstance(daily_status_result, dict):
+                    status = daily_status_result.get('status', 'unknown')
+                    message = daily_status_result.get('message', '')
+                    if status == 'success':
+                        print(f"✅ 每日状态数据推送成功：{message}")
+                    else:
+                        print(f"❌ 每日状态数据推送失败：{message}")
+            except Exception as e:
+                print(f"⚠️  推送每日状态数据时发生错误：{e}")
         
-        # 发送飞书通知
-        if send_crawler_result:
+        # 发送飞书通知（常驻轮询时只在有数据写入或爬虫失败时发送）
+        if send_crawler_result and (self.daily_report or total_write or error_count):
             print("\n📤 正在发送飞书通知...")
-            send_crawler_result(self.results, start_datetime, end_datetime, full_log)
+            send_crawler_result(self.results, start_datetime, end_datetime, run_log.tail(), performance)
+            # 消息由后台线程发送，最多等待 FEISHU_FLUSH_TIMEOUT 秒
+            flush_notifications(float(os.environ.get("FEISHU_FLUSH_TIMEOUT", 15)))
+        
+        # 恢复标准输出并关闭日志文件
+        sys.stdout = original_stdout
+        sys.stderr = original_stderr
+        run_log.close()
+        print(f"📝 运行日志: {run_log.directory}")
         
         return self.results
     
+    def _run_engine(self, crawlers):
+        """按执行方式运行爬虫：serial 依次执行，threaded 使用线程池，async 由事件循环调度到线程"""
+        if self.engine == ENGINE_THREADED:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crawler") as executor:
+                list(executor.map(lambda entry: self._run_crawler(*entry), crawlers))
+        elif self.engine == ENGINE_ASYNC:
+            asyncio.run(self._run_async(crawlers))
+        else:
+            for name, crawler_func, target_url in crawlers:
+                self._run_crawler(name, crawler_func, target_url)
+
+        # 并发执行时结果按完成顺序写入，整理为注册顺序
+        self.results = {name: self.results[name] for name, _, _ in crawlers if name in self.results}
+
+    async def _run_async(self, crawlers):
+        # 爬虫本身是同步代码，事件循环负责限流和调度，实际执行在线程中
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def run_one(name, crawler_func, target_url):
+            async with semaphore:
+                await asyncio.to_thread(self._run_crawler, name, crawler_func, target_url)
+
+        await asyncio.gather(*(run_one(*entry) for entry in crawlers))
+
+    def _run_crawler(self, name, crawler_func, target_url):
+        """执行单个爬虫并记录结果，一个爬虫出错不影响其他爬虫"""
+        if target_url:
+            print(f"\n📦 开始执行爬虫: {name}")
+            print(f"🔗 目标网址: {target_url}")
+
+        else:
+            print(f"\n📦 开始执行爬虫: {name}")
+        print("-" * 40)
+
+        start_time = time.time()
+
+        try:
+            # 执行爬虫（输出按运行上下文写入该爬虫的日志文件）
+            with crawler_context(name), tracer.span(name, "crawler", target_url=target_url), \
+                    self.profiler.profile(name):
+                result = crawler_func()
+
+            # 记录结果
+            execution_time = time.time() - start_time
+
+            # 区分抓取数量和写入数量
+            # 处理可能的元组返回值（包含API推送结果）
+            crawl_count = 0
+            write_count = 0
+            filter_count = 0
+            api_push_result = None
+
+            if isinstance(result, tuple) and len(result) == 2:
+                data_list, api_push_result = result
+                crawl_count = len(data_list)
+                write_count = len(data_list)
+            else:
+                data_list = result
+                crawl_count = len(data_list)
+                write_count = len(data_list)
+
+            # 过滤数量来自该爬虫输出中识别出的 filter 事件
+            filter_events = run_log.find_events("filter", name)
+            if filter_events:
+                filter_count = filter_events[0]["count"]
+
+            self.results[name] = {
+                'status': 'success',
+                'crawl_count': crawl_count,
+                'write_count': write_count,
+                'filter_count': filter_count,
+                'execution_time': round(execution_time, 2),
+                'timestamp': datetime.now().isoformat(),
+                'target_url': target_url,
+                'api_push_result': api_push_result,
+                'metrics': self._crawler_metrics(name, data_list, crawl_count, filter_events),
+            }
+
+            run_checkpoint.crawler_finished(name, self.results[name],
+                                            write_queue.tickets_for(name) if write_queue.active else ())
+
+            print(f"✅ 爬虫 {name} 执行成功")
+            print(f"📊 抓取数据: {crawl_count} 条")
+            print(f"💾 写入数据库: {crawl_count} 条")
+            print(f"⏱️  执行时间: {round(execution_time, 2)} 秒")
+
+        except Exception as e:
+            # 捕获异常，确保其他爬虫继续执行
+            execution_time = time.time() - start_time
+            self.results[name] = {
+                'status': 'error',
+                'crawl_count': 0,
+                'write_count': 0,
+                'error_message': str(e),
+                'execution_time': round(execution_time, 2),
+                'timestamp': datetime.now().isoformat(),
+                'target_url': target_url
+            }
+
+            print(f"❌ 爬虫 {name} 执行失败")
+            print(f"💥 错误信息: {str(e)}")
+            print(f"📊 抓取数据: 0 条")
+            print(f"💾 写入数据库: 0 条")
+            print(f"⏱️  执行时间: {round(execution_time, 2)} 秒")
+
+        profile = self.profiler.results.get(name)
+        if profile:
+            self.results[name]['profile'] = profile
+        print("-" * 40)
+
+    def _push_checkpoint_pending(self):
+        """断点恢复时先补推上次运行已写入但未推送成功的数据"""
+        pending = run_checkpoint.pending_pushes()
+        if not pending:
+            return
+        try:
+            from db_utils import db_utils
+        except ImportError:
+            return
+        # 断点中只记录了轻量字段，正文从存储读取
+        try:
+            storage = get_storage()
+            for _, items in pending:
+                contents = storage.get_contents([item["title"] for item in items])
+                for item in items:
+                    item["content"] = contents.get(item["title"], "")
+        except Exception as e:
+            print(f"⚠️  读取待补推数据的正文失败，留到下次补推：{e}")
+            return
+        count = sum(len(items) for _, items in pending)
+        result = db_utils.send_to_api(pending)
+        icon = "✅" if result["status"] == "success" else "❌"
+        print(f"{icon} 补推上次运行未推送的 {count} 条数据：{result['message']}")
+
+    def _flush_write_queue(self):
+        """停止写入队列并按爬虫汇总写入结果"""
+        print("\n💾 等待后台写入队列完成...")
+        flush_start = time.time()
+        tickets = write_queue.stop(timeout=float(os.environ.get("WRITE_FLUSH_TIMEOUT", 300)))
+        summary = write_queue.summarize(tickets)
+        storage_name = get_storage().name
+
+        for crawler_name, entry in summary.items():
+            print(f"✅ {crawler_name}：成功写入 {entry['new'] + entry['changed']} 条数据到 {storage_name}"
+                  f"（新增 {entry['new']}，变化 {entry['changed']}，未变化 {entry['unchanged']}）")
+            if entry['error_count']:
+                print(f"⚠️  {crawler_name}：{entry['error_count']} 条数据写入失败")
+            api_result = entry['api_push_result']
+            if api_result:
+                icon = "✅" if api_result['status'] == 'success' else "❌"
+                print(f"{icon} {crawler_name}：{api_result['message']}")
+                run_log.emit("api_push", crawler_name, **api_result)
+
+            result = self.results.get(crawler_name)
+            if result and result['status'] == 'success':
+                result['write_count'] = entry['write_count']
+                result['api_push_result'] = api_result
+                result['change_counts'] = {status: entry[status] for status in ('new', 'changed', 'unchanged')}
+
+        print(f"⏱️  写入队列耗时: {round(time.time() - flush_start, 2)} 秒")
+
+    def _crawler_metrics(self, name, data_list, crawl_count, filter_events):
+        """计算用于异常检测的爬虫指标
+
+        Returns:
+            dict: 列表条数（目标日条数 + 过滤条数，爬虫未输出过滤数量时为 None）、目标日条数、
+                  请求耗时 p95（毫秒）、正文长度中位数
+        """
+        latency = percentile(http_utils.get_latencies(name), 95)
+        lengths = sorted(len(item.get('content') or '') for item in data_list if isinstance(item, dict))
+        return {
+            'list_size': (crawl_count + filter_events[0]['count']) if filter_events else None,
+            'yield': crawl_count,
+            'fetch_latency_ms': round(latency * 1000, 1) if latency is not None else None,
+            'content_length': lengths[len(lengths) // 2] if lengths else None,
+        }
+
+    def _performance_summary(self):
+        """汇总本次运行的性能数据：网络请求 p95 耗时、相对历史基线变慢的爬虫和指标异常"""
+        try:
+            regressions = run_history.regressions(self.results)
+            anomalies = run_history.anomalies(self.results)
+        except Exception as e:
+            print(f"⚠️  读取运行历史失败：{e}")
+            regressions, anomalies = [], []
+        for name, current, baseline in regressions:
+            print(f"📈 {name}：执行耗时 {current} 秒，明显慢于历史基线 {baseline} 秒")
+        if anomalies:
+            print(f"🚨 检测到 {len(anomalies)} 项指标异常:")
+            for anomaly in anomalies:
+                print(f"   {describe_anomaly(anomaly)}")
+        return {
+            "fetches": self.http_stats.get("fetches", 0),
+            "fetch_p95_ms": self.http_stats.get("p95_ms"),
+            "regressions": regressions,
+            "anomalies": [describe_anomaly(anomaly) for anomaly in anomalies],
+            "profile": self.profiler.hot_lines(),
+        }
+
+    def _take_run_records(self):
+        """取出本次运行新增/变化的数据，db_utils 不可用时返回空列表"""
+        try:
+            from db_utils import db_utils
+        except ImportError:
+            return []
+        return db_utils.take_run_records()
+
+    def _update_search_index(self, records):
+        """把本次运行新增/变化的数据增量写入本地全文索引"""
+        try:
+            from search_index import index_records
+            index_start = time.time()
+            count = index_records(records)
+            print(f"🔍 全文索引增量写入 {count} 条，耗时 {round(time.time() - index_start, 2)} 秒")
+        except Exception as e:
+            print(f"⚠️  更新全文索引失败：{e}")
+
+    def _export_columnar(self, records, started_at):
+        """把本次运行新增/变化的数据（变更日志，不是当天全量）和执行结果追加写入按日期、来源分区的 Parquet 数据集"""
+        try:
+            from columnar_export import export_run
+            export_start = time.time()
+            result = export_run(records, self.results, started_at)
+            if result:
+                print(f"🧱 列式导出 {result['records']} 条变更数据，写入 {result['files']} 个文件，"
+                      f"耗时 {round(time.time() - export_start, 2)} 秒")
+        except Exception as e:
+            print(f"⚠️  列式导出失败：{e}")
+
     def get_summary(self):
         """获取执行摘要"""
         if not self.results:
@@ -283,16 +516,18 @@ class CrawlerManager:
         
         return "\n".join(summary)
 
+
 # ==========================================
-# 主执行逻辑
+# 爬虫注册
 # ==========================================
-if __name__ == "__main__":
-    # 创建爬虫管理器
-    manager = CrawlerManager()
-    
-    # 注册爬虫
-    # 注意：这里需要根据实际爬虫模块进行导入和注册
-    
+def register_all_crawlers(manager):
+    """注册全部爬虫
+
+    只导入爬虫模块本身，crawl4ai、Selenium 等较重的可选依赖由爬虫在首次使用时导入。
+
+    Args:
+        manager: CrawlerManager 实例
+    """
     # 导入中国政府网爬虫
     try:
         from Ministries import gov_crawler
@@ -708,13 +943,6 @@ if __name__ == "__main__":
     except ImportError as e:
         print(f"⚠️  导入江苏省国资委政策文件爬虫失败: {e}")
 
-    # 导入江苏省市场监管局政策文件爬虫
-    try:
-        from Jiangsu import jiangsu_scjgj_zcwj_crawler
-        manager.register_crawler("江苏省市场监管局_政策文件", jiangsu_scjgj_zcwj_crawler.run, jiangsu_scjgj_zcwj_crawler)
-    except ImportError as e:
-        print(f"⚠️  导入江苏省市场监管局政策文件爬虫失败: {e}")
-
     # 导入江苏省市场监管局通知公告爬虫
     try:
         from Jiangsu import jiangsu_scjgj_tzgg_crawler
@@ -750,13 +978,6 @@ if __name__ == "__main__":
     except ImportError as e:
         print(f"⚠️  导入江苏省国防动员办公室政策文件爬虫失败: {e}")
 
-    # 导入江苏省应急管理厅通知公告爬虫
-    try:
-        from Jiangsu import jiangsu_yjglt_tzgg_crawler
-        manager.register_crawler("江苏省应急管理厅_通知公告", jiangsu_yjglt_tzgg_crawler.run, jiangsu_yjglt_tzgg_crawler)
-    except ImportError as e:
-        print(f"⚠️  导入江苏省应急管理厅通知公告爬虫失败: {e}")
-
     # 导入江苏省水利厅规范性文件爬虫
     try:
         from Jiangsu import jiangsu_jswater_zcwj_crawler
@@ -938,9 +1159,45 @@ if __name__ == "__main__":
         manager.register_crawler("国家能源局_最新文件", nea_zxwj_crawler.run, nea_zxwj_crawler)
     except ImportError as e:
         print(f"⚠️  导入国家能源局最新文件爬虫失败: {e}")
-        
+
+
+# ==========================================
+# 主执行逻辑
+# ==========================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="政策爬虫管理")
+    parser.add_argument("--engine", choices=ENGINES, help="执行方式，默认读取环境变量 CRAWLER_ENGINE")
+    parser.add_argument("--workers", type=int, help="threaded / async 方式的并发数")
+    parser.add_argument("--profile", nargs="?", const="all", metavar="NAMES",
+                        help="对爬虫做 cProfile 性能剖析：不带参数时剖析全部，或逗号分隔的爬虫名称")
+    parser.add_argument("--profile-memory", action="store_true", help="性能剖析时同时统计内存分配和 RSS")
+    parser.add_argument("--trace", action="store_true",
+                        help="记录抓取 → 解析 → 写库 → 推送的追踪 span，导出 Chrome trace / OTLP 文件")
+    parser.add_argument("--daemon", action="store_true",
+                        help="常驻运行，每个数据源按各自间隔轮询，列表页有变化时才执行爬虫")
+    parser.add_argument("--resume", action="store_true",
+                        help="从上次中断的运行继续：跳过已完成的爬虫，回放已抓取的页面，补推未推送的数据")
+    parser.add_argument("--poll-interval", type=int, help="常驻轮询的默认间隔秒数，默认读取环境变量 POLL_INTERVAL")
+    args = parser.parse_args()
+
+    # 创建爬虫管理器
+    manager = CrawlerManager(
+        engine=args.engine,
+        workers=args.workers,
+        profile=args.profile,
+        profile_memory=args.profile_memory or None,
+        trace=args.trace or None,
+        resume=args.resume,
+    )
+    
+    # 注册爬虫
+    register_all_crawlers(manager)
+
     # 执行所有爬虫
-    if manager.crawlers:
+    if manager.crawlers and args.daemon:
+        from poll_daemon import run_daemon
+        run_daemon(manager, args.poll_interval)
+    elif manager.crawlers:
         results = manager.run_all_crawlers()
         
         # 打印执行摘要
@@ -0,0 +1,295 @@
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+from state_utils import get_state_path
+
+# ==========================================
+# 爬虫性能剖析模块
+# 功能：按需对指定爬虫（或全部爬虫）的执行函数做 cProfile 剖析，
+#       可选 tracemalloc 内存分配统计和进程 RSS 采样；
+#       每个爬虫输出 pstats 文件和火焰图工具可读的折叠栈（collapsed stacks），
+#       并汇总最耗时的函数供运行报告使用
+# 用法：
+#       python crawler_manager.py --profile                      # 剖析全部爬虫
+#       python crawler_manager.py --profile 教育部文件,国务院文件 --profile-memory
+#       flamegraph.pl .crawler_state/profiles/<时间>/教育部文件.collapsed > 教育部文件.svg
+# ==========================================
+
+DEFAULT_DIRNAME = "profiles"
+DEFAULT_TOP = 10
+# 折叠栈的最大深度，超出部分截断
+MAX_STACK_DEPTH = 64
+# 内存分配统计保留的代码行数
+MEMORY_TOP = 10
+# RSS 采样间隔（秒）
+RSS_INTERVAL = 0.05
+
+PROFILE_ALL = "all"
+
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\s#]+')
+
+
+def _page_size():
+    try:
+        return os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return 4096
+
+
+def current_rss():
+    """返回当前进程的常驻内存字节数，不支持的平台返回 None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _page_size()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _func_label(func):
+    """把 pstats 的函数键 (文件, 行号, 函数名) 转换为折叠栈中的帧名"""
+    filename, lineno, name = func
+    if filename == "~":
+        # 内置函数，如 <built-in method time.sleep>
+        return name.replace(";", ",")
+    return f"{name} ({os.path.basename(filename)}:{lineno})".replace(";", ",")
+
+
+def collapsed_stacks(stats):
+    """由 pstats 的调用关系重建折叠栈
+
+    cProfile 只记录「调用者 → 被调用者」的边，不记录完整调用栈；
+    这里从没有调用者的根函数出发，按每条边的累计耗时占比向下分配自身耗时，
+    是火焰图工具常用的近似做法（递归调用在同一路径上只展开一次）。
+
+    Args:
+        stats: pstats.Stats 对象
+
+    Returns:
+        list: ["帧1;帧2;帧3 微秒数", ...]
+    """
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            # edge: (原始调用次数, 调用次数, 自身耗时, 累计耗时)
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    folded = {}
+
+    def walk(func, path, share):
+        tottime = entries[func][2]
+        path = path + [_func_label(func)]
+        self_time = tottime * share
+        if self_time > 0:
+            key = ";".join(path)
+            folded[key] = folded.get(key, 0) + self_time
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_cumtime in callees.get(func, ()):
+            if callee not in entries or _func_label(callee) in path:
+                continue
+            callee_cumtime = entries[callee][3]
+            if callee_cumtime > 0 and edge_cumtime > 0:
+                walk(callee, path, share * edge_cumtime / callee_cumtime)
+
+    roots = [func for func, value in entries.items() if not value[4]]
+    for root in roots:
+        walk(root, [], 1.0)
+
+    return [f"{stack} {int(seconds * 1_000_000)}" for stack, seconds in folded.items() if seconds * 1_000_000 >= 1]
+
+
+def hot_functions(stats, top=DEFAULT_TOP):
+    """按自身耗时排序的最耗时函数
+
+    Returns:
+        list: [{'function', 'calls', 'tottime', 'cumtime'}]
+    """
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+    return [
+        {
+            "function": _func_label(func),
+            "calls": nc,
+            "tottime": round(tottime, 4),
+            "cumtime": round(cumtime, 4),
+        }
+        for func, (_, nc, tottime, cumtime, _) in rows
+    ]
+
+
+class _RssSampler:
+    """后台线程定时采样进程 RSS，记录峰值"""
+
+    def __init__(self, interval=RSS_INTERVAL):
+        self.interval = interval
+        self.start_bytes = None
+        self.peak_bytes = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.start_bytes = self.peak_bytes = current_rss()
+        if self.start_bytes is None:
+            return
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            rss = current_rss()
+            if rss is not None and rss > self.peak_bytes:
+                self.peak_bytes = rss
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        rss = current_rss()
+        if rss is not None and self.peak_bytes is not None:
+            self.peak_bytes = max(self.peak_bytes, rss)
+
+
+class CrawlerProfiler:
+    def __init__(self, targets=None, memory=None, output_dir=None, top=None):
+        """初始化性能剖析
+
+        Args:
+            targets: 要剖析的爬虫，all 表示全部，或爬虫名称列表/逗号分隔字符串；
+                默认读取环境变量 CRAWLER_PROFILE，未设置时不剖析
+            memory: 是否同时统计内存分配（tracemalloc）和 RSS，默认读取环境变量 CRAWLER_PROFILE_MEMORY
+            output_dir: 输出目录，默认读取环境变量 CRAWLER_PROFILE_DIR，
+                未设置时使用状态目录下的 profiles/<开始时间>
+            top: 报告中列出的函数数量
+        """
+        if targets is None:
+            targets = os.environ.get("CRAWLER_PROFILE", "")
+        if isinstance(targets, str):
+            targets = [name.strip() for name in targets.split(",") if name.strip()]
+        self.all = PROFILE_ALL in targets
+        self.targets = set(targets) - {PROFILE_ALL}
+        if memory is None:
+            memory = os.environ.get("CRAWLER_PROFILE_MEMORY") == "1"
+        self.memory = memory
+        self.output_dir = output_dir or os.environ.get("CRAWLER_PROFILE_DIR") or os.path.join(
+            get_state_path(DEFAULT_DIRNAME), datetime.now().strftime("%Y%m%d-%H%M%S")
+        )
+        self.top = top or DEFAULT_TOP
+        self.results = {}
+        # 同一时间只剖析一个爬虫：Python 3.12 起同一时间只能有一个活动的 cProfile，
+        # tracemalloc 也是进程级的，并发执行时按爬虫分开统计需要串行
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.all or bool(self.targets)
+
+    def selected(self, name):
+        """判断爬虫是否需要剖析（复制出的压测数据源 名称#N 按原名称匹配）"""
+        return self.all or name in self.targets or name.split("#", 1)[0] in self.targets
+
+    @contextlib.contextmanager
+    def profile(self, name):
+        """剖析一次爬虫执行，结束后写入 pstats 和折叠栈文件"""
+        if not self.selected(name):
+            yield
+            return
+
+        with self._lock:
+            profiler = cProfile.Profile()
+            sampler = _RssSampler() if self.memory else None
+            tracing = False
+            if self.memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    tracing = True
+                tracemalloc.reset_peak()
+                sampler.start()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                elapsed = time.perf_counter() - start
+                memory = None
+                if self.memory:
+                    sampler.stop()
+                    memory = self._memory_summary(sampler)
+                    if tracing:
+                        tracemalloc.stop()
+                try:
+                    self.results[name] = self._save(name, profiler, elapsed, memory)
+                except Exception as e:
+                    print(f"⚠️  保存性能剖析结果失败 {name}：{e}")
+
+    def _memory_summary(self, sampler):
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        top = [
+            {"line": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+             "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:MEMORY_TOP]
+        ]
+        to_mb = lambda value: round(value / 1024 / 1024, 1) if value is not None else None  # noqa: E731
+        return {
+            "traced_peak_mb": to_mb(peak),
+            "rss_start_mb": to_mb(sampler.start_bytes),
+            "rss_peak_mb": to_mb(sampler.peak_bytes),
+            "top_allocations": top,
+        }
+
+    def _save(self, name, profiler, elapsed, memory):
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, _UNSAFE_FILENAME.sub("_", name))
+        profiler.dump_stats(base + ".pstats")
+        stats = pstats.Stats(profiler)
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            f.write("\n".join(collapsed_stacks(stats)) + "\n")
+        return {
+            "seconds": round(elapsed, 3),
+            "pstats": base + ".pstats",
+            "collapsed": base + ".collapsed",
+            "hot": hot_functions(stats, self.top),
+            "memory": memory,
+        }
+
+    def report(self):
+        """打印各爬虫最耗时的函数并写入 report.json
+
+        Returns:
+            dict: {爬虫名称: 剖析结果}
+        """
+        if not self.results:
+            return {}
+        print(f"\n🔬 性能剖析（{len(self.results)} 个爬虫，输出目录 {self.output_dir}）:")
+        for name, result in self.results.items():
+            print(f"   {name}：{result['seconds']:.2f} 秒")
+            print(f"      {'自身(s)':>9}{'累计(s)':>9}{'调用次数':>10}  函数")
+            for row in result["hot"]:
+                print(f"      {row['tottime']:>9.3f}{row['cumtime']:>9.3f}{row['calls']:>10}  {row['function']}")
+            memory = result.get("memory")
+            if memory:
+                print(f"      内存：分配峰值 {memory['traced_peak_mb']} MB，"
+                      f"RSS {memory['rss_start_mb']} → {memory['rss_peak_mb']} MB")
+        with open(os.path.join(self.output_dir, "report.json"), "w", encoding="utf-8") as f:
+            json.dump(self.results, f, ensure_ascii=False, indent=2)
+        return self.results
+
+    def hot_lines(self, limit=3):
+        """运行报告（飞书通知）用的简短说明：每个爬虫耗时最多的几个函数"""
+        lines = []
+        for name, result in self.results.items():
+            functions = "、".join(f"{row['function']} {row['tottime']:.2f}s" for row in result["hot"][:limit])
+            lines.append(f"{name}（{result['seconds']:.1f} 秒）：{functions}")
+        return lines
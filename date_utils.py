@@ -0,0 +1,123 @@
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+
+# ==========================================
+# 日期解析工具模块
+# 功能：统一从列表文本、链接和接口字段中提取发布日期，
+#       使用预编译的组合正则、结果缓存和整数构造日期，避免各爬虫重复实现
+# ==========================================
+
+# 组合日期正则：支持 2024-01-05 / 2024/1/5 / 2024.01.05 / 2024年1月5日 / 2024 - 01 - 05
+DATE_PATTERN = re.compile(r'(\d{4})\s*[-/.年]\s*(\d{1,2})\s*[-/.月]\s*(\d{1,2})')
+
+# 东八区相对 UTC 的毫秒偏移，用于把毫秒时间戳换算为北京时间日期
+UTC8_OFFSET_MS = 8 * 3600 * 1000
+MS_PER_DAY = 86400 * 1000
+EPOCH_DATE = date(1970, 1, 1)
+
+# 缓存容量：列表页中的日期字符串重复度很高，有界缓存即可覆盖一次运行
+CACHE_SIZE = 8192
+
+
+def make_date(year, month, day):
+    """用整数构造日期，非法日期返回 None
+
+    Args:
+        year: 年
+        month: 月
+        day: 日
+
+    Returns:
+        date: 日期对象，非法时返回 None
+    """
+    try:
+        return date(int(year), int(month), int(day))
+    except (TypeError, ValueError):
+        return None
+
+
+def _fast_path(text):
+    """常见精确格式的快速路径，不经过正则
+
+    支持以 YYYY-MM-DD 开头的字符串（如接口返回的 2024-01-05 12:00:00）
+    以及以 8 位数字 YYYYMMDD 开头、且其后不再是数字的字符串。
+    """
+    if len(text) >= 10 and text[4] == '-' and text[7] == '-':
+        y, m, d = text[0:4], text[5:7], text[8:10]
+        if y.isdigit() and m.isdigit() and d.isdigit():
+            return make_date(y, m, d)
+
+    if len(text) >= 8 and text[:8].isdigit() and (len(text) == 8 or not text[8].isdigit()):
+        return make_date(text[0:4], text[4:6], text[6:8])
+
+    return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _extract_date_cached(text):
+    result = _fast_path(text)
+    if result:
+        return result
+
+    # 第一个匹配可能是非法日期（如版本号），继续尝试后续匹配
+    for match in DATE_PATTERN.finditer(text):
+        result = make_date(match.group(1), match.group(2), match.group(3))
+        if result:
+            return result
+    return None
+
+
+def extract_date(text):
+    """从任意文本中提取第一个合法日期
+
+    Args:
+        text: 包含日期的文本、链接或接口字段值
+
+    Returns:
+        date: 日期对象，未找到时返回 None
+    """
+    if not text:
+        return None
+    if isinstance(text, date):
+        return text
+    if not isinstance(text, str):
+        text = str(text)
+    return _extract_date_cached(text.strip())
+
+
+def parse_epoch_millis(value):
+    """解析毫秒时间戳（如工信部接口的 deploytime / cdate 字段）为北京时间日期
+
+    Args:
+        value: 毫秒时间戳，int/float/str 均可
+
+    Returns:
+        date: 北京时间日期，无法解析时返回 None
+    """
+    if value is None or value == '':
+        return None
+    try:
+        millis = int(value)
+    except (TypeError, ValueError):
+        try:
+            millis = int(float(value))
+        except (TypeError, ValueError):
+            return None
+
+    # 整数运算换算天数，避免 datetime.fromtimestamp 的时区对象开销
+    days = (millis + UTC8_OFFSET_MS) // MS_PER_DAY
+    try:
+        return EPOCH_DATE + timedelta(days=days)
+    except OverflowError:
+        return None
+
+
+def clear_cache():
+    """清空日期解析缓存"""
+    _extract_date_cached.cache_clear()
+
+
+def cache_info():
+    """返回日期解析缓存统计"""
+    return _extract_date_cached.cache_info()
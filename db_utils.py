@@ -1,243 +1,399 @@
-import os
-import json
-import requests
-from supabase import create_client, Client
-from datetime import date, datetime, timezone, timedelta
-import hashlib
-
-# ==========================================
-# 数据库工具模块
-# 功能：提供统一的数据库操作功能，避免重复代码
-# ==========================================
-
-class DBUtils:
-    def __init__(self):
-        """初始化数据库工具"""
-        self.supabase_url = os.environ.get("SUPABASE_PROJECT_API")
-        self.supabase_key = os.environ.get("SUPABASE_ANON_PUBLIC")
-        self.client = None
-    
-    def get_client(self) -> Client:
-        """获取 Supabase 客户端
-        
-        Returns:
-            Client: Supabase 客户端实例
-        """
-        if not self.client:
-            if not self.supabase_url or not self.supabase_key:
-                raise ValueError("缺少 Supabase 环境变量: SUPABASE_PROJECT_API 或 SUPABASE_ANON_PUBLIC")
-            self.client = create_client(self.supabase_url, self.supabase_key)
-        return self.client
-    
-    def process_data(self, data_list):
-        """处理数据，准备写入数据库
-        
-        Args:
-            data_list: 原始数据列表
-            
-        Returns:
-            list: 处理后的数据列表
-        """
-        processed_data = []
-        
-        for item in data_list:
-            processed_item = item.copy()
-            
-            # 转换日期对象为字符串
-            if hasattr(processed_item.get('pub_at'), 'isoformat'):
-                processed_item['pub_at'] = processed_item['pub_at'].isoformat()
-            
-            # 确保必要字段存在
-            if 'selected' not in processed_item:
-                processed_item['selected'] = False
-            
-            processed_data.append(processed_item)
-        
-        return processed_data
-    
-    def save_to_policy(self, data_list, source_name):
-        """保存数据到 policy 表
-        
-        Args:
-            data_list: 数据列表
-            source_name: 数据源名称
-            
-        Returns:
-            tuple: (成功写入的数据列表, API推送结果)
-        """
-        if not data_list:
-            print(f"⚠️  {source_name}：没有数据需要写入，跳过。")
-            return [], None
-        
-        try:
-            # 处理数据
-            processed_data = self.process_data(data_list)
-            
-            # 获取客户端
-            supabase = self.get_client()
-            
-            # 尝试写入数据（不使用 on_conflict，避免约束错误）
-            # 先获取现有数据，然后进行去重
-            success_count = 0
-            
-            for item in processed_data:
-                try:
-                    # 检查是否已存在
-                    existing = supabase.table("policy").select("id").eq("title", item.get("title")).execute()
-                    
-                    if existing.data:
-                        # 已存在，更新数据
-                        response = supabase.table("policy").update(item).eq("title", item.get("title")).execute()
-                    else:
-                        # 不存在，插入数据
-                        response = supabase.table("policy").insert(item).execute()
-                    
-                    success_count += 1
-                    
-                except Exception as item_e:
-                    print(f"⚠️  {source_name}：单条数据处理失败 - {item_e}")
-                    continue
-            
-            print(f"✅ {source_name}：成功写入 {success_count} 条数据到 Supabase")
-            
-            # 推送数据到API接口
-            api_push_result = None
-            if success_count > 0:
-                api_push_result = self.push_to_api(data_list[:success_count], source_name)
-            
-            # 保存API推送结果到返回值中
-            return data_list[:success_count], api_push_result
-            
-        except Exception as e:
-            print(f"❌ {source_name}：数据库写入失败 - {e}")
-            return [], None
-
-    def push_to_api(self, data_list, source_name):
-        """将数据推送到目标API接口
-        
-        Args:
-            data_list: 数据列表
-            source_name: 数据源名称
-            
-        Returns:
-            dict: 推送结果，包含status和message
-        """
-        if not data_list:
-            print(f"⚠️  {source_name}：没有数据需要推送，跳过。")
-            return {"status": "skipped", "message": "没有数据需要推送"}
-        
-        target_url = "http://47.114.109.178:5000/api/receive-data"
-        
-        try:
-            # 构造JSON结构（按照接口示例格式）
-            items = []
-            for item in data_list:
-                # 处理pub_at字段，确保是字符串格式
-                pub_at = item.get('pub_at', '')
-                if hasattr(pub_at, 'isoformat'):
-                    pub_at = pub_at.isoformat()
-                
-                # 获取当前东八区时间作为crawled_at
-                crawled_at = datetime.now(timezone(timedelta(hours=8))).isoformat()
-                
-                item_data = {
-                    "title": item.get('title', ''),
-                    "url": item.get('url', ''),
-                    "content": item.get('content', ''),
-                    "pub_at": pub_at,
-                    "crawled_at": crawled_at
-                }
-                items.append(item_data)
-            
-            # 构建完整的JSON结构
-            payload = {
-                "sources": [
-                    {
-                        "name": source_name,
-                        "items": items
-                    }
-                ]
-            }
-            
-            # 发送POST请求
-            headers = {"Content-Type": "application/json; charset=utf-8"}
-            response = requests.post(
-                target_url,
-                data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
-                headers=headers,
-                timeout=10
-            )
-            
-            # 检查响应状态
-            response.raise_for_status()
-            message = f"成功推送 {len(items)} 条数据到API"
-            print(f"✅ {source_name}：{message}")
-            return {"status": "success", "message": message}
-            
-        except requests.exceptions.RequestException as e:
-            message = f"API推送失败 - {e}"
-            print(f"❌ {source_name}：{message}")
-            return {"status": "error", "message": message}
-        except Exception as e:
-            message = f"推送过程中发生未知错误 - {e}"
-            print(f"❌ {source_name}：{message}")
-            return {"status": "error", "message": message}
-    
-    def push_daily_status(self, date_str, success_count, fail_count):
-        """推送每日爬虫状态数据到API接口
-        
-        Args:
-            date_str: 日期字符串，格式为 YYYY-MM-DD
-            success_count: 成功爬取的文章数
-            fail_count: 失败的爬取数
-            
-        Returns:
-            dict: 推送结果，包含status和message
-        """
-        target_url = "http://47.114.109.178:5000/api/receive-daily-status"
-        
-        try:
-            # 使用东八区时间作为date
-            # 如果没有提供date_str，则使用当前东八区日期
-            if not date_str:
-                east8_datetime = datetime.now(timezone(timedelta(hours=8)))
-                east8_date = east8_datetime.date()
-                date_str = east8_date.isoformat()
-            
-            # 构造payload
-            payload = {
-                "date": date_str,
-                "success_count": success_count,
-                "fail_count": fail_count
-            }
-            
-            # 发送POST请求
-            headers = {"Content-Type": "application/json; charset=utf-8"}
-            response = requests.post(
-                target_url,
-                data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
-                headers=headers,
-                timeout=10
-            )
-            
-            # 检查响应状态
-            response.raise_for_status()
-            message = f"成功推送每日状态数据 - 日期={date_str}, 成功={success_count}, 失败={fail_count}"
-            print(f"✅ {message}")
-            return {"status": "success", "message": message}
-            
-        except requests.exceptions.RequestException as e:
-            message = f"每日状态数据推送失败 - {e}"
-            print(f"❌ {message}")
-            return {"status": "error", "message": message}
-        except Exception as e:
-            message = f"推送过程中发生未知错误 - {e}"
-            print(f"❌ {message}")
-            return {"status": "error", "message": message}
-
-# 创建全局实例
-db_utils = DBUtils()
-
+import os
+import json
+import requests
+from datetime import date, datetime, timezone, timedelta
+import hashlib
+import threading
+import time
+
+from change_tracker import HASH_KEY, STATUS_CHANGED, STATUS_NEW, STATUS_UNCHANGED, attach_hash, change_tracker
+from dedup_index import filter_duplicates, settle_duplicates
+from run_checkpoint import run_checkpoint
+from run_context import get_current_crawler
+from run_log import emit_event
+from storage import SupabaseStorage, get_storage
+from tracing import annotate_span, traced, tracer
+from write_queue import write_queue
+
+# ==========================================
+# 数据库工具模块
+# 功能：提供统一的数据库操作功能，避免重复代码
+# ==========================================
+
+DEFAULT_API_BASE = "http://47.114.109.178:5000"
+
+class DBUtils:
+    def __init__(self):
+        """初始化数据库工具
+
+        环境变量：
+            CRAWLER_STORAGE: 存储后端（supabase / sqlite / memory），默认 supabase
+            POLICY_API_BASE: 数据推送接口地址
+            POLICY_API_PUSH: 是否推送到接口，默认仅 supabase 后端推送
+        """
+        self.api_base = os.environ.get("POLICY_API_BASE", DEFAULT_API_BASE).rstrip("/")
+        self._api_push = os.environ.get("POLICY_API_PUSH")
+        # 本次运行新增/变化的数据（已处理），供全文索引等下游增量使用
+        self.run_records = []
+        self._run_lock = threading.Lock()
+        # 本次运行写库和推送接口的调用次数与耗时
+        self.timings = {"db_calls": 0, "db_seconds": 0.0, "api_calls": 0, "api_seconds": 0.0}
+
+    def _add_timing(self, kind, start):
+        with self._run_lock:
+            self.timings[f"{kind}_calls"] += 1
+            self.timings[f"{kind}_seconds"] += time.perf_counter() - start
+
+    def get_timings(self):
+        """返回本次运行写库和推送接口的调用次数与耗时"""
+        with self._run_lock:
+            return dict(self.timings)
+
+    def get_storage(self):
+        """获取当前存储后端
+
+        Returns:
+            StorageBackend: 存储后端实例
+        """
+        return get_storage()
+
+    def get_client(self):
+        """获取 Supabase 客户端（仅 supabase 后端可用）
+
+        Returns:
+            Client: Supabase 客户端实例
+        """
+        storage = self.get_storage()
+        if not isinstance(storage, SupabaseStorage):
+            raise ValueError(f"当前存储后端为 {storage.name}，没有 Supabase 客户端")
+        return storage.get_client()
+
+    @property
+    def api_push_enabled(self):
+        """是否推送数据到接口：未配置时只有写入云端数据库才推送，避免本地运行污染线上数据"""
+        if self._api_push is not None:
+            return self._api_push != "0"
+        return isinstance(self.get_storage(), SupabaseStorage)
+
+    def process_data(self, data_list):
+        """处理数据，准备写入数据库
+        
+        Args:
+            data_list: 原始数据列表
+            
+        Returns:
+            list: 处理后的数据列表
+        """
+        processed_data = []
+        
+        for item in data_list:
+            processed_item = item.copy()
+            
+            # 转换日期对象为字符串
+            if hasattr(processed_item.get('pub_at'), 'isoformat'):
+                processed_item['pub_at'] = processed_item['pub_at'].isoformat()
+            
+            # 确保必要字段存在
+            if 'selected' not in processed_item:
+                processed_item['selected'] = False
+
+            # 抓取时未附加内容哈希的数据在这里补上
+            if HASH_KEY not in processed_item:
+                attach_hash(processed_item)
+            
+            processed_data.append(processed_item)
+        
+        return processed_data
+    
+    @traced("upsert_policies", "store")
+    def upsert_policies(self, data_list, source_name):
+        """批量写入 policy 表，不输出日志
+
+        按本地内容哈希区分新增 / 有变化 / 未变化：新增数据按标题 upsert，
+        有变化的数据只更新改动过的字段，未变化的数据跳过。
+
+        Args:
+            data_list: 原始数据列表
+            source_name: 数据源名称
+
+        Returns:
+            tuple: (成功写入或未变化的原始数据列表, 失败信息列表, {状态: 原始数据列表})
+        """
+        # 同一批次内标题重复时保留最后一条
+        by_title = {}
+        for processed_item in self.process_data(data_list):
+            by_title[processed_item.get("title")] = processed_item
+
+        new_items = []
+        updates = []
+        stored_titles = {STATUS_NEW: set(), STATUS_CHANGED: set(), STATUS_UNCHANGED: set()}
+        for title, processed_item in by_title.items():
+            status, fields = change_tracker.classify(processed_item)
+            if status == STATUS_NEW:
+                new_items.append(processed_item)
+            elif status == STATUS_CHANGED:
+                updates.append((title, {field: processed_item.get(field) for field in fields + [HASH_KEY]}))
+            else:
+                stored_titles[STATUS_UNCHANGED].add(title)
+
+        storage = self.get_storage()
+        errors = []
+        if new_items:
+            start = time.perf_counter()
+            written_indexes, new_errors = storage.upsert_policies(new_items)
+            self._add_timing("db", start)
+            stored_titles[STATUS_NEW].update(new_items[i].get("title") for i in written_indexes)
+            errors.extend(new_errors)
+        if updates:
+            start = time.perf_counter()
+            written_indexes, update_errors = storage.update_policies(updates)
+            self._add_timing("db", start)
+            stored_titles[STATUS_CHANGED].update(updates[i][0] for i in written_indexes)
+            errors.extend(update_errors)
+
+        changed_items = [by_title[title] for title in stored_titles[STATUS_NEW] | stored_titles[STATUS_CHANGED]]
+        change_tracker.remember(changed_items)
+        with self._run_lock:
+            self.run_records.extend(changed_items)
+
+        changes = {
+            status: [item for item in data_list if item.get("title") in titles]
+            for status, titles in stored_titles.items()
+        }
+        # 断点：写入后立即保存内容哈希，中断后恢复时已写入的数据按未变化跳过
+        run_checkpoint.record_written(source_name, changes[STATUS_NEW] + changes[STATUS_CHANGED],
+                                      self.api_push_enabled)
+        stored = [item for item in data_list if any(item.get("title") in titles for titles in stored_titles.values())]
+        annotate_span(source=source_name, records=len(data_list), new=len(stored_titles[STATUS_NEW]),
+                      changed=len(stored_titles[STATUS_CHANGED]), unchanged=len(stored_titles[STATUS_UNCHANGED]),
+                      errors=len(errors))
+        return stored, errors, changes
+
+    @traced("save_to_policy", "store")
+    def save_to_policy(self, data_list, source_name):
+        """保存数据到 policy 表
+
+        写入队列已启动时（由爬虫管理器启动）只把数据放入队列，由后台写入线程批量写入和推送，
+        否则同步写入并推送到 API。未变化的数据不更新也不推送。
+
+        Args:
+            data_list: 数据列表
+            source_name: 数据源名称
+
+        Returns:
+            tuple: (成功写入、未变化或已入队的数据列表, API推送结果)
+        """
+        if not data_list:
+            print(f"⚠️  {source_name}：没有数据需要写入，跳过。")
+            return [], None
+
+        annotate_span(source=source_name, records=len(data_list))
+        # 近似重复（其他来源已抓取过的同一文件）只关联到规范条目，不再写入和推送
+        data_list, duplicates = filter_duplicates(data_list, source_name)
+        if duplicates:
+            print(f"🔁 {source_name}：{len(duplicates)} 条近似重复数据已关联到已有记录，跳过写入和推送")
+            for item, canonical in duplicates:
+                print(f"   {item.get('title', '')[:40]} → {canonical.get('source', '')}：{canonical.get('title', '')[:40]}")
+            if not data_list:
+                return [], None
+
+        if write_queue.active:
+            annotate_span(queued=True)
+            ticket = write_queue.submit(data_list, source_name)
+            # 写入确认后再保留新登记的规范条目，写入失败的撤销
+            ticket.add_done_callback(lambda t: settle_duplicates(t.records, t.written, source_name))
+            print(f"📥 {source_name}：{len(data_list)} 条数据已加入写入队列")
+            return list(data_list), {"status": "queued", "message": f"{len(data_list)} 条数据已加入写入队列"}
+
+        try:
+            stored, errors, changes = self.upsert_policies(data_list, source_name)
+            settle_duplicates(data_list, stored, source_name)
+            for error in errors:
+                print(f"⚠️  {source_name}：{error}")
+
+            changed = changes[STATUS_NEW] + changes[STATUS_CHANGED]
+            print(f"✅ {source_name}：成功写入 {len(changed)} 条数据到 {self.get_storage().name}"
+                  f"（新增 {len(changes[STATUS_NEW])}，变化 {len(changes[STATUS_CHANGED])}，"
+                  f"未变化 {len(changes[STATUS_UNCHANGED])}）")
+
+            # 只推送新增和有变化的数据
+            api_push_result = None
+            if changed:
+                api_push_result = self.push_to_api(changed, source_name)
+
+            # 保存API推送结果到返回值中
+            return stored, api_push_result
+
+        except Exception as e:
+            settle_duplicates(data_list, [], source_name)
+            print(f"❌ {source_name}：数据库写入失败 - {e}")
+            return [], None
+
+    def take_run_records(self):
+        """取出并清空本次运行新增/变化的数据
+
+        Returns:
+            list: 已处理的数据列表
+        """
+        with self._run_lock:
+            records, self.run_records = self.run_records, []
+        return records
+
+    def build_api_items(self, data_list):
+        """构造 API 接口要求的数据条目"""
+        items = []
+        for item in data_list:
+            # 处理pub_at字段，确保是字符串格式
+            pub_at = item.get('pub_at', '')
+            if hasattr(pub_at, 'isoformat'):
+                pub_at = pub_at.isoformat()
+
+            # 获取当前东八区时间作为crawled_at
+            crawled_at = datetime.now(timezone(timedelta(hours=8))).isoformat()
+
+            items.append({
+                "title": item.get('title', ''),
+                "url": item.get('url', ''),
+                "content": item.get('content', ''),
+                "pub_at": pub_at,
+                "crawled_at": crawled_at
+            })
+        return items
+
+    def send_to_api(self, sources):
+        """将一个或多个数据源的数据合并为一次请求推送到API接口，不输出日志
+
+        Args:
+            sources: [(数据源名称, 数据列表)] 列表
+
+        Returns:
+            dict: 推送结果，包含status和message
+        """
+        if not self.api_push_enabled:
+            return {"status": "skipped", "message": "API推送已关闭"}
+
+        target_url = f"{self.api_base}/api/receive-data"
+        total = 0
+
+        try:
+            # 构建完整的JSON结构（按照接口示例格式，sources 支持多个数据源）
+            payload_sources = []
+            for source_name, data_list in sources:
+                items = self.build_api_items(data_list)
+                total += len(items)
+                payload_sources.append({"name": source_name, "items": items})
+            payload = {"sources": payload_sources}
+
+            # 发送POST请求
+            headers = {"Content-Type": "application/json; charset=utf-8"}
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            start = time.perf_counter()
+            try:
+                with tracer.span("POST receive-data", "push", url=target_url, sources=len(payload_sources),
+                                 records=total, bytes=len(body)) as span:
+                    response = requests.post(
+                        target_url,
+                        data=body,
+                        headers=headers,
+                        timeout=10
+                    )
+                    span.set(status=response.status_code)
+            finally:
+                self._add_timing("api", start)
+
+            # 检查响应状态
+            response.raise_for_status()
+            run_checkpoint.record_pushed(sources)
+            return {"status": "success", "message": f"成功推送 {total} 条数据到API"}
+
+        except requests.exceptions.RequestException as e:
+            return {"status": "error", "message": f"API推送失败 - {e}"}
+        except Exception as e:
+            return {"status": "error", "message": f"推送过程中发生未知错误 - {e}"}
+
+    @traced("push_to_api", "push")
+    def push_to_api(self, data_list, source_name):
+        """将数据推送到目标API接口
+
+        Args:
+            data_list: 数据列表
+            source_name: 数据源名称
+
+        Returns:
+            dict: 推送结果，包含status和message
+        """
+        if not data_list:
+            print(f"⚠️  {source_name}：没有数据需要推送，跳过。")
+            return {"status": "skipped", "message": "没有数据需要推送"}
+
+        result = self.send_to_api([(source_name, data_list)])
+        annotate_span(source=source_name, records=len(data_list), status=result["status"])
+        icon = {"success": "✅", "skipped": "⏭️ "}.get(result["status"], "❌")
+        print(f"{icon} {source_name}：{result['message']}")
+        emit_event("api_push", get_current_crawler() or source_name,
+                   status=result["status"], message=result["message"], source=source_name)
+        return result
+
+    def push_daily_status(self, date_str, success_count, fail_count):
+        """推送每日爬虫状态数据到API接口
+        
+        Args:
+            date_str: 日期字符串，格式为 YYYY-MM-DD
+            success_count: 成功爬取的文章数
+            fail_count: 失败的爬取数
+            
+        Returns:
+            dict: 推送结果，包含status和message
+        """
+        if not self.api_push_enabled:
+            message = "API推送已关闭，跳过每日状态数据推送"
+            print(f"⏭️  {message}")
+            return {"status": "skipped", "message": message}
+
+        target_url = f"{self.api_base}/api/receive-daily-status"
+        
+        try:
+            # 使用东八区时间作为date
+            # 如果没有提供date_str，则使用当前东八区日期
+            if not date_str:
+                east8_datetime = datetime.now(timezone(timedelta(hours=8)))
+                east8_date = east8_datetime.date()
+                date_str = east8_date.isoformat()
+            
+            # 构造payload
+            payload = {
+                "date": date_str,
+                "success_count": success_count,
+                "fail_count": fail_count
+            }
+            
+            # 发送POST请求
+            headers = {"Content-Type": "application/json; charset=utf-8"}
+            response = requests.post(
+                target_url,
+                data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+                headers=headers,
+                timeout=10
+            )
+            
+            # 检查响应状态
+            response.raise_for_status()
+            message = f"成功推送每日状态数据 - 日期={date_str}, 成功={success_count}, 失败={fail_count}"
+            print(f"✅ {message}")
+            return {"status": "success", "message": message}
+            
+        except requests.exceptions.RequestException as e:
+            message = f"每日状态数据推送失败 - {e}"
+            print(f"❌ {message}")
+            return {"status": "error", "message": message}
+        except Exception as e:
+            message = f"推送过程中发生未知错误 - {e}"
+            print(f"❌ {message}")
+            return {"status": "error", "message": message}
+
+# 创建全局实例
+db_utils = DBUtils()
+
 # 便捷函数
 def save_to_policy(data_list, source_name):
     """便捷函数：保存数据到 policy 表
@@ -249,31 +405,31 @@ def save_to_policy(data_list, source_name):
     Returns:
         tuple: (成功写入的数据列表, API推送结果)
     """
-    return db_utils.save_to_policy(data_list, source_name)
-
-# 便捷函数
-def push_to_api(data_list, source_name):
-    """便捷函数：将数据推送到API接口
-    
-    Args:
-        data_list: 数据列表
-        source_name: 数据源名称
-        
-    Returns:
-        bool: 是否成功推送
-    """
-    return db_utils.push_to_api(data_list, source_name)
-
-# 便捷函数
-def push_daily_status(date_str, success_count, fail_count):
-    """便捷函数：推送每日爬虫状态数据到API接口
-    
-    Args:
-        date_str: 日期字符串，格式为 YYYY-MM-DD
-        success_count: 成功爬取的文章数
-        fail_count: 失败的爬取数
-        
-    Returns:
-        bool: 是否成功推送
-    """
-    return db_utils.push_daily_status(date_str, success_count, fail_count)
+    return db_utils.save_to_policy(data_list, source_name)
+
+# 便捷函数
+def push_to_api(data_list, source_name):
+    """便捷函数：将数据推送到API接口
+    
+    Args:
+        data_list: 数据列表
+        source_name: 数据源名称
+        
+    Returns:
+        bool: 是否成功推送
+    """
+    return db_utils.push_to_api(data_list, source_name)
+
+# 便捷函数
+def push_daily_status(date_str, success_count, fail_count):
+    """便捷函数：推送每日爬虫状态数据到API接口
+    
+    Args:
+        date_str: 日期字符串，格式为 YYYY-MM-DD
+        success_count: 成功爬取的文章数
+        fail_count: 失败的爬取数
+        
+    Returns:
+        bool: 是否成功推送
+    """
+    return db_utils.push_daily_status(date_str, success_count, fail_count)
@@ -0,0 +1,256 @@
+import atexit
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime
+
+from state_utils import load_json, save_json
+
+# ==========================================
+# 近似重复检测模块
+# 功能：对「标题 + 正文」的字符二元组计算 64 位 SimHash，
+#       按 8 段 8 位分桶（汉明距离不超过 7 的指纹至少有一段完全相同），
+#       每条数据只查 8 个桶即可找到近似重复的规范条目；索引持久化到状态目录。
+#       新登记的规范条目先作为待确认条目参与匹配，写入确认后保留，写入失败时撤销
+# ==========================================
+
+STATE_FILE = "dedup_index.json"
+
+FINGERPRINT_BITS = 64
+BAND_COUNT = 8
+BAND_BITS = FINGERPRINT_BITS // BAND_COUNT
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# 汉明距离不超过该值视为近似重复（必须小于 BAND_COUNT，分桶才能保证召回）
+DEFAULT_MAX_DISTANCE = 6
+# 参与计算的正文长度上限
+CONTENT_PREFIX_LENGTH = 2000
+# 特征（二元组）少于该值时指纹不稳定，不参与去重
+MIN_FEATURES = 40
+# 索引最多保留的条目数，超出后淘汰最早加入的条目
+MAX_ENTRIES = 20000
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def _normalize(text):
+    return _NON_WORD.sub("", (text or "").lower())
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(title, content=""):
+    """计算标题 + 正文的 64 位 SimHash
+
+    Args:
+        title: 标题
+        content: 正文
+
+    Returns:
+        tuple: (指纹, 特征数)
+    """
+    text = _normalize(title) + _normalize((content or "")[:CONTENT_PREFIX_LENGTH])
+    features = {}
+    for i in range(len(text) - 1):
+        bigram = text[i:i + 2]
+        features[bigram] = features.get(bigram, 0) + 1
+
+    weights = [0] * FINGERPRINT_BITS
+    for feature, count in features.items():
+        value = _feature_hash(feature)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint, len(features)
+
+
+def _bands(fingerprint):
+    return [(i, fingerprint >> (i * BAND_BITS) & BAND_MASK) for i in range(BAND_COUNT)]
+
+
+def _tentative_key(item, source_name):
+    return source_name, item.get("title", ""), item.get("url", "")
+
+
+class DedupIndex:
+    def __init__(self):
+        """初始化近似重复索引
+
+        环境变量：
+            DEDUP_INDEX: 设为 0 时关闭近似重复检测
+            DEDUP_MAX_DISTANCE: 视为近似重复的最大汉明距离
+        """
+        self.enabled = os.environ.get("DEDUP_INDEX", "1") != "0"
+        self.max_distance = min(int(os.environ.get("DEDUP_MAX_DISTANCE", DEFAULT_MAX_DISTANCE)), BAND_COUNT - 1)
+        self.entries = {}
+        self.buckets = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
+        # 待确认的规范条目：(数据源名称, 标题, 地址) → 指纹
+        self._tentative = {}
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for key, entry in (load_json(STATE_FILE, {}) or {}).items():
+            self._add_entry(int(key, 16), entry)
+
+    def _add_entry(self, fingerprint, entry):
+        self.entries[fingerprint] = entry
+        for band in _bands(fingerprint):
+            self.buckets.setdefault(band, []).append(fingerprint)
+
+    def _remove_entry(self, fingerprint):
+        self.entries.pop(fingerprint, None)
+        for band in _bands(fingerprint):
+            bucket = self.buckets.get(band)
+            if bucket and fingerprint in bucket:
+                bucket.remove(fingerprint)
+                if not bucket:
+                    del self.buckets[band]
+
+    def find(self, fingerprint):
+        """查找近似重复的规范条目
+
+        Returns:
+            dict: 规范条目，没有时返回 None
+        """
+        best = None
+        for band in _bands(fingerprint):
+            for candidate in self.buckets.get(band, ()):
+                distance = bin(candidate ^ fingerprint).count("1")
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, candidate)
+        return self.entries[best[1]] if best else None
+
+    def check(self, item, source_name):
+        """检查一条数据是否为已有条目的近似重复，不是则把它登记为待确认的规范条目
+
+        登记的条目写入确认前即参与匹配，需在写入结束后调用 settle 确认或撤销
+
+        Args:
+            item: 数据字典（title / content / url）
+            source_name: 数据源名称
+
+        Returns:
+            dict: 近似重复时返回规范条目，否则返回 None
+        """
+        if not self.enabled:
+            return None
+
+        fingerprint, feature_count = simhash(item.get("title"), item.get("content"))
+        if feature_count < MIN_FEATURES:
+            return None
+
+        url = item.get("url", "")
+        with self._lock:
+            self._load()
+            canonical = self.find(fingerprint)
+            if canonical is not None:
+                # 同一地址是同一条数据的更新，不算重复
+                if canonical.get("url") == url:
+                    return None
+                duplicates = canonical.setdefault("duplicates", [])
+                if not any(d.get("url") == url for d in duplicates):
+                    duplicates.append({"title": item.get("title", ""), "url": url, "source": source_name})
+                    self._dirty = True
+                return canonical
+
+            self._add_entry(fingerprint, {
+                "title": item.get("title", ""),
+                "url": url,
+                "source": source_name,
+                "first_seen": datetime.now().isoformat(timespec="seconds"),
+            })
+            self._tentative[_tentative_key(item, source_name)] = fingerprint
+            while len(self.entries) > MAX_ENTRIES:
+                self._remove_entry(next(iter(self.entries)))
+            self._dirty = True
+            return None
+
+    def filter_duplicates(self, data_list, source_name):
+        """过滤近似重复的数据
+
+        Args:
+            data_list: 数据列表
+            source_name: 数据源名称
+
+        Returns:
+            tuple: (非重复数据列表, [(重复数据, 规范条目)] 列表)
+        """
+        unique = []
+        duplicates = []
+        for item in data_list:
+            canonical = self.check(item, source_name)
+            if canonical is None:
+                unique.append(item)
+            else:
+                duplicates.append((item, canonical))
+        return unique, duplicates
+
+    def settle(self, data_list, written, source_name):
+        """写入结束后确认规范条目：写入成功的保留，写入失败的从索引中撤销
+
+        Args:
+            data_list: 提交写入的数据列表
+            written: 成功写入（含未变化）的数据列表
+            source_name: 数据源名称
+        """
+        written_ids = {id(item) for item in written}
+        with self._lock:
+            for item in data_list:
+                fingerprint = self._tentative.pop(_tentative_key(item, source_name), None)
+                if fingerprint is None or id(item) in written_ids:
+                    continue
+                entry = self.entries.get(fingerprint)
+                if entry and entry.get("url") == item.get("url", ""):
+                    self._remove_entry(fingerprint)
+                    self._dirty = True
+
+    def save(self):
+        """把有变化的索引写回状态目录"""
+        with self._lock:
+            if not self._dirty:
+                return
+            save_json(STATE_FILE, {format(fp, "016x"): entry for fp, entry in self.entries.items()})
+            self._dirty = False
+
+
+# 创建全局实例
+dedup_index = DedupIndex()
+# 单独运行爬虫时也在退出前保存索引
+atexit.register(dedup_index.save)
+
+
+# 便捷函数
+def filter_duplicates(data_list, source_name):
+    """便捷函数：过滤近似重复的数据
+
+    Args:
+        data_list: 数据列表
+        source_name: 数据源名称
+
+    Returns:
+        tuple: (非重复数据列表, [(重复数据, 规范条目)] 列表)
+    """
+    return dedup_index.filter_duplicates(data_list, source_name)
+
+
+def settle_duplicates(data_list, written, source_name):
+    """便捷函数：写入结束后确认或撤销登记的规范条目
+
+    Args:
+        data_list: 提交写入的数据列表
+        written: 成功写入（含未变化）的数据列表
+        source_name: 数据源名称
+    """
+    dedup_index.settle(data_list, written, source_name)
@@ -1,10 +1,30 @@
+import atexit
 import os
+import queue
 import sys
+import threading
+import time
 import requests
 import json
 from datetime import datetime
 from io import StringIO
 
+# ==========================================
+# 飞书通知模块
+# 功能：消息由后台线程发送（失败重试、排队消息合并、限制发送频率），
+#       webhook 无响应时不会拖慢爬虫运行的退出
+# ==========================================
+
+# 两次发送之间的最小间隔（秒），自定义机器人限制为每秒 5 次、每分钟 100 次
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_MAX_RETRIES = 3
+# 运行结束时等待消息发送完成的最长时间（秒）
+DEFAULT_FLUSH_TIMEOUT = 15.0
+# 飞书返回的限流错误码，需要重试
+RATE_LIMIT_CODES = {9499, 11232}
+# 卡片中列出的最慢数据源数量
+SLOWEST_COUNT = 5
+
 
 class OutputCapturer:
     """控制台输出捕获器"""
@@ -46,6 +66,14 @@ class FeishuNotifier:
         self.webhook_url = webhook_url or os.getenv('FEISHU_BOT_WEBHOOK')
         self.enabled = bool(self.webhook_url)
         self.output_capturer = OutputCapturer()
+        # FEISHU_ASYNC=0 时在调用线程中同步发送
+        self.async_send = os.getenv('FEISHU_ASYNC', '1') != '0'
+        self.min_interval = float(os.getenv('FEISHU_MIN_INTERVAL', DEFAULT_MIN_INTERVAL))
+        self.max_retries = int(os.getenv('FEISHU_MAX_RETRIES', DEFAULT_MAX_RETRIES))
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._last_sent = 0.0
         
         if not self.enabled:
             print("⚠️  飞书机器人未配置（FEISHU_BOT_WEBHOOK 环境变量未设置）")
@@ -128,17 +156,18 @@ class FeishuNotifier:
         
         return self._send(payload)
     
-    def send_crawler_result(self, results, start_time, end_time, full_log=None):
+    def send_crawler_result(self, results, start_time, end_time, full_log=None, performance=None):
         """发送爬虫执行结果
         
         Args:
             results: 爬虫执行结果字典
             start_time: 开始时间 (datetime)
             end_time: 结束时间 (datetime)
-            full_log: 完整的控制台输出日志
+            full_log: 运行日志尾部（内存中保留的最近若干行）
+            performance: 性能数据，包含 fetch_p95_ms / fetches / regressions / anomalies，可选
             
         Returns:
-            bool: 是否发送成功
+            bool: 是否发送成功（后台发送时表示已加入发送队列）
         """
         if not self.enabled:
             return False
@@ -246,17 +275,109 @@ class FeishuNotifier:
                 {"tag": "text", "text": f"📊 API推送统计: 成功 {api_success_count} 个, 失败 {api_error_count} 个"}
             ])
         
+        # 性能数据
+        if api_results_added:
+            content.append([{"tag": "text", "text": "==================="}])
+        content.extend(self._performance_lines(results, start_time, end_time, performance or {}))
+        
         # 发送富文本消息（标题需包含飞书机器人关键词"政策"）
         return self.send_rich_text("政策爬虫执行结果", content)
     
+    def _performance_lines(self, results, start_time, end_time, performance):
+        """构建性能数据的富文本行：总耗时、最慢数据源、请求耗时 p95、相对历史基线变慢的数据源、性能剖析热点"""
+        lines = []
+        total_seconds = (end_time - start_time).total_seconds()
+        lines.append([{"tag": "text", "text": f"⏱️ 总耗时: {total_seconds:.1f} 秒"}])
+        
+        p95 = performance.get('fetch_p95_ms')
+        if p95 is not None:
+            lines.append([{"tag": "text", "text": f"🌐 网络请求: {performance.get('fetches', 0)} 次，p95 耗时 {p95:.0f} ms"}])
+        
+        slowest = sorted(
+            ((name, result.get('execution_time', 0)) for name, result in results.items()),
+            key=lambda item: item[1], reverse=True,
+        )[:SLOWEST_COUNT]
+        if slowest:
+            lines.append([{"tag": "text", "text": f"🐢 最慢的 {len(slowest)} 个数据源:"}])
+            for name, seconds in slowest:
+                lines.append([{"tag": "text", "text": f"   {name}: {seconds:.1f} 秒"}])
+        
+        regressions = performance.get('regressions') or []
+        if regressions:
+            lines.append([{"tag": "text", "text": "📈 相对历史基线变慢:"}])
+            for name, current, baseline in regressions:
+                lines.append([{"tag": "text", "text": f"   {name}: {current:.1f} 秒（基线 {baseline:.1f} 秒）"}])
+        
+        anomalies = performance.get('anomalies') or []
+        if anomalies:
+            lines.append([{"tag": "text", "text": f"🚨 指标异常 {len(anomalies)} 项:"}])
+            for text in anomalies:
+                lines.append([{"tag": "text", "text": f"   {text}"}])
+        
+        profile = performance.get('profile') or []
+        if profile:
+            lines.append([{"tag": "text", "text": "🔬 性能剖析（自身耗时最多的函数）:"}])
+            for text in profile:
+                lines.append([{"tag": "text", "text": f"   {text}"}])
+        return lines
+    
     def _send(self, payload):
-        """发送消息到飞书
+        """发送消息到飞书（默认加入后台发送队列）
         
         Args:
             payload: 消息 payload
             
         Returns:
-            bool: 是否发送成功
+            bool: 是否发送成功；后台发送时表示已加入发送队列
+        """
+        if not self.async_send:
+            return self._post_with_retry(payload)
+        
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                # 守护线程：webhook 无响应时进程仍可退出
+                self._worker = threading.Thread(target=self._run_worker, name="feishu-notifier", daemon=True)
+                self._worker.start()
+        self._queue.put(payload)
+        return True
+    
+    def _run_worker(self):
+        while True:
+            payloads = [self._queue.get()]
+            # 合并已在排队的消息，减少请求次数
+            while True:
+                try:
+                    payloads.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                for payload in _coalesce(payloads):
+                    self._post_with_retry(payload)
+            finally:
+                for _ in payloads:
+                    self._queue.task_done()
+    
+    def _post_with_retry(self, payload):
+        """按频率限制发送，网络异常、服务端错误和限流时指数退避重试"""
+        for attempt in range(self.max_retries + 1):
+            wait = self._last_sent + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_sent = time.monotonic()
+            
+            retryable, success = self._post(payload)
+            if success or not retryable:
+                return success
+            if attempt < self.max_retries:
+                time.sleep(2 ** attempt)
+        print("❌ 飞书消息发送失败：已达到最大重试次数")
+        return False
+    
+    def _post(self, payload):
+        """发送一次请求
+        
+        Returns:
+            tuple: (是否可重试, 是否发送成功)
         """
         try:
             response = requests.post(
@@ -265,19 +386,62 @@ class FeishuNotifier:
                 headers={'Content-Type': 'application/json'},
                 timeout=10
             )
+            if response.status_code == 429 or response.status_code >= 500:
+                print(f"⚠️  飞书消息发送失败：HTTP {response.status_code}，稍后重试")
+                return True, False
             response.raise_for_status()
             
             result = response.json()
             if result.get('code') == 0:
                 print("✅ 飞书消息发送成功")
-                return True
-            else:
-                print(f"❌ 飞书消息发送失败：{result.get('msg', '未知错误')}")
-                return False
+                return False, True
+            if result.get('code') in RATE_LIMIT_CODES:
+                print(f"⚠️  飞书消息发送被限流：{result.get('msg', '')}，稍后重试")
+                return True, False
+            print(f"❌ 飞书消息发送失败：{result.get('msg', '未知错误')}")
+            return False, False
                 
+        except requests.RequestException as e:
+            print(f"⚠️  飞书消息发送异常：{e}，稍后重试")
+            return True, False
         except Exception as e:
             print(f"❌ 飞书消息发送异常：{e}")
-            return False
+            return False, False
+    
+    def flush(self, timeout=DEFAULT_FLUSH_TIMEOUT):
+        """等待发送队列中的消息发送完成
+        
+        Args:
+            timeout: 最长等待秒数
+            
+        Returns:
+            bool: 是否全部发送完成（超时后剩余消息随进程退出丢弃）
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                print(f"⚠️  飞书消息在 {timeout} 秒内未发送完成，不再等待")
+                return False
+            time.sleep(0.05)
+        return True
+
+
+def _coalesce(payloads):
+    """合并相邻的同类消息：文本消息按段落拼接，富文本消息按行拼接，卡片消息不合并"""
+    merged = []
+    for payload in payloads:
+        previous = merged[-1] if merged else None
+        msg_type = payload.get("msg_type")
+        if previous and previous.get("msg_type") == msg_type == "text":
+            previous["content"]["text"] += "\n\n" + payload["content"]["text"]
+        elif previous and previous.get("msg_type") == msg_type == "post":
+            post = payload["content"]["post"]["zh_cn"]
+            previous_post = previous["content"]["post"]["zh_cn"]
+            previous_post["content"].append([{"tag": "text", "text": f"—— {post['title']} ——"}])
+            previous_post["content"].extend(post["content"])
+        else:
+            merged.append(json.loads(json.dumps(payload)))
+    return merged
 
 
 # 全局实例
@@ -289,10 +453,19 @@ def get_notifier():
     global _notifier
     if _notifier is None:
         _notifier = FeishuNotifier()
+        # 单独使用时也在退出前尽量把消息发完
+        atexit.register(_notifier.flush)
     return _notifier
 
 
-def send_crawler_result(results, start_time, end_time, full_log=None):
+def send_crawler_result(results, start_time, end_time, full_log=None, performance=None):
     """发送爬虫执行结果（便捷函数）"""
     notifier = get_notifier()
-    return notifier.send_crawler_result(results, start_time, end_time, full_log)
+    return notifier.send_crawler_result(results, start_time, end_time, full_log, performance)
+
+
+def flush_notifications(timeout=DEFAULT_FLUSH_TIMEOUT):
+    """等待后台发送队列中的消息发送完成（便捷函数）"""
+    if _notifier is None:
+        return True
+    return _notifier.flush(timeout)
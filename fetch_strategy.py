@@ -0,0 +1,220 @@
+import atexit
+import threading
+import time
+
+from state_utils import load_json, save_json
+
+# ==========================================
+# 抓取策略模块
+# 功能：为「官网 → Reader → Google 索引」这类多级回退抓取链
+#       按站点记住最近成功的层级（随时间衰减），下次优先尝试；
+#       在后台探测首选层级是否恢复，并缓存标题 → URL 的反查结果；
+#       层级成功率在内存中更新，探测结束和进程退出时保存
+# ==========================================
+
+TIER_STATE_FILE = "fetch_tiers.json"
+RESOLVE_STATE_FILE = "resolved_urls.json"
+
+# 层级成功率的半衰期：一周没有新结果时，记录的偏好衰减一半，逐渐回到中性
+HALF_LIFE_SECONDS = 7 * 86400
+NEUTRAL_SCORE = 0.5
+# 每次结果对成功率的更新幅度
+LEARNING_RATE = 0.5
+
+# 每个命名空间最多缓存的反查结果条数，超出后淘汰最早写入的条目
+RESOLVE_MAX_ENTRIES = 2000
+
+
+def _decayed(entry, now):
+    """按半衰期衰减后的成功率，没有记录时为中性值"""
+    if not entry:
+        return NEUTRAL_SCORE
+    weight = 0.5 ** (max(0.0, now - entry["updated"]) / HALF_LIFE_SECONDS)
+    return NEUTRAL_SCORE + (entry["score"] - NEUTRAL_SCORE) * weight
+
+
+class FetchStrategy:
+    def __init__(self):
+        """初始化抓取策略，加载各站点层级成功率和反查缓存"""
+        self.tiers = load_json(TIER_STATE_FILE, {}) or {}
+        self.resolved = load_json(RESOLVE_STATE_FILE, {}) or {}
+        self._lock = threading.Lock()
+        self._probes = []
+        self._probe_results = {}
+        # 正在后台探测的 (站点, 层级)，同一层级同时只探测一次
+        self._probing = set()
+        self._dirty = False
+
+    def score(self, key, tier, now=None):
+        """返回衰减后的层级成功率
+
+        Args:
+            key: 站点标识（通常为域名）
+            tier: 层级名称
+            now: 当前时间戳，可选
+
+        Returns:
+            float: 成功率，取值 0~1，没有记录时为中性值
+        """
+        with self._lock:
+            entry = self.tiers.get(key, {}).get(tier)
+        return _decayed(entry, time.time() if now is None else now)
+
+    def order(self, key, names):
+        """按成功率从高到低排列层级，成功率相同时保持声明顺序"""
+        now = time.time()
+        return sorted(names, key=lambda name: -self.score(key, name, now))
+
+    def record(self, key, tier, success):
+        """记录一次层级抓取结果（只更新内存，由 save 统一保存）"""
+        with self._lock:
+            now = time.time()
+            tiers = self.tiers.setdefault(key, {})
+            old = _decayed(tiers.get(tier), now)
+            new = old + LEARNING_RATE * ((1.0 if success else 0.0) - old)
+            tiers[tier] = {"score": round(new, 4), "updated": now}
+            self._dirty = True
+
+    def save(self):
+        """有新结果时保存层级成功率"""
+        with self._lock:
+            if not self._dirty:
+                return
+            save_json(TIER_STATE_FILE, self.tiers)
+            self._dirty = False
+
+    def _probe(self, key, tier, func):
+        try:
+            result = func()
+        except Exception as e:
+            print(f"[INFO] {key} 首选层级 {tier} 后台探测失败: {e}")
+            result = None
+        else:
+            print(f"[INFO] {key} 首选层级 {tier} 后台探测{'成功' if result else '未取到数据'}")
+        self._probe_results[(key, tier)] = result
+        self.record(key, tier, bool(result))
+        with self._lock:
+            self._probing.discard((key, tier))
+
+    def start_probe(self, key, tier, func):
+        """在后台线程中探测层级，更新成功率，结果留给本次抓取兜底使用
+
+        Returns:
+            threading.Thread: 探测线程；该层级已在探测中时返回 None
+        """
+        with self._lock:
+            if (key, tier) in self._probing:
+                return None
+            self._probing.add((key, tier))
+        thread = threading.Thread(target=self._probe, args=(key, tier, func), daemon=True)
+        thread.start()
+        self._probes.append(thread)
+        return thread
+
+    def run(self, key, tiers, probe=None):
+        """按记忆的成功率依次尝试各层级
+
+        Args:
+            key: 站点标识（通常为域名）
+            tiers: [(层级名称, 无参函数)] 列表，按首选顺序声明；函数返回真值视为成功
+            probe: 首选层级不在第一位时用于后台探测的无参函数，可选；
+                   需使用独立的连接（如新的 requests.Session），不能与其他层级共享
+
+        Returns:
+            tuple: (成功的层级名称, 结果)，全部失败时返回 (None, None)
+        """
+        names = [name for name, _ in tiers]
+        funcs = dict(tiers)
+        ordered = self.order(key, names)
+
+        probing = None
+        if ordered[0] != names[0]:
+            print(f"[INFO] {key} 优先使用上次成功的层级 {ordered[0]}")
+            if probe:
+                self._probe_results.pop((key, names[0]), None)
+                # 上一次探测尚未结束时不再重复探测，首选层级按普通顺序尝试
+                if self.start_probe(key, names[0], probe):
+                    probing = names[0]
+
+        for name in ordered:
+            if name == probing:
+                # 首选层级已在后台探测，其余层级都失败时直接使用探测结果，不再重复请求
+                self.wait_for_probes()
+                result = self._probe_results.pop((key, name), None)
+                if result:
+                    return name, result
+                continue
+            try:
+                result = funcs[name]()
+            except Exception as e:
+                print(f"[WARN] {key} 层级 {name} 抓取失败: {e}")
+                self.record(key, name, False)
+                continue
+            self.record(key, name, bool(result))
+            if result:
+                return name, result
+            print(f"[WARN] {key} 层级 {name} 未取到数据")
+
+        return None, None
+
+    def wait_for_probes(self, timeout=None):
+        """等待后台探测结束，并保存层级成功率"""
+        for thread in self._probes:
+            thread.join(timeout)
+        self._probes = [thread for thread in self._probes if thread.is_alive()]
+        self.save()
+
+    def resolve(self, namespace, key, func):
+        """带缓存的反查（如标题 → 文章 URL），只缓存非空结果
+
+        Args:
+            namespace: 缓存命名空间（通常为爬虫名）
+            key: 反查键
+            func: 未命中缓存时调用的无参函数
+
+        Returns:
+            反查结果
+        """
+        cache = self.resolved.get(namespace, {})
+        if key in cache:
+            return cache[key]
+
+        value = func()
+        if value:
+            with self._lock:
+                cache = self.resolved.setdefault(namespace, {})
+                cache[key] = value
+                while len(cache) > RESOLVE_MAX_ENTRIES:
+                    cache.pop(next(iter(cache)))
+                save_json(RESOLVE_STATE_FILE, self.resolved)
+        return value
+
+
+# 创建全局实例
+fetch_strategy = FetchStrategy()
+atexit.register(fetch_strategy.save)
+
+
+# 便捷函数
+def run_tiers(key, tiers, probe=None):
+    """便捷函数：按记忆的成功率依次尝试各层级
+
+    Args:
+        key: 站点标识
+        tiers: [(层级名称, 无参函数)] 列表
+        probe: 后台探测首选层级的无参函数，可选
+
+    Returns:
+        tuple: (成功的层级名称, 结果)
+    """
+    return fetch_strategy.run(key, tiers, probe)
+
+
+def resolve_cached(namespace, key, func):
+    """便捷函数：带缓存的反查"""
+    return fetch_strategy.resolve(namespace, key, func)
+
+
+def wait_for_probes(timeout=None):
+    """便捷函数：等待后台探测结束"""
+    fetch_strategy.wait_for_probes(timeout)
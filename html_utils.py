@@ -0,0 +1,166 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup
+
+from tracing import tracer
+
+# lxml 为可选依赖，未安装时回退到标准库 html.parser
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# ==========================================
+# HTML 解析工具模块
+# 功能：统一创建 BeautifulSoup 对象，默认使用 C 实现的 lxml 解析器，
+#       并支持按站点回退到 html.parser；统计本次运行的解析页数和耗时
+# ==========================================
+
+FAST_PARSER = "lxml"
+SAFE_PARSER = "html.parser"
+
+# 按站点（域名）指定解析器，用于 lxml 解析结果与 html.parser 不一致的站点
+# 例如：{"www.example.gov.cn": "html.parser"}
+SITE_PARSERS = {}
+
+# HTML 文档开头标记，用于区分完整页面和 datastore/record 等 XML 片段
+_DOCUMENT_PREFIXES = ("<!doctype", "<html")
+
+
+class HtmlUtils:
+    def __init__(self):
+        """初始化 HTML 解析工具
+
+        环境变量：
+            HTML_PARSER: 强制所有页面使用指定解析器（如 html.parser）
+            HTML_PARSER_FALLBACK_SITES: 逗号分隔的域名列表，这些站点回退到 html.parser
+        """
+        forced = os.environ.get("HTML_PARSER", "").strip()
+        if forced:
+            self.default_parser = forced
+        else:
+            self.default_parser = FAST_PARSER if LXML_AVAILABLE else SAFE_PARSER
+
+        self.site_parsers = dict(SITE_PARSERS)
+        for host in os.environ.get("HTML_PARSER_FALLBACK_SITES", "").split(","):
+            host = host.strip().lower()
+            if host:
+                self.site_parsers[host] = SAFE_PARSER
+
+        self._stats_lock = threading.Lock()
+        self.reset_parse_stats()
+
+    def reset_parse_stats(self):
+        """重置解析统计"""
+        self.parse_stats = {"pages": 0, "seconds": 0.0}
+
+    def get_parse_stats(self):
+        """返回解析统计
+
+        Returns:
+            dict: 解析页数 pages、总耗时 seconds、每页平均耗时 ms_per_page
+        """
+        with self._stats_lock:
+            stats = dict(self.parse_stats)
+        stats["ms_per_page"] = round(stats["seconds"] * 1000 / stats["pages"], 3) if stats["pages"] else None
+        return stats
+
+    def choose_parser(self, markup, url=None):
+        """为给定内容选择解析器
+
+        Args:
+            markup: 待解析的 HTML 内容（str 或 bytes）
+            url: 内容来源地址，用于按站点查找解析器
+
+        Returns:
+            str: BeautifulSoup 解析器名称
+        """
+        if url:
+            host = urlsplit(url).hostname or ""
+            site_parser = self.site_parsers.get(host.lower())
+            if site_parser:
+                return site_parser
+
+        if self.default_parser == SAFE_PARSER:
+            return SAFE_PARSER
+
+        # lxml 的 HTML 解析器会丢弃 CDATA 段，而 Hanweb 的 datastore/record 片段
+        # 依赖 record.string 读取 CDATA，因此非完整 HTML 文档的 CDATA 片段保持用 html.parser
+        if _is_cdata_fragment(markup):
+            return SAFE_PARSER
+
+        return self.default_parser
+
+    def make_soup(self, markup, url=None, parser=None):
+        """创建 BeautifulSoup 对象
+
+        Args:
+            markup: 待解析的 HTML 内容（str 或 bytes）
+            url: 内容来源地址，可选
+            parser: 显式指定的解析器，可选，优先级最高
+
+        Returns:
+            BeautifulSoup: 解析后的文档对象
+        """
+        if markup is None:
+            markup = ""
+        parser = parser or self.choose_parser(markup, url)
+        start = time.perf_counter()
+        with tracer.span("parse", "parse", parser=parser, bytes=len(markup), url=url or ""):
+            soup = BeautifulSoup(markup, parser)
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.parse_stats["pages"] += 1
+            self.parse_stats["seconds"] += elapsed
+        return soup
+
+
+def _is_cdata_fragment(markup):
+    """判断内容是否为包含 CDATA 的非完整 HTML 片段"""
+    if isinstance(markup, bytes):
+        if b"<![CDATA[" not in markup:
+            return False
+        head = markup[:256].lstrip().lower().decode("ascii", "ignore")
+    elif isinstance(markup, str):
+        if "<![CDATA[" not in markup:
+            return False
+        head = markup[:256].lstrip().lower()
+    else:
+        return False
+
+    # 去掉 BOM 后判断是否为完整 HTML 文档
+    head = head.lstrip("\ufeff")
+    return not head.startswith(_DOCUMENT_PREFIXES)
+
+
+# 创建全局实例
+html_utils = HtmlUtils()
+
+
+# 便捷函数
+def make_soup(markup, url=None, parser=None):
+    """便捷函数：创建 BeautifulSoup 对象
+
+    Args:
+        markup: 待解析的 HTML 内容（str 或 bytes）
+        url: 内容来源地址，用于按站点回退解析器
+        parser: 显式指定的解析器，可选
+
+    Returns:
+        BeautifulSoup: 解析后的文档对象
+    """
+    return html_utils.make_soup(markup, url, parser)
+
+
+def get_parse_stats():
+    """便捷函数：获取解析统计"""
+    return html_utils.get_parse_stats()
+
+
+def reset_parse_stats():
+    """便捷函数：重置解析统计"""
+    html_utils.reset_parse_stats()
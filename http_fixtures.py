@@ -0,0 +1,225 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from state_utils import get_state_path
+
+# ==========================================
+# HTTP 录制/回放模块
+# 功能：http_utils 发出的请求在录制模式下连同状态码、响应头、正文和耗时保存到本地归档
+#       （SQLite，正文 zlib 压缩），回放模式下按相同请求返回录制的响应，
+#       可按录制耗时或按比例缩放后的耗时等待，用于离线运行和基准测试全部爬虫
+# 用法：
+#       HTTP_FIXTURES=record python crawler_manager.py   # 录制
+#       HTTP_FIXTURES=replay HTTP_FIXTURES_LATENCY=1 CRAWLER_STORAGE=memory POLICY_API_PUSH=0 \
+#           python crawler_manager.py                    # 离线回放
+#       HTTP_FIXTURES=resume python crawler_manager.py   # 已录制的成功响应直接回放，其余实际请求并录制
+# ==========================================
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODE_RESUME = "resume"
+MODES = (MODE_RECORD, MODE_REPLAY, MODE_RESUME)
+
+DB_FILENAME = "http_fixtures.db"
+
+
+class FixtureMissing(requests.ConnectionError):
+    """回放模式下请求没有对应的录制"""
+
+
+def fixture_key(method, url, kwargs):
+    """按方法、完整地址（含查询参数）和请求体计算录制键
+
+    Returns:
+        tuple: (方法, 地址, 请求体哈希)
+    """
+    prepared = requests.Request(
+        method.upper(), url,
+        params=kwargs.get("params"), data=kwargs.get("data"), json=kwargs.get("json"),
+    ).prepare()
+    body = prepared.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return method.upper(), prepared.url, hashlib.sha1(body).hexdigest()
+
+
+class HttpFixtures:
+    def __init__(self, mode=None, path=None):
+        """初始化录制/回放
+
+        Args:
+            mode: record / replay / resume，默认读取环境变量 HTTP_FIXTURES，未设置时关闭
+            path: 归档路径，默认读取环境变量 HTTP_FIXTURES_PATH，未设置时使用状态目录下的 http_fixtures.db
+
+        环境变量：
+            HTTP_FIXTURES_LATENCY: 回放时耗时的缩放比例，0（默认）不等待，1 按录制耗时等待
+        """
+        mode = (mode if mode is not None else os.environ.get("HTTP_FIXTURES", "")).strip().lower()
+        if mode and mode not in MODES:
+            raise ValueError(f"不支持的 HTTP_FIXTURES 模式: {mode}，可选 {', '.join(MODES)}")
+        self.mode = mode or None
+        self.path = path or os.environ.get("HTTP_FIXTURES_PATH") or get_state_path(DB_FILENAME)
+        self.latency_scale = float(os.environ.get("HTTP_FIXTURES_LATENCY", 0))
+        self.stats = {"recorded": 0, "replayed": 0, "missing": 0}
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def get_connection(self):
+        """获取归档数据库连接"""
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fixtures (
+                    method TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    body_hash TEXT NOT NULL,
+                    status INTEGER,
+                    reason TEXT,
+                    headers TEXT,
+                    final_url TEXT,
+                    encoding TEXT,
+                    content BLOB,
+                    latency REAL,
+                    error TEXT,
+                    recorded_at TEXT,
+                    PRIMARY KEY (method, url, body_hash)
+                )
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def record(self, method, url, kwargs, latency, response=None, error=None):
+        """保存一次请求的响应（或异常），同一请求重复录制时保留最新一次"""
+        key = fixture_key(method, url, kwargs)
+        if response is not None:
+            row = (
+                response.status_code, response.reason, json.dumps(dict(response.headers), ensure_ascii=False),
+                response.url, response.encoding, zlib.compress(response.content or b""), latency, None,
+            )
+        else:
+            row = (None, None, None, None, None, None, latency, json.dumps([type(error).__name__, str(error)]))
+
+        with self._lock:
+            conn = self.get_connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO fixtures VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    key + row + (datetime.now().isoformat(timespec="seconds"),),
+                )
+            self.stats["recorded"] += 1
+
+    def replay(self, method, url, kwargs):
+        """返回录制的响应；录制的是异常时抛出同类异常
+
+        Raises:
+            FixtureMissing: 没有对应的录制
+        """
+        key = fixture_key(method, url, kwargs)
+        row = self._load(key)
+        if row is None:
+            raise FixtureMissing(f"没有录制的响应: {key[0]} {key[1]}")
+        return self._build_response(method, key, row)
+
+    def find_success(self, method, url, kwargs):
+        """resume 模式：返回录制的成功响应（状态码小于 400），没有录制或录制的是失败时返回 None"""
+        key = fixture_key(method, url, kwargs)
+        row = self._load(key, success_only=True)
+        return self._build_response(method, key, row) if row is not None else None
+
+    def _load(self, key, success_only=False):
+        query = ("SELECT status, reason, headers, final_url, encoding, content, latency, error "
+                 "FROM fixtures WHERE method = ? AND url = ? AND body_hash = ?")
+        if success_only:
+            query += " AND error IS NULL AND status < 400"
+        with self._lock:
+            row = self.get_connection().execute(query, key).fetchone()
+            self.stats["replayed" if row else "missing"] += 1
+        return row
+
+    def _build_response(self, method, key, row):
+        status, reason, headers, final_url, encoding, content, latency, error = row
+        if self.latency_scale > 0 and latency:
+            time.sleep(latency * self.latency_scale)
+
+        if error:
+            name, message = json.loads(error)
+            raise getattr(requests.exceptions, name, requests.RequestException)(message)
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(json.loads(headers or "{}"))
+        response._content = zlib.decompress(content) if content else b""
+        response.url = final_url or key[1]
+        response.encoding = encoding
+        response.elapsed = timedelta(seconds=latency or 0)
+        response.request = requests.Request(method.upper(), key[1]).prepare()
+        return response
+
+    def summary(self):
+        """按域名统计录制条数
+
+        Returns:
+            list: [(域名, 条数, 失败状态码条数, 平均耗时秒数)]
+        """
+        with self._lock:
+            rows = self.get_connection().execute("SELECT url, status, error, latency FROM fixtures").fetchall()
+        hosts = {}
+        for url, status, error, latency in rows:
+            host = urlparse(url).netloc
+            entry = hosts.setdefault(host, [0, 0, 0.0])
+            entry[0] += 1
+            entry[1] += 1 if error or (status or 0) >= 400 else 0
+            entry[2] += latency or 0.0
+        return sorted(
+            ((host, count, failed, total / count) for host, (count, failed, total) in hosts.items()),
+            key=lambda item: item[1], reverse=True,
+        )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# 创建全局实例
+http_fixtures = HttpFixtures()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP 录制归档")
+    parser.add_argument("--path", help="归档路径")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="按域名统计录制条数")
+    args = parser.parse_args()
+
+    fixtures = HttpFixtures(mode="", path=args.path) if args.path else http_fixtures
+    rows = fixtures.summary()
+    print(f"📼 归档: {fixtures.path}，共 {sum(row[1] for row in rows)} 条录制")
+    for host, count, failed, latency in rows:
+        print(f"   {host:<40}{count:>6} 条  失败 {failed:>4} 条  平均耗时 {latency * 1000:>8.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+import copy
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit
+
+import requests
+
+from circuit_breaker import circuit_breaker
+from http_fixtures import MODE_RECORD, MODE_REPLAY, MODE_RESUME, http_fixtures
+from run_context import get_current_crawler
+from tracing import tracer
+
+# ==========================================
+# HTTP 请求工具模块
+# 功能：所有爬虫共用的 HTTP 层，提供本次运行内的内存页面缓存：
+#       相同地址的并发/重复 GET 只请求一次（single-flight），LRU 淘汰控制内存，
+#       并统计每次运行的缓存命中率和实际网络请求的耗时分布；
+#       网络请求可录制到本地归档并离线回放（见 http_fixtures），
+#       也可整体转发到本地模拟站点（见 mock_gov_server）
+# ==========================================
+
+# 缓存总字节数上限，可通过环境变量 HTTP_CACHE_MAX_BYTES 覆盖
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# 单个响应超过该大小不缓存（如附件下载）
+MAX_ENTRY_BYTES = 8 * 1024 * 1024
+# 保留的网络请求耗时样本数
+LATENCY_SAMPLES = 10000
+# 转发到模拟站点时携带原始域名和协议的请求头
+ORIGINAL_HOST_HEADER = "X-Original-Host"
+ORIGINAL_SCHEME_HEADER = "X-Original-Scheme"
+
+
+def percentile(values, q):
+    """计算百分位数（最近秩法）
+
+    Args:
+        values: 数值列表
+        q: 百分位，0-100
+
+    Returns:
+        float: 百分位数，列表为空时返回 None
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _InFlight:
+    """正在进行中的请求，后到的相同请求等待其结果"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class HttpUtils:
+    def __init__(self):
+        """初始化 HTTP 工具
+
+        环境变量：
+            HTTP_CACHE: 设为 0 时关闭页面缓存
+            HTTP_CACHE_MAX_BYTES: 缓存总字节数上限
+            HTTP_TARGET_OVERRIDE: 把所有请求转发到该地址（如 http://127.0.0.1:8800），
+                原始域名放在 X-Original-Host 请求头中，用于本地模拟站点测试
+        """
+        self.cache_enabled = os.environ.get("HTTP_CACHE", "1") != "0"
+        self.max_bytes = int(os.environ.get("HTTP_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES))
+        self.target_override = os.environ.get("HTTP_TARGET_OVERRIDE", "").rstrip("/") or None
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._in_flight = {}
+        self._size = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        """重置本次运行的统计"""
+        self.stats = {"requests": 0, "hits": 0, "coalesced": 0, "misses": 0, "evictions": 0, "bypass": 0}
+        circuit_breaker.reset_stats()
+        # (爬虫名称, 耗时秒数)，只记录实际发出的网络请求
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        # 追踪开启时记录同一地址的请求次数，第 2 次起视为重试
+        self._attempts = {}
+
+    def _request(self, method, url, session=None, **kwargs):
+        """发出网络请求，经过按域名的熔断器（回放模式下不经过）
+
+        Args:
+            session: 可选，使用该 requests.Session 发出请求（保留会话的 Cookie 和请求头）
+
+        Raises:
+            CircuitOpen: 该域名熔断打开，请求未发出
+        """
+        host = urlsplit(url).hostname or ""
+        breaker = circuit_breaker.enabled and http_fixtures.mode != MODE_REPLAY
+        probe = circuit_breaker.before_request(host) if breaker else False
+        try:
+            response = self._traced_request(method, url, host, session, **kwargs)
+        except Exception as e:
+            if breaker:
+                circuit_breaker.after_request(host, probe, error=e)
+            raise
+        if breaker:
+            circuit_breaker.after_request(host, probe, response=response)
+        return response
+
+    def _traced_request(self, method, url, host, session=None, **kwargs):
+        """发出网络请求；开启追踪时记录为 http span（域名、状态码、字节数、重试次数）"""
+        if not tracer.enabled:
+            return self._timed_request(method, url, session, **kwargs)
+
+        key = (method, self._cache_key(url, kwargs.get("params")))
+        with self._lock:
+            attempt = self._attempts[key] = self._attempts.get(key, 0) + 1
+        with tracer.span(f"{method.upper()} {host}", "http", method=method.upper(), host=host, url=url,
+                         attempt=attempt, retries=attempt - 1) as span:
+            response = self._timed_request(method, url, session, **kwargs)
+            if kwargs.get("stream"):
+                # 流式响应不在这里读取内容，以 Content-Length 为准
+                size = int(response.headers.get("Content-Length") or 0)
+            else:
+                size = len(response.content or b"")
+            span.set(status=response.status_code, bytes=size)
+            return response
+
+    def _timed_request(self, method, url, session=None, **kwargs):
+        """发出网络请求并记录耗时（失败的请求同样计入）；录制/回放/断点恢复模式下经过 http_fixtures"""
+        start = time.perf_counter()
+        try:
+            if http_fixtures.mode == MODE_REPLAY:
+                return http_fixtures.replay(method, url, kwargs)
+            if http_fixtures.mode == MODE_RESUME:
+                # 已录制的成功响应直接回放，缺少或失败的请求实际发出并录制
+                response = http_fixtures.find_success(method, url, kwargs)
+                if response is not None:
+                    return response
+            elif http_fixtures.mode != MODE_RECORD:
+                return self._send(method, url, kwargs, session)
+
+            try:
+                response = self._send(method, url, kwargs, session)
+                response.content
+            except requests.RequestException as e:
+                http_fixtures.record(method, url, kwargs, time.perf_counter() - start, error=e)
+                raise
+            http_fixtures.record(method, url, kwargs, time.perf_counter() - start, response=response)
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.latencies.append((get_current_crawler(), elapsed))
+
+    def _send(self, method, url, kwargs, session=None):
+        """发出实际的网络请求；设置了 HTTP_TARGET_OVERRIDE 时转发到模拟站点"""
+        sender = session or requests
+        if not self.target_override:
+            return getattr(sender, method)(url, **kwargs)
+
+        parts = urlsplit(url)
+        target = self.target_override + (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        headers = dict(kwargs.get("headers") or {})
+        headers[ORIGINAL_HOST_HEADER] = parts.netloc
+        headers[ORIGINAL_SCHEME_HEADER] = parts.scheme
+        response = getattr(sender, method)(target, **dict(kwargs, headers=headers))
+        # 爬虫用 response.url 拼接相对链接，还原为原始地址
+        if response.url.startswith(self.target_override):
+            response.url = requests.Request(method.upper(), url, params=kwargs.get("params")).prepare().url
+        return response
+
+    def clear(self, keep=None, max_age=None):
+        """清空缓存和统计，开始新的一次运行
+
+        Args:
+            keep: 可选，判断缓存键是否保留的函数；常驻轮询时保留已抓取过的详情页，
+                避免列表变化后重复抓取未变化条目的详情
+            max_age: 保留条目的最长存活秒数，超过后仍然清除
+        """
+        with self._lock:
+            if keep is None:
+                self._cache.clear()
+                self._size = 0
+            else:
+                now = time.monotonic()
+                for key, (_, size, stored_at) in list(self._cache.items()):
+                    if not keep(key) or (max_age is not None and now - stored_at > max_age):
+                        del self._cache[key]
+                        self._size -= size
+            self.reset_stats()
+
+    def _cache_key(self, url, params):
+        if params:
+            return requests.Request("GET", url, params=params).prepare().url
+        return url
+
+    def _store(self, key, response):
+        size = len(response.content or b"")
+        if response.status_code >= 400 or size > MAX_ENTRY_BYTES:
+            return
+        self._cache[key] = (response, size, time.monotonic())
+        self._size += size
+        while self._size > self.max_bytes and self._cache:
+            _, (_, evicted_size, _) = self._cache.popitem(last=False)
+            self._size -= evicted_size
+            self.stats["evictions"] += 1
+
+    def get(self, url, params=None, session=None, **kwargs):
+        """发送 GET 请求，相同地址在本次运行内只请求一次
+
+        Args:
+            url: 请求地址
+            params: 查询参数，参与缓存键
+            session: 可选，需要保持 Cookie 的爬虫传入自己的 requests.Session，此时不缓存
+            **kwargs: 传给 requests.get 的其他参数；stream=True 时不缓存
+
+        Returns:
+            requests.Response: 响应对象（缓存命中时为浅拷贝，可独立修改 encoding）
+        """
+        # 带会话的请求（如先访问首页获取 Cookie）依赖会话状态，不缓存
+        if not self.cache_enabled or kwargs.get("stream") or session is not None:
+            with self._lock:
+                self.stats["bypass"] += 1
+            return self._request("get", url, session, params=params, **kwargs)
+
+        key = self._cache_key(url, params)
+        with self._lock:
+            self.stats["requests"] += 1
+            cached = self._cache.get(key)
+            if cached:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return copy.copy(cached[0])
+
+            flight = self._in_flight.get(key)
+            owner = flight is None
+            if owner:
+                flight = _InFlight()
+                self._in_flight[key] = flight
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not owner:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.copy(flight.response)
+
+        try:
+            response = self._request("get", url, session, params=params, **kwargs)
+            # 读取内容，确保缓存的响应不依赖连接
+            response.content
+            flight.response = response
+            with self._lock:
+                self._store(key, response)
+            return copy.copy(response)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.event.set()
+
+    def post(self, url, session=None, **kwargs):
+        """发送 POST 请求（不缓存）"""
+        return self._request("post", url, session, **kwargs)
+
+    def conditional_get(self, url, etag=None, last_modified=None, **kwargs):
+        """带 If-None-Match / If-Modified-Since 的 GET 请求（不缓存），页面未变化时站点返回 304
+
+        Args:
+            url: 请求地址
+            etag: 上次响应的 ETag
+            last_modified: 上次响应的 Last-Modified
+            **kwargs: 传给 requests.get 的其他参数
+
+        Returns:
+            requests.Response: 响应对象
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return self._request("get", url, headers=headers, **kwargs)
+
+    def get_stats(self):
+        """返回本次运行的缓存统计
+
+        Returns:
+            dict: 请求数、命中数、合并数、未命中数、淘汰数、命中率、缓存字节数，
+                  网络请求数 fetches 和耗时 p50_ms / p95_ms，
+                  以及熔断快速失败次数 short_circuited、熔断打开次数 opened、探测次数 probes
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._cache)
+            stats["bytes"] = self._size
+            samples = [elapsed for _, elapsed in self.latencies]
+        served = stats["hits"] + stats["coalesced"]
+        stats["hit_rate"] = round(served / stats["requests"], 4) if stats["requests"] else 0.0
+        stats["fetches"] = len(samples)
+        stats.update(circuit_breaker.stats)
+        for q in (50, 95):
+            value = percentile(samples, q)
+            stats[f"p{q}_ms"] = round(value * 1000, 1) if value is not None else None
+        return stats
+
+    def get_latencies(self, crawler=None):
+        """返回本次运行的网络请求耗时样本（秒）
+
+        Args:
+            crawler: 只返回该爬虫发出的请求，默认全部
+        """
+        with self._lock:
+            return [elapsed for name, elapsed in self.latencies if crawler is None or name == crawler]
+
+
+# 创建全局实例
+http_utils = HttpUtils()
+
+
+# 便捷函数
+def http_get(url, params=None, session=None, **kwargs):
+    """便捷函数：带运行内缓存的 GET 请求
+
+    Args:
+        url: 请求地址
+        params: 查询参数
+        session: 可选，使用该 requests.Session 发出请求
+        **kwargs: 传给 requests.get 的其他参数
+
+    Returns:
+        requests.Response: 响应对象
+    """
+    return http_utils.get(url, params=params, session=session, **kwargs)
+
+
+def http_post(url, session=None, **kwargs):
+    """便捷函数：POST 请求"""
+    return http_utils.post(url, session=session, **kwargs)
+
+
+def get_cache_stats():
+    """便捷函数：获取本次运行的缓存统计"""
+    return http_utils.get_stats()
+
+
+def reset_cache(keep=None, max_age=None):
+    """便捷函数：清空缓存，开始新的一次运行（keep / max_age 见 HttpUtils.clear）"""
+    http_utils.clear(keep, max_age)
@@ -0,0 +1,487 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from http_utils import ORIGINAL_HOST_HEADER
+
+# ==========================================
+# 本地模拟政府网站
+# 功能：按爬虫实际访问的地址形态返回合成页面（Hanweb 栏目页和 dataproxy.jsp、
+#       jpaas build/unit、gov.cn data.json、TRS was5 检索、r.jina.ai Markdown、
+#       普通列表页和详情页），列表中固定有若干条昨日（北京时间）的数据，覆盖详情抓取和入库；
+#       可配置延迟分布、错误/连接中断/WAF（412、451）注入、按域名限流和并发上限，
+#       用于在不访问真实站点的情况下测试并发、重试退避和 WAF 处理
+# 用法：
+#       python mock_gov_server.py --port 8800 --latency lognormal:80:0.6 --error-rate 0.05
+#       HTTP_TARGET_OVERRIDE=http://127.0.0.1:8800 python crawler_manager.py
+# ==========================================
+
+DEFAULT_ITEMS = 20
+DEFAULT_TARGET_ITEMS = 3
+READER_HOST = "r.jina.ai"
+
+# 管理接口（不参与故障注入和统计）
+ADMIN_PREFIX = "/__mock__/"
+
+SUBJECTS = [
+    "医疗机构", "基层卫生", "公共卫生应急", "药品集中采购", "中小企业数字化", "安全生产",
+    "农村人居环境", "国有资产监管", "科技成果转化", "食品安全", "知识产权保护", "市场主体登记",
+]
+TOPICS = [
+    "关于印发《{}管理办法》的通知", "关于进一步加强{}工作的指导意见", "{}专项行动实施方案",
+    "关于做好{}有关工作的通知", "{}规范（试行）", "关于公布{}名单的公告",
+]
+PARAGRAPHS = [
+    "为深入贯彻落实党中央、国务院决策部署，进一步提升{}水平，现就有关事项通知如下。",
+    "一、总体要求。坚持以人民为中心的发展思想，统筹发展和安全，聚焦{}中的突出问题，完善制度机制。",
+    "二、重点任务。各地要结合实际，细化{}工作措施，明确责任分工和时间节点，确保各项任务落地见效。",
+    "三、保障措施。加强组织领导，强化{}经费保障和监督检查，及时总结推广典型经验做法。",
+]
+
+# 详情页地址形态：Hanweb /art/、gov.cn content_、TRS t20261017_123.html
+DETAIL_PATTERN = re.compile(r"/art/|content_\d+|/t\d{8}_\d+|/\d{6}/[0-9a-f]+\.s?html?$")
+LIST_BASENAMES = ("index", "list", "default")
+
+
+def parse_latency(spec):
+    """解析延迟分布配置，返回毫秒数采样函数
+
+    Args:
+        spec: 0 / fixed:毫秒 / uniform:下限:上限 / lognormal:中位数:sigma / exponential:均值
+
+    Returns:
+        callable: rng -> 毫秒数
+    """
+    spec = (spec or "0").strip()
+    name, _, rest = spec.partition(":")
+    args = [float(x) for x in rest.split(":")] if rest else []
+    if name in ("0", "none"):
+        return lambda rng: 0.0
+    if name == "fixed":
+        return lambda rng: args[0]
+    if name == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1])
+    if name == "lognormal":
+        median, sigma = args
+        return lambda rng: median * rng.lognormvariate(0, sigma)
+    if name == "exponential":
+        return lambda rng: rng.expovariate(1 / args[0])
+    raise ValueError(f"不支持的延迟分布: {spec}，可选 fixed / uniform / lognormal / exponential")
+
+
+class _HostState:
+    """单个域名的限流、并发和统计状态"""
+
+    def __init__(self, max_concurrency):
+        self.semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.window_start = 0.0
+        self.window_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        self.statuses = Counter()
+
+
+class MockGovServer:
+    def __init__(self, host="127.0.0.1", port=0, latency="0", error_rate=0.0, reset_rate=0.0,
+                 waf_rate=0.0, waf_hosts=(), rate_limit=0.0, max_concurrency=0,
+                 items=DEFAULT_ITEMS, target_items=DEFAULT_TARGET_ITEMS, seed=None):
+        """初始化模拟站点
+
+        Args:
+            host: 监听地址
+            port: 监听端口，0 表示随机空闲端口
+            latency: 延迟分布，见 parse_latency
+            error_rate: 返回 500/502/503 的比例
+            reset_rate: 不返回响应直接断开连接的比例
+            waf_rate: 触发 WAF 的比例（r.jina.ai 返回 451，其他站点返回 412）
+            waf_hosts: 始终触发 WAF 的域名
+            rate_limit: 每个域名每秒允许的请求数，超出返回 429，0 表示不限
+            max_concurrency: 每个域名同时处理的请求数上限，超出的请求排队，0 表示不限
+            items: 每个列表页的条数
+            target_items: 列表中发布日期为昨日的条数
+            seed: 随机种子，用于复现故障注入
+        """
+        self.address = (host, port)
+        self.latency = parse_latency(latency)
+        self.latency_spec = latency
+        self.error_rate = error_rate
+        self.reset_rate = reset_rate
+        self.waf_rate = waf_rate
+        self.waf_hosts = {h.strip().lower() for h in waf_hosts if h.strip()}
+        self.rate_limit = rate_limit
+        self.max_concurrency = max_concurrency
+        self.items = items
+        self.target_items = target_items
+        self.rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """在后台线程中启动服务
+
+        Returns:
+            str: 服务地址，可直接作为 HTTP_TARGET_OVERRIDE
+        """
+        server = ThreadingHTTPServer(self.address, _MockHandler)
+        server.daemon_threads = True
+        # 10 倍数据源并发时默认的监听队列（5）不够
+        server.request_queue_size = 1024
+        server.mock = self
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="mock-gov-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _random(self):
+        with self._rng_lock:
+            return self.rng.random()
+
+    def _sample_latency(self):
+        with self._rng_lock:
+            return max(0.0, self.latency(self.rng)) / 1000
+
+    def _host_state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.max_concurrency)
+            return state
+
+    def _rate_limited(self, state):
+        """固定一秒窗口计数，超出 rate_limit 时限流"""
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - state.window_start >= 1.0:
+                state.window_start, state.window_count = now, 0
+            state.window_count += 1
+            return state.window_count > self.rate_limit
+
+    def stats(self):
+        """返回各域名的请求数、状态码分布和最大并发
+
+        Returns:
+            dict: {'requests', 'statuses', 'hosts': {域名: {...}}}
+        """
+        with self._lock:
+            hosts = {
+                host: {
+                    "requests": state.requests,
+                    "statuses": dict(state.statuses),
+                    "max_in_flight": state.max_in_flight,
+                }
+                for host, state in self._hosts.items()
+            }
+        statuses = Counter()
+        for entry in hosts.values():
+            statuses.update(entry["statuses"])
+        return {
+            "requests": sum(entry["requests"] for entry in hosts.values()),
+            "statuses": dict(statuses),
+            "max_in_flight": max((entry["max_in_flight"] for entry in hosts.values()), default=0),
+            "hosts": hosts,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self._hosts = {}
+
+    def handle(self, handler, method):
+        """处理一次请求：注入故障、按地址形态生成页面"""
+        host = (handler.headers.get(ORIGINAL_HOST_HEADER) or handler.headers.get("Host") or "").lower()
+        path = handler.path
+        # r.jina.ai 的地址是 /http://目标地址，按 Reader 处理
+        if host == READER_HOST or path.startswith(("/http://", "/https://")):
+            host = READER_HOST
+
+        state = self._host_state(host)
+        if state.semaphore:
+            state.semaphore.acquire()
+        with self._lock:
+            state.requests += 1
+            state.in_flight += 1
+            state.max_in_flight = max(state.max_in_flight, state.in_flight)
+        try:
+            status, content_type, body = self._respond(host, path, method, state)
+            if status is None:
+                with self._lock:
+                    state.statuses["reset"] += 1
+                # 直接关闭连接，客户端收到 ConnectionError
+                handler.close_connection = True
+                handler.connection.shutdown(socket.SHUT_RDWR)
+                return
+            with self._lock:
+                state.statuses[str(status)] += 1
+            payload = body.encode("utf-8")
+            handler.send_response(status)
+            handler.send_header("Content-Type", content_type)
+            handler.send_header("Content-Length", str(len(payload)))
+            if status == 429:
+                handler.send_header("Retry-After", "1")
+            handler.end_headers()
+            handler.wfile.write(payload)
+        finally:
+            with self._lock:
+                state.in_flight -= 1
+            if state.semaphore:
+                state.semaphore.release()
+
+    def _respond(self, host, path, method, state):
+        """返回 (状态码, Content-Type, 正文)，状态码为 None 表示断开连接"""
+        delay = self._sample_latency()
+        if delay:
+            time.sleep(delay)
+
+        if self._rate_limited(state):
+            return 429, "text/html; charset=utf-8", "<html><body>Too Many Requests</body></html>"
+        if host in self.waf_hosts or self._random() < self.waf_rate:
+            if host == READER_HOST:
+                return 451, "application/json", json.dumps({"code": 451, "message": "Unavailable For Legal Reasons"})
+            return 412, "text/html; charset=utf-8", "<html><body><script>/* WAF challenge */</script></body></html>"
+        roll = self._random()
+        if roll < self.reset_rate:
+            return None, None, None
+        if roll < self.reset_rate + self.error_rate:
+            status = (500, 502, 503)[int(roll * 1000) % 3]
+            return status, "text/html; charset=utf-8", f"<html><body><h1>{status}</h1></body></html>"
+
+        return 200, *render_page(host, path, self.items, self.target_items)
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith(ADMIN_PREFIX):
+            return self._admin()
+        self.server.mock.handle(self, "GET")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.server.mock.handle(self, "POST")
+
+    def _admin(self):
+        mock = self.server.mock
+        if self.path.startswith(ADMIN_PREFIX + "reset"):
+            mock.reset_stats()
+        payload = json.dumps(mock.stats(), ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+# ==========================================
+# 页面生成：同一地址每次返回相同内容（按地址哈希播种），
+# 列表前 target_items 条为昨日数据，其余按天递减
+# ==========================================
+
+def _rng_for(host, path):
+    return random.Random(hashlib.md5(f"{host}{path}".encode("utf-8")).hexdigest())
+
+
+def _list_items(host, path, count, target_items):
+    rng = _rng_for(host, path)
+    yesterday = datetime.now(timezone(timedelta(hours=8))).date() - timedelta(days=1)
+    column = rng.randrange(1000, 99999)
+    items = []
+    for i in range(count):
+        day = yesterday if i < target_items else yesterday - timedelta(days=1 + (i - target_items) // 2)
+        subject = rng.choice(SUBJECTS)
+        items.append({
+            "title": rng.choice(TOPICS).format(subject),
+            "date": day,
+            "path": f"/art/{day.year}/{day.month}/{day.day}/art_{column}_{rng.randrange(10**6, 10**7)}.html",
+            "subject": subject,
+        })
+    return items
+
+
+def _nav():
+    # 部分爬虫按位置取第 N 个 <ul>，导航中保留多个列表
+    blocks = []
+    for group in (("首页", "机构概况"), ("政务公开", "政策文件"), ("互动交流", "办事服务"),
+                  ("专题专栏", "数据发布"), ("新闻动态", "通知公告"), ("人事信息", "联系我们")):
+        blocks.append("<ul>" + "".join(f'<li><a href="/col/nav{i}/index.html">{t}</a></li>' for i, t in enumerate(group)) + "</ul>")
+    return "\n".join(blocks)
+
+
+def _li(item):
+    return (f'<li><a href="{item["path"]}" target="_blank" title="{item["title"]}">{item["title"]}</a>'
+            f'<span>{item["date"]:%Y-%m-%d}</span></li>')
+
+
+def _html(title, body):
+    return (f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{title}</title></head>\n'
+            f'<body>\n<div class="header">{_nav()}</div>\n{body}\n'
+            f'<div class="footer">主办单位：模拟站点</div>\n</body></html>\n')
+
+
+def _datastore(items):
+    records = "\n".join(f"<record><![CDATA[\n{_li(item)}\n]]></record>" for item in items)
+    return (f'<datastore>\n<nextgroup><![CDATA[<a href="/module/web/jpage/dataproxy.jsp?page=1"></a>]]></nextgroup>\n'
+            f'<recordset>\n{records}\n</recordset>\n</datastore>')
+
+
+def render_page(host, path, items=DEFAULT_ITEMS, target_items=DEFAULT_TARGET_ITEMS):
+    """按地址形态生成页面
+
+    Returns:
+        tuple: (Content-Type, 正文)
+    """
+    parts = urlsplit(path)
+    route = parts.path
+    html_type = "text/html; charset=utf-8"
+
+    if host == READER_HOST:
+        target = path.lstrip("/")
+        lines = ["Title: 模拟列表", "", f"URL Source: {target}", "", "Markdown Content:", ""]
+        # Reader 地址可能多层嵌套（/http://r.jina.ai/http://https://站点/...），取最内层的站点域名
+        origins = [h for h in re.findall(r"https?://([^/]+)", target) if h != READER_HOST]
+        origin_host = origins[-1] if origins else "www.example.gov.cn"
+        for item in _list_items(host, path, items, target_items):
+            lines.append(f"*   [{item['title']}](http://{origin_host}{item['path']}){item['date']:%Y-%m-%d}")
+        return "text/plain; charset=utf-8", "\n".join(lines) + "\n"
+
+    list_items = _list_items(host, route, items, target_items)
+
+    if route.endswith("dataproxy.jsp"):
+        return "text/xml; charset=utf-8", _datastore(list_items)
+
+    if route.endswith("/build/unit"):
+        html = "<ul>" + "".join(_li(item) for item in list_items) + "</ul>"
+        return "application/json; charset=utf-8", json.dumps({"success": True, "data": {"html": html}}, ensure_ascii=False)
+
+    if route.endswith(".json"):
+        data = [{"TITLE": item["title"], "URL": item["path"], "DOCRELPUBTIME": f"{item['date']:%Y-%m-%d}"}
+                for item in list_items]
+        return "application/json; charset=utf-8", json.dumps(data, ensure_ascii=False)
+
+    if "/was5/web/search" in route:
+        query = parse_qs(parts.query)
+        rows = "\n".join(
+            f'<tr><td><a href="{item["path"]}" title="{item["title"]}">{item["title"]}</a></td>'
+            f'<td>{item["date"]:%Y-%m-%d}</td></tr>' for item in list_items
+        )
+        body = (f'<div class="search-result" data-channel="{query.get("channelid", [""])[0]}">'
+                f'<ul class="list">{"".join(_li(item) for item in list_items)}</ul>'
+                f'<table class="result">{rows}</table></div>')
+        return html_type, _html("检索结果", body)
+
+    basename = route.rsplit("/", 1)[-1]
+    if DETAIL_PATTERN.search(route) and not basename.startswith(LIST_BASENAMES):
+        rng = _rng_for(host, route)
+        subject = rng.choice(SUBJECTS)
+        paragraphs = "\n".join(
+            f'<p style="text-indent:2em;">{rng.choice(PARAGRAPHS).format(subject)}</p>' for _ in range(12)
+        )
+        title = rng.choice(TOPICS).format(subject)
+        body = (f'<div class="main"><div class="main-title">{title}</div>'
+                f'<div class="main-word"><span>来源：模拟站点</span></div>\n'
+                f'<div class="main-txt"><div class="TRS_Editor"><div id="zoom" class="content">\n{paragraphs}\n'
+                f'</div></div></div></div>')
+        return html_type, _html(title, body)
+
+    # Hanweb 栏目页：datastore 放在 <script type="text/xml"> 中，同时输出普通列表
+    body = (f'<div aria-label="正文区,综合政务" class="list">\n<script type="text/xml">{_datastore(list_items)}</script>\n</div>\n'
+            f'<ul class="zxxx_list list">\n' + "\n".join(_li(item) for item in list_items) + "\n</ul>")
+    return html_type, _html("模拟栏目", body)
+
+
+# 便捷函数
+def start_mock_server(**options):
+    """便捷函数：启动模拟站点
+
+    Returns:
+        MockGovServer: 已启动的服务，地址见 base_url
+    """
+    server = MockGovServer(**options)
+    server.start()
+    return server
+
+
+def add_arguments(parser):
+    """把模拟站点的配置参数加入命令行解析器（基准测试脚本共用）"""
+    parser.add_argument("--latency", default="0", help="延迟分布：fixed:50 / uniform:20:200 / lognormal:80:0.6 / exponential:100")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 5xx 的比例")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="断开连接的比例")
+    parser.add_argument("--waf-rate", type=float, default=0.0, help="返回 412/451 的比例")
+    parser.add_argument("--waf-hosts", default="", help="始终返回 412/451 的域名，逗号分隔")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="每个域名每秒请求数上限，超出返回 429")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="每个域名同时处理的请求数上限")
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS, help="每个列表页的条数")
+    parser.add_argument("--target-items", type=int, default=DEFAULT_TARGET_ITEMS, help="列表中昨日数据的条数")
+    parser.add_argument("--seed", type=int, help="随机种子")
+
+
+def options_from_args(args):
+    return {
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "reset_rate": args.reset_rate,
+        "waf_rate": args.waf_rate,
+        "waf_hosts": args.waf_hosts.split(","),
+        "rate_limit": args.rate_limit,
+        "max_concurrency": args.max_concurrency,
+        "items": args.items,
+        "target_items": args.target_items,
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟政府网站")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8800, help="监听端口")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockGovServer(host=args.host, port=args.port, **options_from_args(args))
+    base_url = server.start()
+    print(f"🧪 模拟站点已启动: {base_url}，延迟 {args.latency}，错误率 {args.error_rate}，WAF {args.waf_rate}")
+    print(f"   HTTP_TARGET_OVERRIDE={base_url} python crawler_manager.py")
+    print(f"   统计: {base_url}{ADMIN_PREFIX}stats，清零: {base_url}{ADMIN_PREFIX}reset")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stats = server.stats()
+        print(f"\n📊 共 {stats['requests']} 次请求，状态码 {stats['statuses']}")
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+import hashlib
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from http_utils import http_utils
+from run_context import set_include_today
+from state_utils import load_json, save_json
+
+# ==========================================
+# 常驻轮询模块
+# 功能：在 CrawlerManager 外层常驻运行，每个数据源按自己的间隔轮询：
+#       先对列表探测地址做条件请求（ETag / Last-Modified）并比较内容哈希，
+#       列表没有变化时跳过该爬虫；有变化时只执行这些爬虫，
+#       已抓取过的详情页在运行之间保留缓存，不再重复请求。
+#       列表探测地址由爬虫模块的 LIST_PROBE_URL 提供（即实际请求的列表页或接口地址），
+#       未提供时（POST 接口、需要会话的接口、TARGET_URL 只是脚本外壳等）每轮照常执行；
+#       连续多轮跳过后强制执行一次，避免探测地址漏报变化。
+#       常驻轮询时目标日期包含当天，当天发布的数据当天入库。
+#       各数据源的轮询时刻按名称错开，均匀分布在间隔内；调度状态持久化，重启后继续
+# 用法：
+#       python crawler_manager.py --daemon                      # 默认每个数据源每小时一次
+#       POLL_INTERVALS="国务院文件=900,教育部文件=7200" python crawler_manager.py --daemon
+# ==========================================
+
+STATE_FILE = "poll_schedule.json"
+
+DEFAULT_INTERVAL = 3600
+# 列表连续未变化时，每隔多少轮强制执行一次
+DEFAULT_FORCE_EVERY = 6
+MIN_INTERVAL = 60
+# 调度循环最长休眠秒数，便于及时响应退出信号和间隔调整
+MAX_SLEEP = 60
+# 详情页缓存在运行之间最长保留的秒数
+DEFAULT_DETAIL_TTL = 86400
+LIST_TIMEOUT = 15
+
+LIST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+def parse_intervals(text):
+    """解析按数据源设置的轮询间隔
+
+    Args:
+        text: 逗号分隔的 名称=秒数，如 "国务院文件=900,教育部文件=7200"
+
+    Returns:
+        dict: {数据源名称: 秒数}
+    """
+    intervals = {}
+    for part in (text or "").split(","):
+        if not part.strip():
+            continue
+        name, sep, seconds = part.rpartition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"轮询间隔格式错误: {part}，应为 名称=秒数")
+        intervals[name.strip()] = int(seconds)
+    return intervals
+
+
+def _embedded_url(key):
+    """Reader 等代理地址中嵌入的原始地址，如 https://r.jina.ai/https://www.gov.cn/... """
+    index = key.find("http", 1)
+    return key[index:] if index > 0 else None
+
+
+class PollDaemon:
+    def __init__(self, manager, interval=None, intervals=None, detail_ttl=None, force_every=None):
+        """初始化常驻轮询
+
+        Args:
+            manager: 已注册爬虫的 CrawlerManager
+            interval: 默认轮询间隔（秒），默认读取环境变量 POLL_INTERVAL
+            intervals: {数据源名称: 秒数}，默认读取环境变量 POLL_INTERVALS
+            force_every: 列表未变化时每隔多少轮强制执行一次，默认读取环境变量 POLL_FORCE_EVERY
+
+        环境变量：
+            POLL_INTERVAL: 默认轮询间隔秒数，默认 3600
+            POLL_INTERVALS: 按数据源设置的间隔，格式 名称=秒数,名称=秒数
+            POLL_DETAIL_TTL: 详情页缓存在运行之间保留的秒数，默认 86400
+            POLL_FORCE_EVERY: 列表未变化时每隔多少轮强制执行一次，默认 6
+        """
+        self.manager = manager
+        self.interval = max(MIN_INTERVAL, int(interval or os.environ.get("POLL_INTERVAL", DEFAULT_INTERVAL)))
+        self.intervals = intervals if intervals is not None else parse_intervals(os.environ.get("POLL_INTERVALS"))
+        self.detail_ttl = float(detail_ttl or os.environ.get("POLL_DETAIL_TTL", DEFAULT_DETAIL_TTL))
+        self.force_every = max(1, int(force_every or os.environ.get("POLL_FORCE_EVERY", DEFAULT_FORCE_EVERY)))
+        self.state = load_json(STATE_FILE, {}) or {}
+        # 已入库条目的地址 → 最近一次出现的时间，用于决定保留哪些详情页缓存
+        self.known_urls = {}
+        self._stop = threading.Event()
+
+        # 每轮只执行部分爬虫：不推送每日状态、不记录运行断点，只在有写入或失败时通知；运行之间保留详情页缓存
+        manager.daily_report = False
+        manager.checkpoint = False
+        manager.keep_cached = (self._keep_cached, self.detail_ttl)
+        # 按间隔轮询时前一天的数据早已入库，目标日期加上当天
+        set_include_today(True)
+
+    def interval_for(self, name):
+        """数据源的轮询间隔（复制出的压测数据源 名称#N 按原名称匹配）"""
+        interval = self.intervals.get(name) or self.intervals.get(name.split("#", 1)[0]) or self.interval
+        return max(MIN_INTERVAL, int(interval))
+
+    def probe_url(self, name):
+        """数据源的列表探测地址（复制出的压测数据源 名称#N 按原名称匹配），没有时返回 None"""
+        probes = self.manager.list_probes
+        return probes.get(name) or probes.get(name.split("#", 1)[0])
+
+    def next_slot(self, name, now):
+        """下一次轮询时刻
+
+        每个数据源的轮询时刻固定为「间隔的整数倍 + 按名称哈希得到的偏移」，
+        各数据源均匀错开，重启后时刻不变
+        """
+        interval = self.interval_for(name)
+        phase = int(hashlib.md5(name.encode("utf-8")).hexdigest()[:8], 16) % interval
+        slot = now - (now - phase) % interval
+        return slot + interval if slot <= now else slot
+
+    def _entry(self, name):
+        entry = self.state.get(name)
+        if entry is None:
+            entry = self.state[name] = {"next_at": self.next_slot(name, time.time())}
+        return entry
+
+    def due(self, now):
+        """返回已到轮询时刻的爬虫"""
+        return [crawler for crawler in self.manager.crawlers if self._entry(crawler[0])["next_at"] <= now]
+
+    def check_list(self, name, probe_url):
+        """条件请求列表探测地址，判断是否需要执行爬虫
+
+        Args:
+            name: 数据源名称
+            probe_url: 列表探测地址（模块的 LIST_PROBE_URL）
+
+        Returns:
+            tuple: (是否需要执行, 列表指纹 {'etag', 'last_modified', 'hash'} 或 None)；
+                   没有探测地址或请求失败时照常执行
+        """
+        entry = self._entry(name)
+        if not probe_url:
+            return True, None
+        try:
+            response = http_utils.conditional_get(probe_url, entry.get("etag"), entry.get("last_modified"),
+                                                  headers=LIST_HEADERS, timeout=LIST_TIMEOUT)
+        except requests.RequestException as e:
+            print(f"⚠️  {name}：列表页检查失败，照常执行 - {e}")
+            return True, None
+
+        if response.status_code == 304:
+            return False, None
+        if response.status_code >= 400:
+            return True, None
+
+        fingerprint = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "hash": hashlib.sha1(response.content or b"").hexdigest(),
+        }
+        return fingerprint["hash"] != entry.get("hash"), fingerprint
+
+    def poll(self, crawlers):
+        """检查到期爬虫的列表，只执行列表有变化（或连续多轮未执行）的爬虫
+
+        Returns:
+            list: 本轮执行的爬虫名称
+        """
+        fingerprints = {}
+        forced = 0
+        for name, _, _ in crawlers:
+            if self._stop.is_set():
+                break
+            entry = self._entry(name)
+            changed, fingerprint = self.check_list(name, self.probe_url(name))
+            if not changed and entry.get("unchanged", 0) + 1 >= self.force_every:
+                # 连续多轮未变化时强制执行一次，探测地址漏报变化时也能补上
+                changed = True
+                forced += 1
+            entry["checked_at"] = datetime.now().isoformat(timespec="seconds")
+            entry["next_at"] = self.next_slot(name, time.time())
+            if changed:
+                fingerprints[name] = fingerprint
+            else:
+                entry["unchanged"] = entry.get("unchanged", 0) + 1
+                # 列表内容相同但响应头更新时记录新的 ETag
+                if fingerprint:
+                    entry.update(etag=fingerprint["etag"], last_modified=fingerprint["last_modified"])
+
+        print(f"🔄 {datetime.now().strftime('%H:%M:%S')} 轮询 {len(crawlers)} 个数据源，"
+              f"{len(fingerprints) - forced} 个列表有变化，{forced} 个强制执行")
+        if fingerprints:
+            results = self.manager.run_all_crawlers(set(fingerprints))
+            self._remember(self.manager.run_records)
+            for name, fingerprint in fingerprints.items():
+                entry = self._entry(name)
+                result = results.get(name, {})
+                entry["last_run"] = result.get("timestamp")
+                entry["last_status"] = result.get("status")
+                entry["unchanged"] = 0
+                # 执行成功才记录列表指纹；失败时清除，下一轮无论列表是否变化都重新执行
+                if result.get("status") == "success":
+                    if fingerprint:
+                        entry.update(fingerprint)
+                else:
+                    for key in ("etag", "last_modified", "hash"):
+                        entry.pop(key, None)
+        self.save()
+        return list(fingerprints)
+
+    def _remember(self, records):
+        now = time.monotonic()
+        for record in records:
+            url = record.get("url") if isinstance(record, dict) else None
+            if url:
+                self.known_urls[url] = now
+        expired = [url for url, seen in self.known_urls.items() if now - seen > self.detail_ttl]
+        for url in expired:
+            del self.known_urls[url]
+
+    def _keep_cached(self, key):
+        """页面缓存中已入库条目的详情页在运行之间保留，列表页每次重新请求"""
+        return key in self.known_urls or _embedded_url(key) in self.known_urls
+
+    def save(self):
+        save_json(STATE_FILE, self.state)
+
+    def stop(self):
+        """请求退出：当前一轮执行完成后退出"""
+        self._stop.set()
+
+    def _sleep_seconds(self):
+        now = time.time()
+        upcoming = min((self._entry(name)["next_at"] for name, _, _ in self.manager.crawlers), default=now + MAX_SLEEP)
+        return min(MAX_SLEEP, max(1.0, upcoming - now))
+
+    def _install_signal_handlers(self):
+        def handle(signum, frame):
+            if self._stop.is_set():
+                # 第二次信号立即中断
+                raise KeyboardInterrupt
+            print(f"\n🛑 收到退出信号 {signal.Signals(signum).name}，当前一轮完成后退出（再次发送立即中断）")
+            self._stop.set()
+
+        try:
+            signal.signal(signal.SIGINT, handle)
+            signal.signal(signal.SIGTERM, handle)
+        except ValueError:
+            # 非主线程中无法设置信号处理，由调用方调用 stop()
+            pass
+
+    def run(self):
+        """常驻运行，直到收到 SIGINT / SIGTERM 或调用 stop()"""
+        self._install_signal_handlers()
+        names = {name for name, _, _ in self.manager.crawlers}
+        # 已取消注册的数据源不再保留调度状态
+        self.state = {name: entry for name, entry in self.state.items() if name in names}
+        for name in names:
+            self._entry(name)
+        self.save()
+        print(f"🕒 常驻轮询已启动：{len(names)} 个数据源，默认间隔 {self.interval} 秒")
+
+        try:
+            while not self._stop.is_set():
+                crawlers = self.due(time.time())
+                if crawlers:
+                    self.poll(crawlers)
+                self._stop.wait(self._sleep_seconds())
+        finally:
+            self.save()
+            print("👋 常驻轮询已退出，调度状态已保存")
+
+
+# 便捷函数
+def run_daemon(manager, interval=None):
+    """便捷函数：以常驻轮询方式运行已注册的爬虫"""
+    PollDaemon(manager, interval).run()
@@ -0,0 +1,250 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+from change_tracker import change_tracker
+from http_fixtures import MODE_RECORD, MODE_RESUME, http_fixtures
+from state_utils import get_state_path, load_json, save_json
+
+# ==========================================
+# 运行断点模块
+# 功能：记录一次运行的进度，运行中断（如 CI 超时被终止）后可用 --resume 只完成剩余部分：
+#       - 爬虫完成情况：爬虫执行成功且提交的数据全部写入后标记为完成，恢复时跳过
+#       - 已抓取的页面（RUN_CHECKPOINT_HTTP=1 时）：HTTP 响应录制到断点归档，恢复时成功的响应直接回放
+#       - 已写入的数据：写入后保存内容哈希，恢复时重复的数据按未变化跳过（写入幂等）
+#       - 已推送的数据：写入成功但尚未推送成功的数据记录为待推送（不含正文，补推时从存储读取），
+#         恢复开始时先补推
+#       写入和推送的进度按间隔合并保存，爬虫标记完成时立即保存
+# 用法：
+#       python crawler_manager.py            # 正常运行，自动记录断点
+#       python crawler_manager.py --resume   # 从上次未完成的运行继续
+# ==========================================
+
+STATE_FILE = "run_checkpoint.json"
+HTTP_ARCHIVE = "checkpoint_http.db"
+
+# 写入、推送进度的最短保存间隔（秒）
+DEFAULT_SAVE_INTERVAL = 5
+
+# 写入爬虫结果时去掉的大字段
+RESULT_SKIP_KEYS = ("profile",)
+
+
+def _api_fields(item):
+    """待推送数据只保留推送接口需要的轻量字段，正文在补推时从存储读取，断点文件不随正文增长"""
+    pub_at = item.get("pub_at", "")
+    if hasattr(pub_at, "isoformat"):
+        pub_at = pub_at.isoformat()
+    return {"title": item.get("title", ""), "url": item.get("url", ""), "pub_at": pub_at}
+
+
+class RunCheckpoint:
+    def __init__(self):
+        """初始化运行断点
+
+        环境变量：
+            RUN_CHECKPOINT: 设为 0 时关闭断点记录
+            RUN_CHECKPOINT_HTTP: 设为 1 时录制 HTTP 响应，恢复时回放已成功的页面；默认不录制（恢复时重新抓取）
+            RUN_CHECKPOINT_SAVE_INTERVAL: 写入、推送进度的最短保存间隔秒数，默认 5
+        """
+        self.enabled = os.environ.get("RUN_CHECKPOINT", "1") != "0"
+        self.record_http = os.environ.get("RUN_CHECKPOINT_HTTP") == "1"
+        self.save_interval = float(os.environ.get("RUN_CHECKPOINT_SAVE_INTERVAL", DEFAULT_SAVE_INTERVAL))
+        self.state = None
+        self._owns_fixtures = False
+        self._saved_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        """是否有正在记录的运行"""
+        return self.state is not None
+
+    def begin(self, crawler_names, resume=False):
+        """开始记录一次运行
+
+        Args:
+            crawler_names: 本次运行的爬虫名称
+            resume: 是否从上次未完成的运行继续
+
+        Returns:
+            dict: 恢复时已完成的爬虫 {爬虫名称: 上次的执行结果}，新运行时为空
+        """
+        if not self.enabled:
+            return {}
+
+        today = datetime.now().date().isoformat()
+        previous = load_json(STATE_FILE, None) if resume else None
+        if resume:
+            if not previous or previous.get("completed"):
+                print("⚠️  没有未完成的运行可以恢复，开始新的运行")
+                previous = None
+            elif previous.get("date") != today:
+                # 爬虫按当天计算目标日期，跨天恢复会抓取不同日期的数据
+                print(f"⚠️  未完成的运行开始于 {previous.get('started_at')}，不是今天，开始新的运行")
+                previous = None
+
+        if previous:
+            self.state = previous
+            self.state["resumed_at"] = datetime.now().isoformat(timespec="seconds")
+        else:
+            self.state = {
+                "date": today,
+                "started_at": datetime.now().isoformat(timespec="seconds"),
+                "completed": False,
+                "crawlers": {},
+                "pending_push": {},
+            }
+        self.state["crawler_names"] = list(crawler_names)
+
+        # 开启录制且未显式设置 HTTP_FIXTURES 时，本次运行的响应录制到断点归档
+        if self.record_http and http_fixtures.mode is None:
+            path = get_state_path(HTTP_ARCHIVE)
+            if not previous:
+                self._remove_archive(path)
+            http_fixtures.path = path
+            http_fixtures.mode = MODE_RESUME if previous else MODE_RECORD
+            self._owns_fixtures = True
+
+        self.save()
+        if not previous:
+            return {}
+        done = {name: entry["result"] for name, entry in self.state["crawlers"].items()
+                if entry.get("status") == "done" and name in crawler_names}
+        pending = sum(len(items) for items in self.state["pending_push"].values())
+        print(f"♻️  从 {self.state['started_at']} 开始的运行继续：{len(done)} 个爬虫已完成，"
+              f"{pending} 条数据待推送")
+        return done
+
+    def crawler_finished(self, name, result, tickets=()):
+        """爬虫执行成功，提交的数据全部写入后标记为完成
+
+        Args:
+            name: 爬虫名称
+            result: 执行结果
+            tickets: 该爬虫提交到写入队列的凭证，同步写入时为空
+        """
+        if not self.active:
+            return
+        result = {key: value for key, value in result.items() if key not in RESULT_SKIP_KEYS}
+        with self._lock:
+            self.state["crawlers"][name] = {"status": "crawled", "result": result}
+        remaining = [len(tickets)]
+
+        def settled(ticket):
+            with self._lock:
+                remaining[0] -= 1
+                if remaining[0] > 0 or not self.active:
+                    return
+                entry = self.state["crawlers"].get(name)
+                failed = any(len(t.written) < len(t.records) for t in tickets)
+                # 有数据写入失败时不标记完成，恢复时重新执行该爬虫
+                if entry and not failed:
+                    entry["status"] = "done"
+            self.flush()
+
+        if not tickets:
+            with self._lock:
+                self.state["crawlers"][name]["status"] = "done"
+            self.flush()
+            return
+        for ticket in tickets:
+            ticket.add_done_callback(settled)
+
+    def record_written(self, source_name, items, push_enabled=True):
+        """一批数据写入成功：记录为待推送，与内容哈希一起按间隔保存
+
+        Args:
+            source_name: 数据源名称
+            items: 新增和有变化的数据
+            push_enabled: API 推送是否开启，关闭时不记录待推送
+        """
+        if not self.active or not items:
+            return
+        if push_enabled:
+            with self._lock:
+                pending = self.state["pending_push"].setdefault(source_name, {})
+                for item in items:
+                    pending[item.get("title", "")] = _api_fields(item)
+        self._changed()
+
+    def record_pushed(self, sources):
+        """一次 API 推送成功，从待推送中移除
+
+        Args:
+            sources: [(数据源名称, 数据列表)]，与 db_utils.send_to_api 的参数一致
+        """
+        if not self.active:
+            return
+        with self._lock:
+            for source_name, data_list in sources:
+                pending = self.state["pending_push"].get(source_name)
+                if not pending:
+                    continue
+                for item in data_list:
+                    pending.pop(item.get("title", ""), None)
+                if not pending:
+                    del self.state["pending_push"][source_name]
+        self._changed()
+
+    def pending_pushes(self):
+        """上次运行中已写入但未推送成功的数据
+
+        Returns:
+            list: [(数据源名称, 数据列表)]，数据不含正文
+        """
+        if not self.active:
+            return []
+        with self._lock:
+            return [(source_name, list(items.values()))
+                    for source_name, items in self.state["pending_push"].items() if items]
+
+    def finish(self):
+        """运行正常结束：标记完成，删除断点归档"""
+        if not self.active:
+            return
+        with self._lock:
+            self.state["completed"] = True
+            self.state["finished_at"] = datetime.now().isoformat(timespec="seconds")
+        self.flush()
+        if self._owns_fixtures:
+            http_fixtures.mode = None
+            http_fixtures.close()
+            self._remove_archive(http_fixtures.path)
+            self._owns_fixtures = False
+        self.state = None
+
+    def _changed(self):
+        """进度有变化：距上次保存超过间隔时保存，否则留到下一次保存"""
+        with self._lock:
+            due = time.monotonic() - self._saved_at >= self.save_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """立即保存断点和内容哈希
+
+        先保存待推送再保存内容哈希：中途被终止时最多重复推送，不会漏推
+        """
+        self.save()
+        change_tracker.save()
+
+    def save(self):
+        with self._lock:
+            if self.state is not None:
+                save_json(STATE_FILE, self.state)
+            self._saved_at = time.monotonic()
+
+    @staticmethod
+    def _remove_archive(path):
+        http_fixtures.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(path + suffix)
+            except FileNotFoundError:
+                pass
+
+
+# 创建全局实例
+run_checkpoint = RunCheckpoint()
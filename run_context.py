@@ -0,0 +1,57 @@
+import contextvars
+import os
+from contextlib import contextmanager
+from datetime import timedelta
+
+# ==========================================
+# 运行上下文模块
+# 功能：记录当前正在执行的爬虫名称，供写入队列等共享组件
+#       把数据和结果归属到对应爬虫（线程/协程之间互不影响）；
+#       以及本次运行的目标日期窗口，各爬虫按窗口过滤列表条目
+# ==========================================
+
+_current_crawler = contextvars.ContextVar("current_crawler", default="")
+
+# 每天定时运行时只抓取前一天；常驻轮询时加上当天，当天发布的数据当天入库
+_include_today = os.environ.get("TARGET_INCLUDE_TODAY") == "1"
+
+
+def get_current_crawler():
+    """返回当前正在执行的爬虫名称，不在爬虫上下文中时返回空字符串"""
+    return _current_crawler.get()
+
+
+@contextmanager
+def crawler_context(name):
+    """在上下文中把当前爬虫设置为 name
+
+    Args:
+        name: 爬虫名称
+    """
+    token = _current_crawler.set(name)
+    try:
+        yield
+    finally:
+        _current_crawler.reset(token)
+
+
+def set_include_today(enabled):
+    """设置目标日期窗口是否包含当天（常驻轮询时开启）"""
+    global _include_today
+    _include_today = bool(enabled)
+
+
+def get_target_dates(today):
+    """返回目标抓取日期
+
+    Args:
+        today: 北京时间的当天日期
+
+    Returns:
+        tuple: 前一天；包含当天时为 (前一天, 当天)
+
+    环境变量：
+        TARGET_INCLUDE_TODAY: 设为 1 时定时运行也包含当天
+    """
+    yesterday = today - timedelta(days=1)
+    return (yesterday, today) if _include_today else (yesterday,)
@@ -0,0 +1,195 @@
+import math
+import statistics
+import threading
+
+from state_utils import load_json, save_json
+
+# ==========================================
+# 运行历史模块
+# 功能：按爬虫增量维护各项指标的滚动统计（EWMA 均值/方差 + 最近若干次的中位数/MAD），
+#       每次运行结束后与历史比较：找出明显变慢的数据源，
+#       并检测列表条数、目标日条数、请求耗时、正文长度的异常值
+# ==========================================
+
+STATE_FILE = "run_history.json"
+
+# EWMA 平滑系数：越大越偏向最近几次运行
+EWMA_ALPHA = 0.3
+# 基线至少需要的历史运行次数
+MIN_SAMPLES = 3
+# 耗时超过基线的倍数且多出的秒数超过下限时视为变慢
+REGRESSION_RATIO = 1.5
+REGRESSION_MIN_SECONDS = 5.0
+
+# 参与异常检测的指标及需要告警的方向（low：明显偏低，high：明显偏高）
+ANOMALY_METRICS = {
+    "list_size": "low",
+    "yield": "low",
+    "fetch_latency_ms": "high",
+    "content_length": "low",
+}
+METRIC_LABELS = {
+    "list_size": "列表条数",
+    "yield": "目标日条数",
+    "fetch_latency_ms": "请求耗时 p95(ms)",
+    "content_length": "正文长度中位数",
+}
+# 中位数/MAD 使用的最近运行次数
+WINDOW = 30
+# 使用中位数/MAD 至少需要的样本数，不足时使用 EWMA 均值/标准差
+MIN_ROBUST_SAMPLES = 5
+# 稳健 z 分数阈值（Iglewicz-Hoaglin 建议 3.5）
+ROBUST_Z_THRESHOLD = 3.5
+# 相对基线的变化幅度低于该比例时不告警，避免小数值上的抖动
+MIN_RELATIVE_CHANGE = 0.5
+
+
+def _update_stat(stat, value):
+    """增量更新 EWMA 均值、方差和最近样本窗口"""
+    if stat["count"] == 0:
+        stat["mean"] = value
+        stat["var"] = 0.0
+    else:
+        diff = value - stat["mean"]
+        increment = EWMA_ALPHA * diff
+        stat["mean"] += increment
+        stat["var"] = (1 - EWMA_ALPHA) * (stat.get("var", 0.0) + diff * increment)
+    stat["count"] += 1
+    recent = stat.setdefault("recent", [])
+    recent.append(value)
+    del recent[:-WINDOW]
+
+
+def anomaly_score(stat, value):
+    """计算本次取值相对历史的偏离程度
+
+    历史样本足够时使用稳健 z 分数 0.6745 * (x - 中位数) / MAD，否则使用 EWMA 均值和标准差；
+    历史取值完全一致（离散度为 0）而本次不同时返回无穷大。
+
+    Returns:
+        tuple: (z 分数, 基线)，历史不足时返回 (None, None)
+    """
+    recent = stat.get("recent") or []
+    if len(recent) >= MIN_ROBUST_SAMPLES:
+        baseline = statistics.median(recent)
+        spread = statistics.median(abs(x - baseline) for x in recent) / 0.6745
+    elif stat.get("count", 0) >= MIN_SAMPLES:
+        baseline = stat["mean"]
+        spread = math.sqrt(max(stat.get("var", 0.0), 0.0))
+    else:
+        return None, None
+
+    diff = value - baseline
+    if spread > 0:
+        return diff / spread, baseline
+    if diff == 0:
+        return 0.0, baseline
+    return math.copysign(math.inf, diff), baseline
+
+
+def describe_anomaly(anomaly):
+    """把异常检测结果转换为一行说明文字"""
+    label = METRIC_LABELS.get(anomaly["metric"], anomaly["metric"])
+    trend = "偏高" if anomaly["value"] > anomaly["baseline"] else "偏低"
+    return f"{anomaly['crawler']}：{label} {anomaly['value']:g}，{trend}（历史基线 {anomaly['baseline']:g}）"
+
+
+class RunHistory:
+    def __init__(self):
+        """初始化运行历史，状态为 {爬虫名称: {指标: {'mean', 'var', 'count', 'recent'}}}"""
+        self.entries = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self.entries is None:
+            self.entries = load_json(STATE_FILE, {}) or {}
+
+    def baseline(self, crawler, metric="execution_time"):
+        """返回历史基线，历史运行次数不足时返回 None"""
+        with self._lock:
+            self._load()
+            stat = self.entries.get(crawler, {}).get(metric)
+        if not stat or stat.get("count", 0) < MIN_SAMPLES:
+            return None
+        return stat["mean"]
+
+    def regressions(self, results):
+        """找出本次运行明显慢于历史基线的爬虫
+
+        Args:
+            results: CrawlerManager.results
+
+        Returns:
+            list: [(爬虫名称, 本次耗时, 基线耗时)]，按变慢倍数降序
+        """
+        slower = []
+        for crawler, result in results.items():
+            if result.get("status") != "success":
+                continue
+            baseline = self.baseline(crawler)
+            current = result.get("execution_time", 0)
+            if baseline is None:
+                continue
+            if current > baseline * REGRESSION_RATIO and current - baseline > REGRESSION_MIN_SECONDS:
+                slower.append((crawler, current, round(baseline, 2)))
+        slower.sort(key=lambda item: item[1] / item[2] if item[2] else float("inf"), reverse=True)
+        return slower
+
+    def anomalies(self, results):
+        """检测本次运行各爬虫指标中的异常值（results[名称]['metrics'] 中的指标）
+
+        Args:
+            results: CrawlerManager.results
+
+        Returns:
+            list: [{'crawler', 'metric', 'value', 'baseline', 'score'}]，按偏离程度降序
+        """
+        found = []
+        with self._lock:
+            self._load()
+            for crawler, result in results.items():
+                if result.get("status") != "success":
+                    continue
+                history = self.entries.get(crawler, {})
+                for metric, value in (result.get("metrics") or {}).items():
+                    direction = ANOMALY_METRICS.get(metric)
+                    if direction is None or value is None or metric not in history:
+                        continue
+                    score, baseline = anomaly_score(history[metric], value)
+                    if score is None:
+                        continue
+                    if (direction == "low" and score > -ROBUST_Z_THRESHOLD) or \
+                            (direction == "high" and score < ROBUST_Z_THRESHOLD):
+                        continue
+                    if abs(value - baseline) < MIN_RELATIVE_CHANGE * abs(baseline):
+                        continue
+                    found.append({
+                        "crawler": crawler,
+                        "metric": metric,
+                        "value": value,
+                        "baseline": round(baseline, 2),
+                        "score": score,
+                    })
+        found.sort(key=lambda item: abs(item["score"]), reverse=True)
+        return found
+
+    def update(self, results):
+        """用本次运行成功的爬虫更新各项指标的滚动统计并保存"""
+        with self._lock:
+            self._load()
+            for crawler, result in results.items():
+                if result.get("status") != "success":
+                    continue
+                values = {"execution_time": result.get("execution_time", 0)}
+                values.update(result.get("metrics") or {})
+                history = self.entries.setdefault(crawler, {})
+                for metric, value in values.items():
+                    if value is None:
+                        continue
+                    stat = history.setdefault(metric, {"mean": 0.0, "var": 0.0, "count": 0})
+                    _update_stat(stat, float(value))
+            save_json(STATE_FILE, self.entries)
+
+
+# 创建全局实例
+run_history = RunHistory()
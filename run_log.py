@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from run_context import get_current_crawler
+from state_utils import get_state_path
+
+# ==========================================
+# 运行日志模块
+# 功能：把运行输出逐行写入按大小轮转的日志文件（整次运行一份，每个爬虫一份），
+#       内存中只保留有限行数的尾部供通知使用；
+#       执行结果（过滤数量、API 推送结果等）以结构化事件记录，汇总时不再扫描日志文本
+# ==========================================
+
+DEFAULT_DIRNAME = "logs"
+RUN_LOG_FILE = "run.log"
+EVENTS_FILE = "events.jsonl"
+CRAWLER_LOG_DIR = "crawlers"
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+DEFAULT_TAIL_LINES = 200
+# 内存中保留的事件数上限
+MAX_EVENTS = 10000
+
+# 爬虫输出的过滤数量（爬虫只打印文本，逐行识别后转为 filter 事件）
+FILTER_PATTERN = re.compile(r"(?:过滤掉|过滤非昨日数据|过滤掉非目标日期数据)\s*[:：]?\s*(\d+)\s*条")
+
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def _rotating_logger(name, path, max_bytes, backups):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+class LogStream:
+    """替换 sys.stdout / sys.stderr：原样输出到控制台，同时逐行写入运行日志"""
+
+    def __init__(self, run_log, original, stream_name):
+        self.run_log = run_log
+        self.original = original
+        self.stream_name = stream_name
+        self._partial = {}
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        self.original.write(text)
+        if not text:
+            return 0
+        # 不同线程的输出分开拼行，避免半行交错
+        key = threading.get_ident()
+        with self._lock:
+            buffered = self._partial.pop(key, "") + text
+            *lines, rest = buffered.split("\n")
+            if rest:
+                self._partial[key] = rest
+        for line in lines:
+            self.run_log.write_line(line, self.stream_name)
+        return len(text)
+
+    def flush(self):
+        self.original.flush()
+
+    def close_partial(self):
+        """把未以换行结尾的残留内容写入日志"""
+        with self._lock:
+            partial, self._partial = self._partial, {}
+        for line in partial.values():
+            self.run_log.write_line(line, self.stream_name)
+
+    def __getattr__(self, name):
+        return getattr(self.original, name)
+
+
+class RunLog:
+    def __init__(self):
+        """初始化运行日志
+
+        环境变量：
+            RUN_LOG_DIR: 日志目录，默认状态目录下的 logs
+            RUN_LOG_MAX_BYTES: 单个日志文件的轮转大小
+            RUN_LOG_BACKUPS: 每个日志保留的轮转文件数
+            RUN_LOG_TAIL_LINES: 内存中保留的尾部行数
+        """
+        self.directory = os.environ.get("RUN_LOG_DIR") or get_state_path(DEFAULT_DIRNAME)
+        self.max_bytes = int(os.environ.get("RUN_LOG_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.backups = int(os.environ.get("RUN_LOG_BACKUPS", DEFAULT_BACKUPS))
+        self.tail_lines = deque(maxlen=int(os.environ.get("RUN_LOG_TAIL_LINES", DEFAULT_TAIL_LINES)))
+        self.events = deque(maxlen=MAX_EVENTS)
+        self._run_logger = None
+        self._crawler_loggers = {}
+        self._streams = []
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self._run_logger is not None
+
+    def start(self):
+        """开始一次运行：打开运行日志，清空尾部缓冲和事件"""
+        self.close()
+        self.tail_lines.clear()
+        self.events.clear()
+        self._run_logger = _rotating_logger(
+            "crawler_run", os.path.join(self.directory, RUN_LOG_FILE), self.max_bytes, self.backups
+        )
+        self._events_logger = _rotating_logger(
+            "crawler_run.events", os.path.join(self.directory, EVENTS_FILE), self.max_bytes, self.backups
+        )
+        self._events_logger.handlers[0].setFormatter(logging.Formatter("%(message)s"))
+
+    def stream(self, original, stream_name):
+        """创建输出流，写入的内容同时进入运行日志"""
+        log_stream = LogStream(self, original, stream_name)
+        self._streams.append(log_stream)
+        return log_stream
+
+    def _crawler_logger(self, crawler):
+        with self._lock:
+            logger = self._crawler_loggers.get(crawler)
+            if logger is None:
+                filename = _UNSAFE_FILENAME.sub("_", crawler) + ".log"
+                logger = _rotating_logger(
+                    f"crawler_run.crawler.{len(self._crawler_loggers)}",
+                    os.path.join(self.directory, CRAWLER_LOG_DIR, filename),
+                    self.max_bytes, self.backups,
+                )
+                self._crawler_loggers[crawler] = logger
+        return logger
+
+    def write_line(self, line, stream_name="stdout"):
+        """写入一行输出：运行日志、当前爬虫的日志和内存尾部"""
+        self.tail_lines.append(line)
+        if not self.active:
+            return
+        message = line if stream_name == "stdout" else f"[{stream_name}] {line}"
+        self._run_logger.info(message)
+
+        crawler = get_current_crawler()
+        if crawler:
+            self._crawler_logger(crawler).info(message)
+            match = FILTER_PATTERN.search(line)
+            if match:
+                self.emit("filter", crawler, count=int(match.group(1)))
+
+    def emit(self, kind, crawler=None, **fields):
+        """记录一条结构化事件
+
+        Args:
+            kind: 事件类型（filter / api_push 等）
+            crawler: 爬虫名称，默认取当前运行上下文中的爬虫
+            **fields: 事件字段
+        """
+        event = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "kind": kind,
+            "crawler": crawler or get_current_crawler(),
+            **fields,
+        }
+        self.events.append(event)
+        if self.active:
+            self._events_logger.info(json.dumps(event, ensure_ascii=False, default=str))
+        return event
+
+    def find_events(self, kind, crawler=None):
+        """按类型（和爬虫）查找本次运行的事件"""
+        return [
+            event for event in list(self.events)
+            if event["kind"] == kind and (crawler is None or event["crawler"] == crawler)
+        ]
+
+    def last_event(self, kind, crawler=None):
+        events = self.find_events(kind, crawler)
+        return events[-1] if events else None
+
+    def tail(self):
+        """返回内存中保留的日志尾部"""
+        return "\n".join(self.tail_lines)
+
+    def close(self):
+        """结束一次运行：写入残留输出并关闭日志文件"""
+        for log_stream in self._streams:
+            log_stream.close_partial()
+        self._streams = []
+        loggers = list(self._crawler_loggers.values())
+        if self._run_logger is not None:
+            loggers += [self._run_logger, self._events_logger]
+        for logger in loggers:
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+        self._crawler_loggers = {}
+        self._run_logger = None
+
+
+# 创建全局实例
+run_log = RunLog()
+
+
+# 便捷函数
+def emit_event(kind, crawler=None, **fields):
+    """便捷函数：记录一条结构化事件"""
+    return run_log.emit(kind, crawler, **fields)
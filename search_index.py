@@ -0,0 +1,336 @@
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from state_utils import get_state_path
+
+# ==========================================
+# 本地全文检索模块
+# 功能：用 SQLite FTS5 为抓取到的政策建立本地全文索引，
+#       中文按字符二元组切分，查询按 BM25 排序并支持按来源和日期过滤；
+#       每次运行只增量写入当天新增/变化的数据，并做有限页数的段合并
+# ==========================================
+
+DB_FILENAME = "search.db"
+
+# BM25 列权重：标题命中比正文命中更重要
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+# 每次增量写入后合并的页数，控制合并开销只与当天增量相关
+MERGE_PAGES = 200
+# FTS5 自动合并阈值
+AUTOMERGE_LEVEL = 8
+
+# 摘要长度
+SNIPPET_LENGTH = 80
+
+# 分词规则版本，记录在 PRAGMA user_version；规则变化后打开旧索引时按新规则重建
+TOKENIZER_VERSION = 2
+
+_TOKEN_PATTERN = re.compile(r"[㐀-鿿豈-﫿]+|[a-z0-9]+")
+
+
+def tokenize(text, tail=True):
+    """中文切分为字符二元组，英文和数字按单词切分
+
+    Args:
+        text: 原始文本
+        tail: 是否在每段中文末尾追加末字的单字词元。建索引时开启：
+              末字不在任何二元组开头，单字查询的前缀匹配要靠它命中（如「个人所得税」中的「税」）；
+              查询短语时关闭，否则短语只能匹配到位于段末的位置
+
+    Returns:
+        list: 词元列表
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer((text or "").lower()):
+        run = match.group()
+        if run[0].isascii():
+            tokens.append(run)
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            if tail:
+                tokens.append(run[-1])
+    return tokens
+
+
+def to_match_query(query):
+    """把查询关键词转换为 FTS5 MATCH 表达式
+
+    空格分隔的多个关键词之间为 AND 关系，每个关键词的二元组组成短语（要求相邻）。
+    """
+    phrases = []
+    for term in query.split():
+        tokens = tokenize(term, tail=False)
+        if len(tokens) == 1 and len(tokens[0]) == 1 and not tokens[0].isascii():
+            # 单个汉字用前缀查询：匹配以它开头的二元组和段末的单字词元
+            phrases.append(f'"{tokens[0]}"*')
+        elif tokens:
+            phrases.append('"' + " ".join(tokens) + '"')
+    return " AND ".join(phrases)
+
+
+def _snippet(content, query):
+    """截取正文中第一个关键词附近的片段"""
+    content = content or ""
+    position = -1
+    for term in query.split():
+        position = content.find(term)
+        if position >= 0:
+            break
+    start = max(0, position - SNIPPET_LENGTH // 4) if position >= 0 else 0
+    snippet = content[start:start + SNIPPET_LENGTH].replace("\n", " ")
+    return ("…" if start else "") + snippet
+
+
+class SearchIndex:
+    def __init__(self, path=None):
+        """初始化全文检索索引
+
+        Args:
+            path: 索引数据库路径，默认读取环境变量 SEARCH_DB_PATH，
+                  未设置时使用状态目录下的 search.db
+        """
+        self.path = path or os.environ.get("SEARCH_DB_PATH") or get_state_path(DB_FILENAME)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def get_connection(self):
+        """获取索引数据库连接"""
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS docs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL UNIQUE,
+                    url TEXT,
+                    source TEXT,
+                    pub_at TEXT,
+                    content TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS docs_source_pub_at ON docs (source, pub_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS docs_pub_at ON docs (pub_at)")
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(title, content)")
+            conn.execute("INSERT INTO docs_fts(docs_fts, rank) VALUES ('automerge', ?)", (AUTOMERGE_LEVEL,))
+            conn.commit()
+            if conn.execute("PRAGMA user_version").fetchone()[0] < TOKENIZER_VERSION:
+                self._rebuild(conn)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _rebuild(conn):
+        """按当前分词规则重建全文索引（正文保存在 docs 表中，无需重新抓取）"""
+        with conn:
+            conn.execute("DELETE FROM docs_fts")
+            for doc_id, title, content in conn.execute("SELECT id, title, content FROM docs").fetchall():
+                conn.execute(
+                    "INSERT INTO docs_fts (rowid, title, content) VALUES (?, ?, ?)",
+                    (doc_id, " ".join(tokenize(title)), " ".join(tokenize(content))),
+                )
+            conn.execute(f"PRAGMA user_version = {TOKENIZER_VERSION}")
+
+    def add_documents(self, records):
+        """增量写入索引（按标题去重，已存在则替换）
+
+        Args:
+            records: 数据列表（title / url / source / pub_at / content）
+
+        Returns:
+            int: 写入的条数
+        """
+        if not records:
+            return 0
+
+        with self._lock:
+            conn = self.get_connection()
+            with conn:
+                for record in records:
+                    title = record.get("title")
+                    if not title:
+                        continue
+                    pub_at = record.get("pub_at")
+                    if hasattr(pub_at, "isoformat"):
+                        pub_at = pub_at.isoformat()
+                    conn.execute(
+                        """
+                        INSERT INTO docs (title, url, source, pub_at, content) VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(title) DO UPDATE SET
+                            url = excluded.url, source = excluded.source,
+                            pub_at = excluded.pub_at, content = excluded.content
+                        """,
+                        (title, record.get("url"), record.get("source"), pub_at, record.get("content")),
+                    )
+                    doc_id = conn.execute("SELECT id FROM docs WHERE title = ?", (title,)).fetchone()[0]
+                    conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (doc_id,))
+                    conn.execute(
+                        "INSERT INTO docs_fts (rowid, title, content) VALUES (?, ?, ?)",
+                        (doc_id, " ".join(tokenize(title)), " ".join(tokenize(record.get("content")))),
+                    )
+                # 只合并有限页数，新写入的小段逐步并入大段
+                conn.execute("INSERT INTO docs_fts(docs_fts, rank) VALUES ('merge', ?)", (MERGE_PAGES,))
+        return len(records)
+
+    def search(self, query, source=None, since=None, until=None, limit=20):
+        """按关键词检索，结果按 BM25 排序
+
+        Args:
+            query: 关键词，多个关键词用空格分隔（AND 关系）
+            source: 按来源过滤，可选
+            since: 发布日期下限（含），YYYY-MM-DD，可选
+            until: 发布日期上限（含），YYYY-MM-DD，可选
+            limit: 返回条数
+
+        Returns:
+            list: [{'title', 'url', 'source', 'pub_at', 'score', 'snippet'}]
+        """
+        match = to_match_query(query)
+        if not match:
+            return []
+
+        conditions = ["docs_fts MATCH ?"]
+        params = [match]
+        if source:
+            conditions.append("d.source = ?")
+            params.append(source)
+        if since:
+            conditions.append("d.pub_at >= ?")
+            params.append(since)
+        if until:
+            conditions.append("d.pub_at <= ?")
+            params.append(until)
+        params.append(limit)
+
+        sql = f"""
+            SELECT d.title, d.url, d.source, d.pub_at, d.content,
+                   bm25(docs_fts, {TITLE_WEIGHT}, {CONTENT_WEIGHT}) AS score
+            FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid
+            WHERE {" AND ".join(conditions)}
+            ORDER BY score
+            LIMIT ?
+        """
+        with self._lock:
+            rows = self.get_connection().execute(sql, params).fetchall()
+
+        return [
+            {
+                "title": title,
+                "url": url,
+                "source": source_name,
+                "pub_at": pub_at,
+                # bm25() 越小越相关，取反后越大越相关
+                "score": round(-score, 4),
+                "snippet": _snippet(content, query),
+            }
+            for title, url, source_name, pub_at, content, score in rows
+        ]
+
+    def optimize(self):
+        """把所有段合并为一个（耗时与索引总量相关，适合定期执行）"""
+        with self._lock:
+            conn = self.get_connection()
+            with conn:
+                conn.execute("INSERT INTO docs_fts(docs_fts) VALUES ('optimize')")
+
+    def count(self):
+        """返回索引中的文档数"""
+        with self._lock:
+            return self.get_connection().execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# 创建全局实例
+search_index = SearchIndex()
+
+
+# 便捷函数
+def index_records(records):
+    """便捷函数：增量写入索引
+
+    Args:
+        records: 数据列表
+
+    Returns:
+        int: 写入的条数
+    """
+    return search_index.add_documents(records)
+
+
+def search(query, source=None, since=None, until=None, limit=20):
+    """便捷函数：按关键词检索"""
+    return search_index.search(query, source, since, until, limit)
+
+
+def _load_sqlite_records(path):
+    """从 sqlite 存储后端的 policy 表读取全部数据，用于重建索引"""
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute("SELECT title, url, source, pub_at, content FROM policy").fetchall()
+    finally:
+        conn.close()
+    return [dict(zip(("title", "url", "source", "pub_at", "content"), row)) for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="政策全文检索")
+    parser.add_argument("--db", help="索引数据库路径")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    query_parser = subparsers.add_parser("query", help="检索")
+    query_parser.add_argument("keywords", nargs="+", help="关键词，多个关键词为 AND 关系")
+    query_parser.add_argument("--source", help="按来源过滤")
+    query_parser.add_argument("--since", help="发布日期下限 YYYY-MM-DD")
+    query_parser.add_argument("--until", help="发布日期上限 YYYY-MM-DD")
+    query_parser.add_argument("--limit", type=int, default=20, help="返回条数")
+
+    import_parser = subparsers.add_parser("import-sqlite", help="从 sqlite 存储后端导入全部数据")
+    import_parser.add_argument("path", help="policy.db 路径")
+
+    subparsers.add_parser("optimize", help="合并全部索引段")
+    subparsers.add_parser("stats", help="显示索引文档数")
+
+    args = parser.parse_args()
+    index = SearchIndex(args.db) if args.db else search_index
+
+    if args.command == "query":
+        start = time.perf_counter()
+        results = index.search(" ".join(args.keywords), args.source, args.since, args.until, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"🔍 找到 {len(results)} 条结果（{elapsed:.1f} ms）")
+        for i, result in enumerate(results, 1):
+            print(f"{i}. [{result['score']:.2f}] {result['title']} ({result['source']} {result['pub_at']})")
+            print(f"   {result['url']}")
+            print(f"   {result['snippet']}")
+    elif args.command == "import-sqlite":
+        start = time.perf_counter()
+        count = index.add_documents(_load_sqlite_records(args.path))
+        print(f"✅ 已导入 {count} 条数据，耗时 {time.perf_counter() - start:.2f} 秒")
+    elif args.command == "optimize":
+        index.optimize()
+        print("✅ 索引段已合并")
+    else:
+        print(f"📊 索引文档数: {index.count()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
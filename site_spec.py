@@ -0,0 +1,292 @@
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from html import unescape
+from urllib.parse import urljoin
+
+from http_utils import http_get
+import soupsieve
+
+from change_tracker import attach_hash
+from content_extractor import extract_content as extract_page_content, warn_low_confidence
+from date_utils import make_date
+from html_utils import make_soup
+from run_context import get_target_dates
+
+# ==========================================
+# 站点规格引擎
+# 功能：用声明式的 SiteSpec 描述列表页/详情页的抓取规则，
+#       所有站点共用同一套「列表 → 过滤目标日期 → 详情 → 入库」流程
+# ==========================================
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# 常用日期规则：(取值位置, 正则)，正则必须包含 年/月/日 三个分组
+DATE_IN_TEXT = ('text', r'(\d{4})[-/\.](\d{1,2})[-/\.](\d{1,2})')
+DATE_IN_TEXT_DASH = ('text', r'(\d{4})\s*-\s*(\d{1,2})\s*-\s*(\d{1,2})')
+DATE_IN_SPAN = ('span', r'(\d{4})-(\d{1,2})-(\d{1,2})')
+DATE_IN_HREF = ('href', r'/(\d{4})/(\d{1,2})/(\d{1,2})/')
+
+DATE_SOURCES = ('text', 'span', 'href')
+
+
+@dataclass
+class SiteSpec:
+    """站点抓取规格
+
+    Attributes:
+        name: 日志中显示的爬虫名称
+        source: policy.source 字段值
+        db_source: 写入数据库时使用的数据源名称
+        list_url: 列表页地址
+        container_selector: 包含 datastore 脚本的容器 CSS 选择器，为空则在整页查找
+        script_type: datastore 脚本的 type 属性，为空则不限类型（只要求包含 <record>）
+        script_keyword: datastore 脚本需额外包含的关键字，可选
+        unescape_records: datastore 内容是否需要先做 HTML 实体解码
+        all_record_items: 是否取每条 record 中的全部 li，默认只取第一个
+        fallback_item_selector: 未找到 datastore 时直接在页面中查找条目的选择器，为空则视为失败
+        title_from: 标题取值顺序，可选 'title'（a 标签 title 属性）和 'text'（a 标签文本）
+        min_title_length: 标题最小长度
+        date_rules: 日期规则元组，按顺序尝试
+        content_selectors: 详情页正文选择器，按顺序第一个命中的优先，都未命中时由 content_extractor 回退
+        content_separator: 正文 get_text 分隔符，'\\n' 时会逐行清理空白行
+        warn_low_confidence: 正文提取置信度过低时是否输出警告
+        headers: 请求头
+    """
+    name: str
+    source: str
+    db_source: str
+    list_url: str
+    container_selector: str = ''
+    script_type: str = 'text/xml'
+    script_keyword: str = ''
+    unescape_records: bool = False
+    all_record_items: bool = False
+    fallback_item_selector: str = ''
+    title_from: tuple = ('title',)
+    min_title_length: int = 1
+    date_rules: tuple = (DATE_IN_TEXT,)
+    content_selectors: tuple = ('.content', '#content')
+    content_separator: str = ''
+    warn_low_confidence: bool = False
+    headers: dict = field(default_factory=lambda: dict(DEFAULT_HEADERS))
+    list_timeout: int = 30
+    detail_timeout: int = 15
+
+    def __post_init__(self):
+        """预编译选择器和日期正则，避免在循环中重复编译"""
+        for where, _ in self.date_rules:
+            if where not in DATE_SOURCES:
+                raise ValueError(f"{self.name}: 不支持的日期取值位置 {where}")
+        self._date_rules = tuple((where, re.compile(pattern)) for where, pattern in self.date_rules)
+        self._container = soupsieve.compile(self.container_selector) if self.container_selector else None
+        self._fallback_items = soupsieve.compile(self.fallback_item_selector) if self.fallback_item_selector else None
+
+
+def get_today():
+    """返回北京时间的当天日期"""
+    tz_utc8 = timezone(timedelta(hours=8))
+    return datetime.now(tz_utc8).date()
+
+
+def find_list_items(spec, soup):
+    """从列表页中找出所有条目（li 标签），每条 record 默认只取第一个 li
+
+    Returns:
+        list: 条目标签列表，未找到 datastore 且无回退选择器时返回 None
+    """
+    container = spec._container.select_one(soup) if spec._container else soup
+    script_content = None
+    if container is not None:
+        scripts = container.find_all('script', type=spec.script_type) if spec.script_type else container.find_all('script')
+        for script in scripts:
+            text = script.string
+            if text and spec.unescape_records:
+                text = unescape(text)
+            if text and '<record>' in text and (not spec.script_keyword or spec.script_keyword in text):
+                script_content = text
+                break
+
+    items = []
+    if script_content:
+        for record in make_soup(script_content).find_all('record'):
+            cdata = record.string
+            if not cdata:
+                continue
+            record_soup = make_soup(cdata)
+            if spec.all_record_items:
+                items.extend(record_soup.find_all('li'))
+            else:
+                li_tag = record_soup.find('li')
+                if li_tag:
+                    items.append(li_tag)
+
+    if not items and spec._fallback_items:
+        items = spec._fallback_items.select(soup)
+
+    if not items and not script_content and not spec._fallback_items:
+        return None
+    return items
+
+
+def extract_title(spec, a_tag):
+    for key in spec.title_from:
+        if key == 'title':
+            title = a_tag.get('title', '').strip()
+        else:
+            title = a_tag.get_text(strip=True)
+        if title:
+            return title
+    return ''
+
+
+def extract_date(spec, item, href):
+    for where, pattern in spec._date_rules:
+        if where == 'text':
+            texts = (item.get_text(),)
+        elif where == 'span':
+            texts = (span.get_text(strip=True) for span in item.find_all('span'))
+        else:
+            texts = (href,)
+
+        for text in texts:
+            match = pattern.search(text)
+            if match:
+                pub_at = make_date(match.group(1), match.group(2), match.group(3))
+                if pub_at:
+                    return pub_at
+    return None
+
+
+def extract_content(spec, detail_soup):
+    """提取详情页正文
+
+    Returns:
+        ExtractionResult: 提取结果（正文、命中的选择器、置信度）
+    """
+    return extract_page_content(detail_soup, spec.content_selectors, spec.content_separator, key=spec.name)
+
+
+def fetch_content(spec, title, article_url):
+    content = ""
+    try:
+        detail_resp = http_get(article_url, headers=spec.headers, timeout=spec.detail_timeout)
+        detail_soup = make_soup(detail_resp.content, detail_resp.url)
+        result = extract_content(spec, detail_soup)
+        content = result.content
+
+        if spec.warn_low_confidence:
+            warn_low_confidence(title, article_url, content, result.confidence)
+    except Exception as e:
+        print(f"⚠️  抓取详情页失败: {article_url} - {e}")
+    return content
+
+
+def scrape_spec(spec):
+    """按规格抓取目标日期的数据
+
+    Args:
+        spec: SiteSpec 站点规格
+
+    Returns:
+        tuple: (目标日期数据列表, 页面全部条目列表)
+    """
+    policies = []
+    all_items = []
+
+    try:
+        # 前一天，常驻轮询时包含当天
+        target_dates = get_target_dates(get_today())
+
+        response = http_get(spec.list_url, headers=spec.headers, timeout=spec.list_timeout)
+        response.raise_for_status()
+        soup = make_soup(response.content, response.url)
+
+        items = find_list_items(spec, soup)
+        if items is None:
+            print(f"❌ {spec.name}爬虫：未找到数据脚本")
+            return policies, all_items
+
+        filtered_count = 0
+
+        for item in items:
+            try:
+                a_tag = item.find('a')
+                if not a_tag:
+                    continue
+
+                title = extract_title(spec, a_tag)
+                href = a_tag.get('href', '').strip()
+
+                if not title or len(title) < spec.min_title_length:
+                    continue
+
+                article_url = urljoin(spec.list_url, href)
+                pub_at = extract_date(spec, item, href)
+
+                # 保存到 all_items 用于显示最新5条
+                all_items.append({'title': title, 'pub_at': pub_at})
+
+                if pub_at not in target_dates:
+                    filtered_count += 1
+                    continue
+
+                policies.append(attach_hash({
+                    'title': title,
+                    'url': article_url,
+                    'pub_at': pub_at,
+                    'content': fetch_content(spec, title, article_url),
+                    'selected': False,
+                    'category': '',
+                    'source': spec.source
+                }))
+
+            except Exception:
+                continue
+
+        print(f"✅ {spec.name}爬虫：成功抓取 {len(policies)} 条前一天数据")
+        print(f"⏭️  过滤掉 {filtered_count} 条非目标日期的数据")
+
+        # 显示页面最新5条
+        if all_items:
+            print("📊 页面最新5条是：")
+            for item in all_items[:5]:
+                date_str = item['pub_at'].strftime('%Y-%m-%d') if item['pub_at'] else '未知日期'
+                print(f"✅ {item['title']} {date_str}")
+
+    except Exception as e:
+        print(f"❌ {spec.name}爬虫：抓取失败 - {e}")
+        print("----------------------------------------")
+
+    return policies, all_items
+
+
+def save_spec(spec, data_list):
+    try:
+        from db_utils import save_to_policy
+        return save_to_policy(data_list, spec.db_source)
+    except Exception:
+        return data_list
+
+
+def run_spec(spec):
+    """按规格执行完整的抓取与入库流程
+
+    Args:
+        spec: SiteSpec 站点规格
+
+    Returns:
+        save_to_policy 的返回值
+    """
+    try:
+        data, _ = scrape_spec(spec)
+        result = save_spec(spec, data)
+        print(f"💾 写入数据库: {len(data)} 条")
+        print("----------------------------------------")
+        return result
+    except Exception as e:
+        print(f"❌ {spec.name}爬虫：运行失败 - {e}")
+        print("----------------------------------------")
+        return []
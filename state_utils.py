@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+
+# ==========================================
+# 本地状态存储工具模块
+# 功能：为爬虫在多次运行之间保存少量状态（如学习到的正文选择器），
+#       统一存放在状态目录下的 JSON 文件中，写入时先写临时文件再原子替换
+# ==========================================
+
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".crawler_state")
+
+
+def get_state_dir():
+    """返回状态目录，可通过环境变量 CRAWLER_STATE_DIR 覆盖"""
+    return os.environ.get("CRAWLER_STATE_DIR") or DEFAULT_STATE_DIR
+
+
+def get_state_path(filename):
+    """返回状态文件的完整路径
+
+    Args:
+        filename: 状态文件名
+
+    Returns:
+        str: 状态文件路径
+    """
+    return os.path.join(get_state_dir(), filename)
+
+
+def load_json(filename, default=None):
+    """读取状态 JSON 文件
+
+    Args:
+        filename: 状态文件名
+        default: 文件不存在或损坏时返回的默认值
+
+    Returns:
+        解析后的 JSON 数据
+    """
+    path = get_state_path(filename)
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  读取状态文件失败: {path} - {e}")
+        return default
+
+
+def save_json(filename, data):
+    """原子写入状态 JSON 文件
+
+    Args:
+        filename: 状态文件名
+        data: 可 JSON 序列化的数据
+
+    Returns:
+        bool: 是否写入成功
+    """
+    path = get_state_path(filename)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        print(f"⚠️  写入状态文件失败: {path} - {e}")
+        return False
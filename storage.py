@@ -0,0 +1,362 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from state_utils import get_state_path
+
+# ==========================================
+# 存储后端模块
+# 功能：save_to_policy 背后的存储接口，按配置选择实现：
+#       supabase（默认，云端批量写入）、sqlite（本地 WAL 模式，executemany 批量 upsert）、
+#       memory（内存，便于本地和 CI 测量端到端吞吐）
+# ==========================================
+
+# policy 表中写入的字段
+POLICY_FIELDS = ("title", "url", "content", "pub_at", "selected", "category", "source", "content_hash")
+
+# 批量写入时每次按标题查询已存在数据的条数（避免查询地址过长）
+TITLE_QUERY_CHUNK = 20
+
+SQLITE_FILENAME = "policy.db"
+
+
+class StorageBackend:
+    """存储后端基类"""
+
+    name = ""
+
+    def upsert_policies(self, items):
+        """按标题 upsert policy 数据
+
+        Args:
+            items: 已处理（日期转为字符串）的数据列表，标题已去重
+
+        Returns:
+            tuple: (成功写入的下标列表, 失败信息列表)
+        """
+        raise NotImplementedError
+
+    def update_policies(self, updates):
+        """按标题只更新改动过的字段
+
+        Args:
+            updates: [(标题, {字段: 新值})] 列表
+
+        Returns:
+            tuple: (成功更新的下标列表, 失败信息列表)
+        """
+        raise NotImplementedError
+
+    def get_contents(self, titles):
+        """按标题读取已写入数据的正文
+
+        Args:
+            titles: 标题列表
+
+        Returns:
+            dict: {标题: 正文}，不存在的标题不包含在内
+        """
+        raise NotImplementedError
+
+    def count(self):
+        """返回 policy 表中的数据条数"""
+        raise NotImplementedError
+
+    def close(self):
+        """释放连接"""
+
+
+class SupabaseStorage(StorageBackend):
+    name = "supabase"
+
+    def __init__(self):
+        """初始化 Supabase 存储
+
+        环境变量：
+            SUPABASE_PROJECT_API / SUPABASE_ANON_PUBLIC: 项目地址和密钥
+            SUPABASE_CONTENT_HASH: policy 表已添加 content_hash 列时设为 1，
+                                   执行 alter table policy add column content_hash text; 后开启
+        """
+        self.supabase_url = os.environ.get("SUPABASE_PROJECT_API")
+        self.supabase_key = os.environ.get("SUPABASE_ANON_PUBLIC")
+        self.store_hash = os.environ.get("SUPABASE_CONTENT_HASH") == "1"
+        self.client = None
+
+    def _row(self, item):
+        if self.store_hash or "content_hash" not in item:
+            return item
+        return {key: value for key, value in item.items() if key != "content_hash"}
+
+    def get_client(self):
+        """获取 Supabase 客户端
+
+        Returns:
+            Client: Supabase 客户端实例
+        """
+        if not self.client:
+            if not self.supabase_url or not self.supabase_key:
+                raise ValueError("缺少 Supabase 环境变量: SUPABASE_PROJECT_API 或 SUPABASE_ANON_PUBLIC")
+            from supabase import create_client
+            self.client = create_client(self.supabase_url, self.supabase_key)
+        return self.client
+
+    def upsert_policies(self, items):
+        # policy 表的 title 没有唯一约束，不能使用 on_conflict，
+        # 先分块查询已存在的标题，新数据合并为一次插入，已存在的逐条更新
+        supabase = self.get_client()
+        titles = [item.get("title") for item in items]
+        existing_titles = set()
+        for i in range(0, len(titles), TITLE_QUERY_CHUNK):
+            existing = supabase.table("policy").select("title").in_("title", titles[i:i + TITLE_QUERY_CHUNK]).execute()
+            existing_titles.update(row.get("title") for row in existing.data or [])
+
+        written = []
+        errors = []
+        new_indexes = [i for i, title in enumerate(titles) if title not in existing_titles]
+        if new_indexes:
+            try:
+                supabase.table("policy").insert([self._row(items[i]) for i in new_indexes]).execute()
+                written.extend(new_indexes)
+            except Exception as e:
+                # 一条数据出错会导致整批失败，改为逐条插入，只跳过出错的数据
+                print(f"⚠️  批量插入失败，改为逐条插入 - {e}")
+                for i in new_indexes:
+                    try:
+                        supabase.table("policy").insert(self._row(items[i])).execute()
+                        written.append(i)
+                    except Exception as e:
+                        errors.append(f"单条数据插入失败 - {e}")
+
+        # 更新条件各不相同，无法合并
+        for i, title in enumerate(titles):
+            if title not in existing_titles:
+                continue
+            try:
+                supabase.table("policy").update(self._row(items[i])).eq("title", title).execute()
+                written.append(i)
+            except Exception as e:
+                errors.append(f"单条数据处理失败 - {e}")
+
+        return written, errors
+
+    def update_policies(self, updates):
+        supabase = self.get_client()
+        written = []
+        errors = []
+        for i, (title, fields) in enumerate(updates):
+            fields = self._row(fields)
+            if not fields:
+                written.append(i)
+                continue
+            try:
+                supabase.table("policy").update(fields).eq("title", title).execute()
+                written.append(i)
+            except Exception as e:
+                errors.append(f"单条数据更新失败 - {e}")
+        return written, errors
+
+    def get_contents(self, titles):
+        supabase = self.get_client()
+        titles = list(titles)
+        contents = {}
+        for i in range(0, len(titles), TITLE_QUERY_CHUNK):
+            rows = supabase.table("policy").select("title, content").in_("title", titles[i:i + TITLE_QUERY_CHUNK]).execute()
+            contents.update((row.get("title"), row.get("content") or "") for row in rows.data or [])
+        return contents
+
+    def count(self):
+        response = self.get_client().table("policy").select("id", count="exact").limit(1).execute()
+        return response.count or 0
+
+
+class SQLiteStorage(StorageBackend):
+    name = "sqlite"
+
+    def __init__(self, path=None):
+        """初始化本地 SQLite 存储
+
+        Args:
+            path: 数据库文件路径，默认读取环境变量 CRAWLER_SQLITE_PATH，
+                  未设置时使用状态目录下的 policy.db
+        """
+        self.path = path or os.environ.get("CRAWLER_SQLITE_PATH") or get_state_path(SQLITE_FILENAME)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def get_connection(self):
+        """获取数据库连接（多个写入线程共用一个连接，由锁串行化）"""
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            # WAL 模式下读写互不阻塞，synchronous=NORMAL 在 WAL 下仍能保证一致性
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS policy (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL UNIQUE,
+                    url TEXT,
+                    content TEXT,
+                    pub_at TEXT,
+                    selected INTEGER DEFAULT 0,
+                    category TEXT,
+                    source TEXT,
+                    content_hash TEXT,
+                    updated_at TEXT
+                )
+                """
+            )
+            # 兼容早期创建、没有 content_hash 列的数据库
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(policy)")}
+            if "content_hash" not in columns:
+                conn.execute("ALTER TABLE policy ADD COLUMN content_hash TEXT")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def upsert_policies(self, items):
+        now = datetime.now().isoformat()
+        rows = [
+            tuple(bool(item.get(field)) if field == "selected" else item.get(field) for field in POLICY_FIELDS) + (now,)
+            for item in items
+        ]
+        columns = ", ".join(POLICY_FIELDS + ("updated_at",))
+        placeholders = ", ".join("?" for _ in range(len(POLICY_FIELDS) + 1))
+        updates = ", ".join(f"{field} = excluded.{field}" for field in POLICY_FIELDS[1:] + ("updated_at",))
+        sql = f"INSERT INTO policy ({columns}) VALUES ({placeholders}) ON CONFLICT(title) DO UPDATE SET {updates}"
+
+        with self._lock:
+            conn = self.get_connection()
+            try:
+                with conn:
+                    conn.executemany(sql, rows)
+            except sqlite3.Error as e:
+                return [], [f"SQLite 批量写入失败 - {e}"]
+        return list(range(len(items))), []
+
+    def update_policies(self, updates):
+        now = datetime.now().isoformat()
+        # 改动的字段组合相同的数据合并为一次 executemany
+        groups = {}
+        for i, (title, fields) in enumerate(updates):
+            columns = tuple(field for field in POLICY_FIELDS[1:] if field in fields)
+            groups.setdefault(columns, []).append((i, title, fields))
+
+        written = []
+        errors = []
+        with self._lock:
+            conn = self.get_connection()
+            for columns, entries in groups.items():
+                assignments = ", ".join(f"{column} = ?" for column in columns + ("updated_at",))
+                sql = f"UPDATE policy SET {assignments} WHERE title = ?"
+                rows = [tuple(fields[column] for column in columns) + (now, title) for _, title, fields in entries]
+                try:
+                    with conn:
+                        conn.executemany(sql, rows)
+                    written.extend(i for i, _, _ in entries)
+                except sqlite3.Error as e:
+                    errors.append(f"SQLite 批量更新失败 - {e}")
+        return written, errors
+
+    def get_contents(self, titles):
+        titles = list(titles)
+        contents = {}
+        with self._lock:
+            conn = self.get_connection()
+            for i in range(0, len(titles), TITLE_QUERY_CHUNK):
+                chunk = titles[i:i + TITLE_QUERY_CHUNK]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = conn.execute(f"SELECT title, content FROM policy WHERE title IN ({placeholders})", chunk)
+                contents.update((title, content or "") for title, content in rows)
+        return contents
+
+    def count(self):
+        with self._lock:
+            return self.get_connection().execute("SELECT COUNT(*) FROM policy").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class MemoryStorage(StorageBackend):
+    name = "memory"
+
+    def __init__(self):
+        """初始化内存存储，按标题保存数据"""
+        self.rows = {}
+        self._lock = threading.Lock()
+
+    def upsert_policies(self, items):
+        with self._lock:
+            for item in items:
+                self.rows[item.get("title")] = {field: item.get(field) for field in POLICY_FIELDS}
+        return list(range(len(items))), []
+
+    def update_policies(self, updates):
+        with self._lock:
+            for title, fields in updates:
+                row = self.rows.setdefault(title, {"title": title})
+                row.update((field, fields[field]) for field in POLICY_FIELDS if field in fields)
+        return list(range(len(updates))), []
+
+    def get_contents(self, titles):
+        with self._lock:
+            return {title: self.rows[title].get("content") or "" for title in titles if title in self.rows}
+
+    def count(self):
+        return len(self.rows)
+
+
+BACKENDS = {
+    SupabaseStorage.name: SupabaseStorage,
+    SQLiteStorage.name: SQLiteStorage,
+    MemoryStorage.name: MemoryStorage,
+}
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def create_storage(name=None):
+    """按名称创建存储后端
+
+    Args:
+        name: 后端名称（supabase / sqlite / memory），默认读取环境变量 CRAWLER_STORAGE
+
+    Returns:
+        StorageBackend: 存储后端实例
+    """
+    name = (name or os.environ.get("CRAWLER_STORAGE") or SupabaseStorage.name).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"不支持的存储后端: {name}，可选 {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
+
+
+def get_storage():
+    """返回全局存储后端（首次调用时按配置创建）"""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage()
+    return _storage
+
+
+def set_storage(storage):
+    """替换全局存储后端，可传入后端名称或实例
+
+    Returns:
+        StorageBackend: 新的存储后端
+    """
+    global _storage
+    with _storage_lock:
+        if _storage is not None and _storage is not storage:
+            _storage.close()
+        _storage = create_storage(storage) if isinstance(storage, str) else storage
+    return _storage
@@ -0,0 +1,287 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from run_context import get_current_crawler
+from state_utils import get_state_path
+
+# ==========================================
+# 运行追踪模块
+# 功能：进程内的轻量追踪，不依赖外部采集服务：
+#       记录嵌套的 span（整次运行 → 爬虫 → HTTP 请求 / 解析 / 写库 / 推送），
+#       运行结束后导出为 Chrome trace-event JSON（chrome://tracing、Perfetto 可直接打开）
+#       或 OTLP JSON 文件，用时间线查看并发执行时的关键路径
+# 用法：
+#       TRACE=1 python crawler_manager.py       # 或 python crawler_manager.py --trace
+#       TRACE_FORMAT=chrome,otlp                 # 导出格式，默认 chrome
+# ==========================================
+
+DEFAULT_DIRNAME = "traces"
+FORMAT_CHROME = "chrome"
+FORMAT_OTLP = "otlp"
+FORMATS = (FORMAT_CHROME, FORMAT_OTLP)
+# 单次运行保留的 span 数上限，超出后丢弃并计数
+MAX_SPANS = 200000
+SERVICE_NAME = "policy-crawler"
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """一段有开始和结束时间的操作，作为上下文管理器使用"""
+
+    __slots__ = ("tracer", "name", "category", "span_id", "parent_id", "start_ns", "end_ns",
+                 "attrs", "thread_id", "error", "_token")
+
+    def __init__(self, tracer, name, category, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = None
+        self.start_ns = None
+        self.end_ns = None
+        self.thread_id = None
+        self.error = None
+        self._token = None
+
+    def set(self, **attrs):
+        """补充 span 属性（如响应状态码、字节数）"""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        parent = _current_span.get()
+        if parent is None:
+            # 线程池中的爬虫不继承主线程的上下文，挂到整次运行的根 span 下
+            parent = self.tracer.root
+        self.parent_id = parent.span_id if parent is not None else None
+        crawler = get_current_crawler()
+        if crawler and "crawler" not in self.attrs:
+            self.attrs["crawler"] = crawler
+        self.thread_id = threading.get_ident()
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self.tracer._finish(self)
+        return False
+
+
+class _NoopSpan:
+    """追踪关闭时使用的空 span"""
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    def __init__(self):
+        """初始化追踪
+
+        环境变量：
+            TRACE: 设为 1 时启用
+            TRACE_DIR: 输出目录，默认状态目录下的 traces
+            TRACE_FORMAT: 逗号分隔的导出格式 chrome / otlp，默认 chrome
+        """
+        self.enabled = os.environ.get("TRACE") == "1"
+        self.directory = os.environ.get("TRACE_DIR") or get_state_path(DEFAULT_DIRNAME)
+        self.formats = [f.strip() for f in os.environ.get("TRACE_FORMAT", FORMAT_CHROME).split(",") if f.strip()]
+        unknown = set(self.formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"不支持的 TRACE_FORMAT: {', '.join(sorted(unknown))}，可选 {', '.join(FORMATS)}")
+        self.spans = []
+        self.dropped = 0
+        self.root = None
+        self.trace_id = None
+        self._epoch_offset_ns = 0
+        self._thread_names = {}
+        self._lock = threading.Lock()
+
+    def start(self, name="run"):
+        """开始一次运行的追踪，创建根 span"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.spans = []
+            self.dropped = 0
+            self._thread_names = {}
+        self.trace_id = os.urandom(16).hex()
+        # perf_counter 与 Unix 时间的差值，导出 OTLP 时换算为绝对时间
+        self._epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+        self.root = None
+        root = Span(self, name, "run", {})
+        root.__enter__()
+        self.root = root
+
+    def span(self, name, category, **attrs):
+        """创建 span，用法：with tracer.span("GET host", "http", url=url) as span: ...
+
+        追踪关闭时返回空 span，开销只有一次属性判断
+        """
+        if not self.enabled or self.root is None:
+            return _NOOP_SPAN
+        return Span(self, name, category, attrs)
+
+    def annotate(self, **attrs):
+        """给当前 span 补充属性"""
+        span = _current_span.get()
+        if span is not None:
+            span.set(**attrs)
+
+    def _finish(self, span):
+        with self._lock:
+            if span.thread_id not in self._thread_names:
+                self._thread_names[span.thread_id] = threading.current_thread().name
+            if len(self.spans) >= MAX_SPANS:
+                self.dropped += 1
+                return
+            self.spans.append(span)
+
+    def finish(self):
+        """结束根 span 并导出
+
+        Returns:
+            list: 导出的文件路径
+        """
+        if not self.enabled or self.root is None:
+            return []
+        self.root.__exit__(None, None, None)
+        self.root = None
+        os.makedirs(self.directory, exist_ok=True)
+        stem = os.path.join(self.directory, datetime.now().strftime("%Y%m%d-%H%M%S"))
+        paths = []
+        if FORMAT_CHROME in self.formats:
+            paths.append(self.export_chrome(stem + ".trace.json"))
+        if FORMAT_OTLP in self.formats:
+            paths.append(self.export_otlp(stem + ".otlp.json"))
+        return paths
+
+    def _snapshot(self):
+        with self._lock:
+            return list(self.spans), dict(self._thread_names)
+
+    def export_chrome(self, path):
+        """导出 Chrome trace-event JSON（完整事件 ph=X，时间单位微秒）"""
+        spans, thread_names = self._snapshot()
+        base_ns = min((span.start_ns for span in spans), default=0)
+        tids = {thread_id: index for index, thread_id in enumerate(sorted(thread_names), 1)}
+        pid = os.getpid()
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tids[thread_id], "args": {"name": name}}
+            for thread_id, name in thread_names.items()
+        ]
+        for span in spans:
+            args = dict(span.attrs)
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - base_ns) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": tids.get(span.thread_id, 0),
+                "args": args,
+            })
+        _write_json(path, {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"trace_id": self.trace_id, "dropped_spans": self.dropped},
+        })
+        return path
+
+    def export_otlp(self, path):
+        """导出 OTLP JSON（ExportTraceServiceRequest 结构，可由 OpenTelemetry Collector 的文件接收器读取）"""
+        spans, _ = self._snapshot()
+        otlp_spans = []
+        for span in spans:
+            item = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                # SPAN_KIND_CLIENT = 3，SPAN_KIND_INTERNAL = 1
+                "kind": 3 if span.category in ("http", "push") else 1,
+                "startTimeUnixNano": str(span.start_ns + self._epoch_offset_ns),
+                "endTimeUnixNano": str(span.end_ns + self._epoch_offset_ns),
+                "attributes": [_otlp_attribute("category", span.category)]
+                              + [_otlp_attribute(key, value) for key, value in span.attrs.items()],
+                # STATUS_CODE_ERROR = 2
+                "status": {"code": 2, "message": span.error} if span.error else {},
+            }
+            if span.parent_id:
+                item["parentSpanId"] = span.parent_id
+            otlp_spans.append(item)
+        _write_json(path, {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{"scope": {"name": "tracing"}, "spans": otlp_spans}],
+            }]
+        })
+        return path
+
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# 创建全局实例
+tracer = Tracer()
+
+
+# 便捷函数
+def trace_span(name, category, **attrs):
+    """便捷函数：创建 span"""
+    return tracer.span(name, category, **attrs)
+
+
+def annotate_span(**attrs):
+    """便捷函数：给当前 span 补充属性"""
+    tracer.annotate(**attrs)
+
+
+def traced(name, category):
+    """装饰器：函数的每次调用记录为一个 span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled or tracer.root is None:
+                return func(*args, **kwargs)
+            with tracer.span(name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,292 @@
+import os
+import queue
+import threading
+import time
+
+from run_context import get_current_crawler
+from tracing import annotate_span, traced
+
+# ==========================================
+# 后台写入队列模块
+# 功能：爬虫只把数据放入队列，后台写入线程按条数或时间攒批，
+#       批量写入 Supabase 并合并推送到 API，把数据库和接口的耗时移出抓取关键路径；
+#       队列有容量上限（背压），每条数据写入后逐条确认，结果按爬虫汇总；
+#       多个写入线程时按标题分区，同一标题始终由同一线程写入，避免并发插入重复标题
+# ==========================================
+
+# 每批最多写入的条数
+DEFAULT_BATCH_SIZE = 50
+# 攒批的最长等待时间（秒）
+DEFAULT_BATCH_INTERVAL = 2.0
+# 队列中最多积压的条数，超过后 submit 阻塞等待
+DEFAULT_MAX_PENDING = 1000
+DEFAULT_WORKERS = 2
+
+
+class WriteTicket:
+    """一次 submit 的写入凭证，记录每条数据的确认结果"""
+
+    def __init__(self, crawler, source_name, records):
+        self.crawler = crawler
+        self.source_name = source_name
+        self.records = list(records)
+        self.written = []
+        self.errors = []
+        self.changes = {"new": 0, "changed": 0, "unchanged": 0}
+        self.pushed = 0
+        self.push_errors = []
+        self._pending = len(self.records)
+        self._done = threading.Event()
+        self._callbacks = []
+        self._callback_lock = threading.Lock()
+        if not self._pending:
+            self._done.set()
+
+    def _settle(self, count):
+        with self._callback_lock:
+            self._pending -= count
+            if self._pending > 0 or self._done.is_set():
+                return
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def add_done_callback(self, callback):
+        """所有数据确认完成后在写入线程中调用 callback(ticket)，已完成时立即调用"""
+        with self._callback_lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def wait(self, timeout=None):
+        """等待所有数据确认完成
+
+        Returns:
+            bool: 是否全部完成
+        """
+        return self._done.wait(timeout)
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def api_push_result(self):
+        """汇总本凭证的 API 推送结果，格式与 db_utils.push_to_api 一致"""
+        if self.push_errors:
+            return {"status": "error", "message": self.push_errors[-1]}
+        if self.pushed:
+            return {"status": "success", "message": f"成功推送 {self.pushed} 条数据到API"}
+        return None
+
+
+class WriteQueue:
+    def __init__(self):
+        """初始化写入队列
+
+        环境变量：
+            WRITE_BATCH_SIZE: 每批最多写入的条数
+            WRITE_BATCH_INTERVAL: 攒批的最长等待时间（秒）
+            WRITE_QUEUE_MAX: 队列中最多积压的条数（各写入线程平分）
+            WRITE_WORKERS: 写入线程数，数据按标题分配到各线程
+        """
+        self.batch_size = int(os.environ.get("WRITE_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+        self.batch_interval = float(os.environ.get("WRITE_BATCH_INTERVAL", DEFAULT_BATCH_INTERVAL))
+        self.max_pending = int(os.environ.get("WRITE_QUEUE_MAX", DEFAULT_MAX_PENDING))
+        self.worker_count = int(os.environ.get("WRITE_WORKERS", DEFAULT_WORKERS))
+        self.tickets = []
+        self._queues = []
+        self._workers = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    @property
+    def active(self):
+        """写入线程是否在运行"""
+        return bool(self._workers)
+
+    def start(self):
+        """启动写入线程"""
+        if self.active:
+            return
+        count = max(1, self.worker_count)
+        self._queues = [queue.Queue(maxsize=max(1, self.max_pending // count)) for _ in range(count)]
+        self._stopping.clear()
+        self.tickets = []
+        for i, partition in enumerate(self._queues):
+            worker = threading.Thread(target=self._worker, args=(partition,), name=f"write-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, data_list, source_name):
+        """把数据放入写入队列，队列已满时阻塞等待（背压）
+
+        Args:
+            data_list: 数据列表
+            source_name: 数据源名称
+
+        Returns:
+            WriteTicket: 写入凭证
+        """
+        ticket = WriteTicket(get_current_crawler() or source_name, source_name, data_list)
+        with self._lock:
+            self.tickets.append(ticket)
+        for record in ticket.records:
+            self._partition(record).put((ticket, record))
+        return ticket
+
+    def _partition(self, record):
+        """policy 表的标题没有唯一约束，同一标题固定分到同一个写入线程"""
+        if len(self._queues) == 1:
+            return self._queues[0]
+        return self._queues[hash(record.get("title") or "") % len(self._queues)]
+
+    def tickets_for(self, crawler):
+        """返回某个爬虫本次运行提交的写入凭证"""
+        with self._lock:
+            return [ticket for ticket in self.tickets if ticket.crawler == crawler]
+
+    def _next_batch(self, partition):
+        """取出一批数据：达到批大小或等待超过攒批时间即返回"""
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            timeout = 0.2 if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                batch.append(partition.get(timeout=timeout))
+            except queue.Empty:
+                if batch and (deadline is None or time.monotonic() >= deadline):
+                    break
+                if not batch and self._stopping.is_set():
+                    break
+                continue
+            if deadline is None:
+                deadline = time.monotonic() + self.batch_interval
+        return batch
+
+    def _worker(self, partition):
+        while True:
+            batch = self._next_batch(partition)
+            if not batch:
+                if self._stopping.is_set():
+                    return
+                continue
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                with self._lock:
+                    for ticket, _ in batch:
+                        ticket.errors.append(f"写入线程异常 - {e}")
+            finally:
+                # 逐条确认，异常时也确认，避免 flush 一直等待；
+                # 在写入锁外确认，完成回调（如保存运行断点）不会阻塞其他写入线程
+                for ticket, _ in batch:
+                    ticket._settle(1)
+                for _ in batch:
+                    partition.task_done()
+
+    @traced("write_batch", "store")
+    def _write_batch(self, batch):
+        from db_utils import db_utils
+
+        # 按数据源分组写入数据库
+        groups = {}
+        for ticket, record in batch:
+            groups.setdefault(ticket.source_name, []).append((ticket, record))
+        annotate_span(records=len(batch), sources=len(groups))
+
+        pushed_sources = []
+        for source_name, entries in groups.items():
+            records = [record for _, record in entries]
+            try:
+                stored, errors, changes = db_utils.upsert_policies(records, source_name)
+            except Exception as e:
+                stored, errors, changes = [], [f"数据库写入失败 - {e}"], {}
+
+            stored_ids = {id(record) for record in stored}
+            status_by_id = {id(record): status for status, items in changes.items() for record in items}
+            with self._lock:
+                for ticket, record in entries:
+                    if id(record) in stored_ids:
+                        ticket.written.append(record)
+                        status = status_by_id.get(id(record))
+                        if status in ticket.changes:
+                            ticket.changes[status] += 1
+                    else:
+                        ticket.errors.append(errors[0] if errors else "写入失败")
+
+            # 未变化的数据不推送
+            written = changes.get("new", []) + changes.get("changed", [])
+            if written:
+                pushed_sources.append((source_name, written, entries))
+
+        # 所有数据源合并为一次 API 推送
+        if pushed_sources:
+            result = db_utils.send_to_api([(source_name, written) for source_name, written, _ in pushed_sources])
+            for source_name, written, entries in pushed_sources:
+                written_ids = {id(record) for record in written}
+                with self._lock:
+                    for ticket, record in entries:
+                        if id(record) not in written_ids:
+                            continue
+                        if result["status"] == "success":
+                            ticket.pushed += 1
+                        elif result["status"] == "error" and result["message"] not in ticket.push_errors:
+                            ticket.push_errors.append(result["message"])
+
+    def flush(self, timeout=None):
+        """等待队列中所有数据写入完成
+
+        Args:
+            timeout: 最长等待秒数，None 表示一直等待
+
+        Returns:
+            list: 本次运行的全部写入凭证
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for ticket in list(self.tickets):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not ticket.wait(remaining):
+                print(f"⚠️  {ticket.source_name}：写入队列等待超时，仍有数据未确认")
+        return list(self.tickets)
+
+    def stop(self, timeout=None):
+        """写完队列中的数据后停止写入线程"""
+        if not self.active:
+            return []
+        tickets = self.flush(timeout)
+        self._stopping.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+        return tickets
+
+    def summarize(self, tickets=None):
+        """按爬虫汇总写入结果
+
+        Returns:
+            dict: {爬虫名称: {'write_count', 'error_count', 'new', 'changed', 'unchanged',
+                              'api_push_result', 'source_names'}}
+        """
+        summary = {}
+        for ticket in tickets if tickets is not None else self.tickets:
+            entry = summary.setdefault(ticket.crawler, {
+                "write_count": 0, "error_count": 0, "new": 0, "changed": 0, "unchanged": 0,
+                "api_push_result": None, "source_names": [],
+            })
+            entry["write_count"] += len(ticket.written)
+            for status, count in ticket.changes.items():
+                entry[status] += count
+            entry["error_count"] += len(ticket.records) - len(ticket.written)
+            if ticket.source_name not in entry["source_names"]:
+                entry["source_names"].append(ticket.source_name)
+            result = ticket.api_push_result
+            if result and (entry["api_push_result"] is None or result["status"] == "error"):
+                entry["api_push_result"] = result
+        return summary
+
+
+# 创建全局实例
+write_queue = WriteQueue()